@@ -4,5 +4,8 @@ set -o errexit
 
 pip install -r requirements.txt
 
-python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+# Bundled, content-hashed and precompressed assets (STATIC_BUNDLES).
+DJANGO_DEBUG=False python manage.py collectstatic --no-input
+python manage.py migrate
+# Days left stale by a refresh that failed.
+python manage.py rebuild_rollups
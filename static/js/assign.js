@@ -0,0 +1,55 @@
+// Submit "assign me" buttons in the background and update them in place.
+document.addEventListener("submit", function (event) {
+  const form = event.target.closest("form[data-assign-toggle]");
+  if (!form) {
+    return;
+  }
+  event.preventDefault();
+
+  fetch(form.action, {
+    method: "POST",
+    headers: {
+      "Accept": "application/json",
+      "X-CSRFToken": form.elements.csrfmiddlewaretoken.value,
+    },
+    body: new FormData(form),
+  })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.json();
+    })
+    .then(function (data) {
+      const button = form.querySelector("button");
+      button.classList.toggle("btn-warning", data.assigned);
+      button.classList.toggle("btn-info", !data.assigned);
+      button.textContent = data.assigned
+        ? "Delete me from this task"
+        : "Assign me to this task";
+
+      const list = document.querySelector(
+        "[data-assignees='" + data.task + "']"
+      );
+      if (!list) {
+        return;
+      }
+      const item = list.querySelector(
+        "[data-worker='" + data.worker.id + "']"
+      );
+      if (data.assigned && !item) {
+        const entry = document.createElement("li");
+        const link = document.createElement("a");
+        entry.dataset.worker = data.worker.id;
+        link.href = data.worker.url;
+        link.textContent = data.worker.username;
+        entry.appendChild(link);
+        list.appendChild(entry);
+      } else if (!data.assigned && item) {
+        item.remove();
+      }
+    })
+    .catch(function () {
+      form.submit();
+    });
+});
@@ -0,0 +1,58 @@
+// Load more cards of a board column and move cards in the background.
+document.addEventListener("click", function (event) {
+  const link = event.target.closest("[data-board-more] a");
+  if (!link) {
+    return;
+  }
+  event.preventDefault();
+
+  fetch(link.href)
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.text();
+    })
+    .then(function (html) {
+      // The fragment brings its own "load more" link, if any.
+      link.closest("[data-board-more]").outerHTML = html;
+    })
+    .catch(function () {
+      window.location = link.href;
+    });
+});
+
+document.addEventListener("submit", function (event) {
+  const form = event.target.closest("form[data-board-move]");
+  if (!form) {
+    return;
+  }
+  event.preventDefault();
+
+  fetch(form.action, {
+    method: "POST",
+    headers: {
+      "Accept": "application/json",
+      "X-CSRFToken": form.elements.csrfmiddlewaretoken.value,
+    },
+    body: new FormData(form),
+  })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.json();
+    })
+    .then(function (data) {
+      const card = form.closest("[data-task]");
+      const column = document.querySelector(
+        "[data-board-column='" + data.column + "']"
+      );
+      if (column && column !== card.parentElement) {
+        column.prepend(card);
+      }
+    })
+    .catch(function () {
+      form.submit();
+    });
+});
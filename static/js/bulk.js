@@ -0,0 +1,11 @@
+// "Select all" checkboxes for the bulk action forms.
+document.addEventListener("change", function (event) {
+  const name = event.target.dataset.selectAll;
+  if (!name) {
+    return;
+  }
+  const form = event.target.form;
+  form.querySelectorAll("input[name='" + name + "']").forEach(function (box) {
+    box.checked = event.target.checked;
+  });
+});
@@ -14,6 +14,8 @@ DEBUG = os.environ.get("DJANGO_DEBUG", "") != "False"
 ALLOWED_HOSTS = ["127.0.0.1", "task-manager-y3r3.onrender.com"]
 
 INSTALLED_APPS = [
+    "dal",
+    "dal_select2",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -27,8 +29,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings include every other middleware.
+    "tasks.profiling.ProfilingMiddleware",
+    # Before anything reads the database (sessions, users).
+    "tasks.routers.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "tasks.staticfiles.StaticFilesMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -38,11 +44,26 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Serve the async views in tasks.async_views; task_manager/asgi.py turns
+# this on. Middleware that only runs synchronously would make every
+# request hop through a single thread, so it is left out then.
+ASYNC_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "") == "True"
+SYNC_ONLY_MIDDLEWARE = {
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+}
+
+if ASYNC_VIEWS:
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in SYNC_ONLY_MIDDLEWARE
+    ]
+
 ROOT_URLCONF = "task_manager.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, timing renders for ProfilingMiddleware.
+        "BACKEND": "tasks.profiling.ProfiledDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -58,20 +79,91 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "task_manager.wsgi.application"
 
+# Connections are kept for CONN_MAX_AGE seconds and checked before
+# reuse, so a restarted database server costs one failed check instead
+# of a failed request. SQLite connections are tuned by tasks.database
+# (SQLITE_PRAGMAS overrides its defaults).
+DATABASE_CONN_MAX_AGE = int(os.environ.get("DATABASE_CONN_MAX_AGE", 500))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
-db_from_env = dj_database_url.config(conn_max_age=500)
+db_from_env = dj_database_url.config(
+    conn_max_age=DATABASE_CONN_MAX_AGE,
+    conn_health_checks=True,
+)
 DATABASES["default"].update(db_from_env)
 
+# Read replicas (tasks.routers): a comma separated list of database
+# URLs, for example "sqlite:///replica.sqlite3" locally (refreshed with
+# "manage.py copy_to_replicas"). GET and HEAD requests read from them;
+# a browser that wrote is pinned to the primary for REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for number, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")),
+    start=1,
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = dj_database_url.parse(
+        url.strip(),
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=True,
+        # Tests read the test database through the replica aliases.
+        test_options={"MIRROR": "default"},
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["tasks.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+
+# Behind PgBouncer in transaction pooling mode, server-side cursors
+# (QuerySet.iterator() in the exports) do not survive between
+# transactions; set DATABASE_PGBOUNCER=True to disable them.
+if os.environ.get("DATABASE_PGBOUNCER", "") == "True":
+    for database in DATABASES.values():
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Cache backend for rendered task and worker fragments (tasks.fragments).
+# CACHE_URL picks it: "redis://host:6379/0" (needs the redis package),
+# "file:///var/tmp/task_flow" or nothing for a per-process memory cache.
+CACHE_URL = os.environ.get("CACHE_URL", "")
+
+if CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith("file://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_URL.removeprefix("file://"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "task_flow",
+        }
+    }
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Lets scrapers read /metrics with an "Authorization: Bearer <token>"
+# header. Unset, only staff users can.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -107,4 +199,29 @@ STATICFILES_DIRS = (BASE_DIR / "static",)
 
 STATIC_ROOT = "staticfiles/"
 
+# Concatenated by collectstatic (tasks.staticfiles) and included with
+# {% bundle %}. Outside DEBUG, collected files get content-hash names
+# and gzip/Brotli variants, which WhiteNoise serves as immutable.
+STATIC_BUNDLES = {
+    "bundles/app.css": [
+        "vendor/bootstrap-4.5.3/bootstrap.min.css",
+        "css/styles.css",
+    ],
+    "bundles/app.js": [
+        "js/assign.js",
+        "js/board.js",
+        "js/bulk.js",
+    ],
+}
+
+if not DEBUG:
+    STORAGES = {
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+        },
+        "staticfiles": {
+            "BACKEND": "tasks.staticfiles.BundledStaticFilesStorage",
+        },
+    }
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
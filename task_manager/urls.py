@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from tasks.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("", include("tasks.urls", namespace="tasks")),
     path("accounts/", include("django.contrib.auth.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("__debug__/", include("debug_toolbar.urls")),
 ]
@@ -1,7 +1,16 @@
 from django.contrib import admin
-from tasks.models import Position, Worker, TaskType, Task
+from tasks.models import (
+    ArchivedTask,
+    Counter,
+    Position,
+    Task,
+    TaskType,
+    Worker,
+)
 
 admin.site.register(Position)
 admin.site.register(Worker)
 admin.site.register(TaskType)
 admin.site.register(Task)
+admin.site.register(Counter)
+admin.site.register(ArchivedTask)
@@ -0,0 +1,107 @@
+"""The archive of long completed tasks.
+
+Tasks completed more than a retention period ago are moved, with their
+assignments, from ``Task`` into ``ArchivedTask`` and
+``ArchivedTaskAssignment``, so the task table and its indexes only
+hold the rows the application works with. Every batch is a single
+transaction: the rows are copied, then the tasks are deleted the usual
+way, so the dashboard counters, cached fragments and (on SQLite) the
+search index follow.
+
+Archived tasks keep their ids, which are never reused. They are
+read-only; ``TaskSearchForm`` lists them next to live tasks when asked
+to (see ``with_archived``).
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+
+from tasks import reports, statistics
+from tasks.models import (
+    ArchivedTask,
+    ArchivedTaskAssignment,
+    Task,
+    TaskAssignment,
+)
+
+BATCH_SIZE = 1000
+DEFAULT_RETENTION_DAYS = 90
+# The columns both tables share, in the order both declare them.
+TASK_FIELDS = [field.attname for field in Task._meta.concrete_fields]
+
+
+def archivable(older_than):
+    return Task.objects.filter(is_completed=True, completed_at__lt=older_than)
+
+
+def archive_tasks(days=DEFAULT_RETENTION_DAYS, batch_size=BATCH_SIZE,
+                  on_batch=None):
+    """Archive tasks completed more than days ago; return how many.
+
+    on_batch(archived) is called after every batch with the running
+    total.
+    """
+    now = timezone.now()
+    older_than = now - timedelta(days=days)
+    archived = 0
+    while True:
+        moved = archive_batch(older_than, batch_size, now)
+        if not moved:
+            return archived
+        archived += moved
+        if on_batch:
+            on_batch(archived)
+
+
+def archive_batch(older_than, batch_size, now):
+    with transaction.atomic(), statistics.batch(), reports.batch():
+        # Locked, so a task reopened meanwhile waits for the batch and
+        # then finds nothing to reopen, rather than being archived
+        # with its old state.
+        tasks = list(
+            archivable(older_than)
+            .select_for_update()
+            .order_by("completed_at", "id")[:batch_size]
+        )
+        if not tasks:
+            return 0
+        task_ids = [task.pk for task in tasks]
+        ArchivedTask.objects.bulk_create([
+            ArchivedTask(
+                archived_at=now,
+                **{name: getattr(task, name) for name in TASK_FIELDS},
+            )
+            for task in tasks
+        ])
+        ArchivedTaskAssignment.objects.bulk_create([
+            ArchivedTaskAssignment(
+                task_id=assignment.task_id,
+                worker_id=assignment.worker_id,
+                assigned_at=assignment.assigned_at,
+            )
+            for assignment in TaskAssignment.objects.filter(
+                task_id__in=task_ids
+            )
+        ])
+        Task.objects.filter(pk__in=task_ids).delete()
+    return len(tasks)
+
+
+def with_archived(live, archived):
+    """Return live tasks and the archived ones as one UNION queryset.
+
+    Both querysets must already be filtered alike and carry the same
+    annotations. Every row is a ``Task`` annotated with
+    ``is_archived``; the result can be ordered, sliced and aggregated,
+    and ``CursorPaginator`` pages through it.
+    """
+    # SQLite does not allow the parts of a UNION to be ordered.
+    live = live.order_by().annotate(
+        is_archived=Value(False, output_field=BooleanField())
+    )
+    archived = archived.order_by().only(*TASK_FIELDS).annotate(
+        is_archived=Value(True, output_field=BooleanField())
+    )
+    return live.union(archived, all=True)
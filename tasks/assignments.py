@@ -0,0 +1,142 @@
+"""Task assignment writes straight on the ``Task.assignees`` table.
+
+Every function takes ``(task_id, worker_id)`` pairs, touches only the
+through table and runs inside a transaction. Inserting a pair with an
+unknown task or worker raises ``ObjectDoesNotExist``. Listeners learn
+about the changes through ``tasks.signals.assignments_changed``.
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from tasks.models import Task, Worker
+from tasks.signals import assignments_changed
+
+Assignment = Task.assignees.through
+# Most pairs AssignmentsView accepts in one request.
+MAX_PAIRS = 1000
+# Pairs looked up per query, well under the bound parameters limits.
+CHUNK_SIZE = 500
+
+
+def _insert(pairs):
+    if not pairs:
+        return
+    task_ids = {task_id for task_id, _ in pairs}
+    worker_ids = {worker_id for _, worker_id in pairs}
+    if (
+        Task.objects.filter(pk__in=task_ids).count() != len(task_ids)
+        or Worker.objects.filter(pk__in=worker_ids).count()
+        != len(worker_ids)
+    ):
+        raise ObjectDoesNotExist("Unknown task or worker")
+    Assignment.objects.bulk_create(
+        [
+            Assignment(task_id=task_id, worker_id=worker_id)
+            for task_id, worker_id in pairs
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _notify(added=(), removed=()):
+    if added or removed:
+        assignments_changed.send(
+            sender=Assignment,
+            added=list(added),
+            removed=list(removed),
+        )
+
+
+def _existing(pairs):
+    """Map the pairs that are assigned to their row ids.
+
+    Rows are read by task and worker ids a chunk of pairs at a time,
+    and matched to the pairs here: one OR term per pair would build an
+    expression tree deeper than databases accept for large batches.
+    """
+    existing = {}
+    for start in range(0, len(pairs), CHUNK_SIZE):
+        chunk = set(pairs[start:start + CHUNK_SIZE])
+        rows = Assignment.objects.filter(
+            task_id__in={task_id for task_id, _ in chunk},
+            worker_id__in={worker_id for _, worker_id in chunk},
+        ).values_list("id", "task_id", "worker_id")
+        existing.update(
+            ((task_id, worker_id), pk)
+            for pk, task_id, worker_id in rows
+            if (task_id, worker_id) in chunk
+        )
+    return existing
+
+
+def toggle(pairs):
+    """Flip each pair and return ``{pair: assigned}``."""
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return {}
+    with transaction.atomic():
+        if len(pairs) == 1:
+            (task_id, worker_id), = pairs
+            deleted, _ = Assignment.objects.filter(
+                task_id=task_id,
+                worker_id=worker_id,
+            ).delete()
+            removed = pairs if deleted else []
+        else:
+            existing = _existing(pairs)
+            Assignment.objects.filter(id__in=existing.values()).delete()
+            removed = [pair for pair in pairs if pair in existing]
+        added = [pair for pair in pairs if pair not in removed]
+        _insert(added)
+        _notify(added=added, removed=removed)
+    return {pair: pair in added for pair in pairs}
+
+
+def assign(pairs):
+    pairs = list(dict.fromkeys(pairs))
+    if pairs:
+        with transaction.atomic():
+            existing = _existing(pairs)
+            added = [pair for pair in pairs if pair not in existing]
+            _insert(added)
+            _notify(added=added)
+    return dict.fromkeys(pairs, True)
+
+
+def unassign(pairs):
+    pairs = list(dict.fromkeys(pairs))
+    if pairs:
+        with transaction.atomic():
+            existing = _existing(pairs)
+            Assignment.objects.filter(id__in=existing.values()).delete()
+            _notify(removed=list(existing))
+    return dict.fromkeys(pairs, False)
+
+
+def replace(task_ids, worker_ids):
+    """Make worker_ids the exact assignees of every task in task_ids."""
+    task_ids = list(dict.fromkeys(task_ids))
+    wanted = {
+        (task_id, worker_id)
+        for task_id in task_ids
+        for worker_id in worker_ids
+    }
+    with transaction.atomic():
+        rows = Assignment.objects.filter(
+            task_id__in=task_ids
+        ).values_list("id", "task_id", "worker_id")
+        existing = {(task_id, worker_id): pk for pk, task_id, worker_id in rows}
+        removed = [pair for pair in existing if pair not in wanted]
+        added = [pair for pair in wanted if pair not in existing]
+        Assignment.objects.filter(
+            id__in=[existing[pair] for pair in removed]
+        ).delete()
+        _insert(added)
+        _notify(added=added, removed=removed)
+
+
+ACTIONS = {
+    "toggle": toggle,
+    "assign": assign,
+    "unassign": unassign,
+}
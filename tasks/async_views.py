@@ -0,0 +1,165 @@
+"""Async versions of the read-only task and worker pages.
+
+``tasks.urls`` serves these instead of their counterparts in
+``tasks.views`` when ``settings.ASYNC_VIEWS`` is on, which
+``task_manager/asgi.py`` does. They subclass the sync views and only
+replace the steps that query the database with the async ORM, so under
+an ASGI server a request waiting on the database does not hold a
+thread. Templates are still rendered in a worker thread, as Django
+does for every ``TemplateResponse`` returned by an async view.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.shortcuts import render
+
+from tasks import statistics, visits
+from tasks.conditional import AsyncConditionalGetMixin
+from tasks.pagination import CursorPaginator
+from tasks.views import (
+    IndexView,
+    TaskDetailView,
+    TaskListView,
+    WorkerDetailView,
+    WorkerListView,
+)
+
+
+def _load_user(request):
+    # Resolves the lazy request.user (session and user queries).
+    return request.user.is_authenticated
+
+
+class AsyncLoginRequiredMixin:
+    """``LoginRequiredMixin`` that loads the user off the event loop."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not await sync_to_async(_load_user)(request):
+            return redirect_to_login(request.get_full_path())
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncIndexView(AsyncLoginRequiredMixin, IndexView):
+    async def get(self, request):
+        visits_counter = visits.counter_name(request.user.pk)
+        num_pending = await sync_to_async(visits.record)(request.user.pk)
+        # A single query reads all dashboard counters at once.
+        counters = await statistics.aget_counters(
+            (*statistics.DASHBOARD_COUNTERS, visits_counter)
+        )
+        context = {
+            **counters,
+            "num_visits": counters.pop(visits_counter) + num_pending,
+        }
+        return await sync_to_async(render)(
+            request,
+            "tasks/index.html",
+            context=context,
+        )
+
+
+class AsyncPaginationMixin:
+    """Fetch the page asynchronously before the context is built."""
+
+    async def apaginate_queryset(self, queryset, page_size):
+        raise NotImplementedError
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.paginated
+
+    async def render_page(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.paginated = await self.apaginate_queryset(
+            self.object_list,
+            self.get_paginate_by(self.object_list),
+        )
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+
+class AsyncTaskListView(
+    AsyncLoginRequiredMixin,
+    AsyncConditionalGetMixin,
+    AsyncPaginationMixin,
+    TaskListView,
+):
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_cursor_ordering(queryset),
+        )
+        try:
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_kwarg)
+            )
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AsyncWorkerListView(
+    AsyncLoginRequiredMixin,
+    AsyncPaginationMixin,
+    WorkerListView,
+):
+    async def get(self, request, *args, **kwargs):
+        return await self.render_page(request, *args, **kwargs)
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        # Paginator.count is a cached property; fill it asynchronously.
+        paginator.count = await queryset.acount()
+        page_number = self.request.GET.get(self.page_kwarg) or 1
+        try:
+            if page_number == "last":
+                page_number = paginator.num_pages
+            page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(str(e))
+        page.object_list = [worker async for worker in page.object_list]
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AsyncObjectMixin:
+    async def aget_object(self):
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except self.model.DoesNotExist:
+            raise Http404(
+                f"No {self.model._meta.verbose_name} found matching the query"
+            )
+
+
+class AsyncTaskDetailView(
+    AsyncLoginRequiredMixin,
+    AsyncConditionalGetMixin,
+    AsyncObjectMixin,
+    TaskDetailView,
+):
+    async def render_page(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+
+class AsyncWorkerDetailView(
+    AsyncLoginRequiredMixin,
+    AsyncConditionalGetMixin,
+    AsyncObjectMixin,
+    WorkerDetailView,
+):
+    def paginate_tasks(self):
+        return self.task_page
+
+    async def render_page(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        try:
+            self.task_page = await self.get_task_paginator().apage(
+                request.GET.get("cursor")
+            )
+        except InvalidPage as e:
+            raise Http404(str(e))
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
@@ -0,0 +1,277 @@
+"""Helpers shared by the ``bench*`` management commands and tests.
+
+Benchmarks never touch the configured databases: they run against a
+throwaway test database created the same way the test runner does it,
+with the read replicas switched off.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskAssignment, Worker, WorkerSearchKey
+from tasks.search import worker_search_keys
+
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo "
+    "lima mike november oscar papa quebec romeo sierra tango uniform "
+    "victor whiskey xray yankee zulu report invoice release review "
+    "deploy backup migrate refactor design budget meeting client server"
+).split()
+
+
+@contextmanager
+def scratch_database(verbosity=0):
+    connection = connections[DEFAULT_DB_ALIAS]
+    old_name = connection.creation.create_test_db(
+        verbosity=verbosity,
+        autoclobber=True,
+        serialize=False,
+    )
+    try:
+        # The replicas still hold the configured data: route every read
+        # to the scratch database.
+        with override_settings(DATABASE_REPLICAS=[]):
+            yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+
+
+def random_text(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def seed_tasks(count, seed=0, batch_size=5000, **fields):
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = date.today()
+    priorities = [priority for priority, _ in Task.PRIORITY_CHOICES]
+    created = 0
+    while created < count:
+        batch = []
+        for _ in range(min(batch_size, count - created)):
+            priority = rng.choice(priorities)
+            is_completed = rng.random() < 0.3
+            batch.append(Task(
+                name=random_text(rng, 3),
+                description=random_text(rng, 12),
+                deadline=today + timedelta(days=rng.randint(-60, 60)),
+                is_completed=is_completed,
+                completed_at=(
+                    now - timedelta(days=rng.randint(0, 120))
+                    if is_completed else None
+                ),
+                priority=priority,
+                priority_rank=Task.rank_for(priority),
+                **fields,
+            ))
+        Task.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def seed_workers(count, seed=0, batch_size=5000):
+    rng = random.Random(seed)
+    password = make_password(None)
+    created = 0
+    while created < count:
+        batch = [
+            Worker(
+                username=f"worker{created + number}",
+                first_name=rng.choice(WORDS).title(),
+                last_name=rng.choice(WORDS).title(),
+                password=password,
+            )
+            for number in range(min(batch_size, count - created))
+        ]
+        Worker.objects.bulk_create(batch)
+        WorkerSearchKey.objects.bulk_create([
+            WorkerSearchKey(worker_id=worker.pk, key=key)
+            for worker in batch
+            for key in worker_search_keys(
+                worker.username, worker.first_name, worker.last_name
+            )
+        ])
+        created += len(batch)
+    return created
+
+
+def seed_assignments(density, seed=0, batch_size=5000):
+    """Assign each task to ``density`` random workers on average."""
+    rng = random.Random(seed)
+    worker_ids = list(Worker.objects.values_list("pk", flat=True))
+    whole, fraction = divmod(density, 1)
+    batch = []
+    created = 0
+    for task_id in Task.objects.values_list("pk", flat=True).iterator():
+        count = min(int(whole) + (rng.random() < fraction), len(worker_ids))
+        batch.extend(
+            TaskAssignment(task_id=task_id, worker_id=worker_id)
+            for worker_id in rng.sample(worker_ids, count)
+        )
+        if len(batch) >= batch_size:
+            TaskAssignment.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    TaskAssignment.objects.bulk_create(batch)
+    return created + len(batch)
+
+
+def route_requests(task_id, worker_id, other_worker_id, task_type_id,
+                   position_id):
+    """Return the request to time for each route of tasks.urls.
+
+    Values are ``(method, url, client kwargs)``. Requests with a method
+    other than "get" change data; "write" is a GET that changes data.
+    Routes with a form are submitted too, under "<name>:post", last:
+    they delete the task and other_worker_id.
+
+    Used by ``manage.py bench``, which rolls the writes back after each
+    call, and by the query budget tests.
+    """
+    def url(name, *args):
+        return reverse(f"tasks:{name}", args=args)
+
+    as_json = {"headers": {"accept": "application/json"}}
+    task_form = {
+        "name": "Benchmark task",
+        "description": "Submitted by the benchmark.",
+        "deadline": "2030-01-01",
+        "priority": "urgent",
+        "task_type": task_type_id,
+        "assignees": [worker_id],
+    }
+    worker_form = {
+        "password1": "bench-Passw0rd!",
+        "password2": "bench-Passw0rd!",
+        "position": position_id,
+        "first_name": "Bench",
+        "last_name": "Worker",
+    }
+    return {
+        "index": ("get", url("index"), {}),
+        "assign-task": ("post", url("assign-task", task_id), as_json),
+        "assignments": ("post", url("assignments"), {
+            "data": {
+                "action": "toggle",
+                "pairs": [{"task": task_id, "worker": worker_id}],
+            },
+            "content_type": "application/json",
+        }),
+        # Toggles on GET.
+        "task-complete": ("write", url("task-complete", task_id), {}),
+        "task-bulk": ("post", url("task-bulk"), {
+            "data": {"tasks": [task_id], "action": "complete"},
+        }),
+        "task-list": ("get", url("task-list"), {}),
+        "task-export": ("get", url("task-export"), {}),
+        "task-create": ("get", url("task-create"), {}),
+        "task-detail": ("get", url("task-detail", task_id), {}),
+        "task-update": ("get", url("task-update", task_id), {}),
+        "task-delete": ("get", url("task-delete", task_id), {}),
+        "board": ("get", url("board"), {}),
+        "board-column": ("get", url("board-column", "completed"), {}),
+        "task-move": ("post", url("task-move", task_id), {
+            "data": {"column": "completed"},
+            **as_json,
+        }),
+        "reports": ("get", url("reports"), {}),
+        "worker-list": ("get", url("worker-list"), {}),
+        "worker-autocomplete": (
+            "get", url("worker-autocomplete"), {"data": {"q": "work"}}
+        ),
+        "worker-export": ("get", url("worker-export"), {}),
+        "worker-create": ("get", url("worker-create"), {}),
+        "worker-detail": ("get", url("worker-detail", worker_id), {}),
+        "worker-update": ("get", url("worker-update", worker_id), {}),
+        "worker-delete": ("get", url("worker-delete", worker_id), {}),
+        "task-create:post": ("post", url("task-create"), {
+            "data": {**task_form, "name": "Benchmark task"},
+        }),
+        "task-update:post": ("post", url("task-update", task_id), {
+            "data": task_form,
+        }),
+        "worker-create:post": ("post", url("worker-create"), {
+            "data": {**worker_form, "username": "bench_new"},
+        }),
+        "worker-update:post": (
+            "post", url("worker-update", other_worker_id), {
+                "data": {**worker_form, "username": "bench_other"},
+            }
+        ),
+        "task-delete:post": ("post", url("task-delete", task_id), {}),
+        "worker-delete:post": (
+            "post", url("worker-delete", other_worker_id), {}
+        ),
+    }
+
+
+class QueryTimer:
+    """Execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+def profile(func, repeat=20, warmup=2, using=DEFAULT_DB_ALIAS):
+    """Return latency percentiles and query statistics of func.
+
+    Latencies and SQL time are in milliseconds; ``queries`` is the
+    highest query count of a single call.
+    """
+    for _ in range(warmup):
+        func()
+    timings, counts, sql_timings = [], [], []
+    for _ in range(repeat):
+        timer = QueryTimer()
+        with connections[using].execute_wrapper(timer):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        counts.append(timer.count)
+        sql_timings.append(timer.seconds * 1000)
+    return {
+        "p50": median(timings),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+        "queries": max(counts),
+        "sql_ms": median(sql_timings),
+    }
+
+
+def measure(func, repeat=20, warmup=2):
+    """Return the timings of func in milliseconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings, percent):
+    ordered = sorted(timings)
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def median(timings):
+    return statistics.median(timings)
@@ -0,0 +1,171 @@
+"""The task board: open tasks by priority, and completed tasks.
+
+``load_board`` reads the first cards of the open columns in one query,
+numbering the open tasks of each priority with ``ROW_NUMBER() OVER
+(PARTITION BY priority_rank ...)`` and keeping the first ones, the
+first completed cards with a plain LIMIT query, and their assignees
+with one more. Columns load further cards a page at a
+time through ``column_page``, which pages with a cursor from the last
+card shown. Each column's ordering matches an index: open columns
+``task_list_order_idx``, the completed one ``task_completed_at_idx``.
+
+Moving a card to another column is a single-row update (see ``move``).
+"""
+from django.db import transaction
+from django.db.models import F, Prefetch, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from tasks import fragments, reports, statistics
+from tasks.models import Task, Worker
+from tasks.pagination import CursorPaginator
+
+COLUMNS = (*Task.PRIORITY_CHOICES, ("completed", "Completed"))
+CARDS_PER_COLUMN = 10
+
+
+class Column:
+    def __init__(self, key, label, cards, next_cursor):
+        self.key = key
+        self.label = label
+        self.cards = cards
+        self.next_cursor = next_cursor
+
+
+def column_ordering(column):
+    if column == "completed":
+        # Recently completed first.
+        return ("-completed_at", "deadline", "id")
+    return ("deadline", "id")
+
+
+def column_tasks(column):
+    if column == "completed":
+        # completed_at is set whenever is_completed is; excluding NULLs
+        # keeps the cursor off them, which databases sort differently.
+        return Task.objects.filter(
+            is_completed=True,
+            completed_at__isnull=False,
+        )
+    return Task.objects.filter(
+        is_completed=False,
+        priority_rank=Task.rank_for(column),
+    )
+
+
+def assignees_prefetch():
+    return Prefetch(
+        "assignees",
+        queryset=Worker.objects.only("username").order_by("username"),
+    )
+
+
+def with_assignees(queryset):
+    return queryset.select_related("task_type").prefetch_related(
+        assignees_prefetch()
+    )
+
+
+def load_board(size=CARDS_PER_COLUMN):
+    """Return the columns with their first size cards.
+
+    Three queries: the open columns at once, the completed column, and
+    the assignees of every card.
+    """
+    # Only open tasks are numbered: the completed ones pile up forever,
+    # and a window over them would grow with the history.
+    open_tasks = (
+        Task.objects.filter(is_completed=False)
+        .select_related("task_type")
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F("priority_rank")],
+                order_by=[F("deadline").asc(), F("id").asc()],
+            ),
+        )
+        # One more than shown tells whether a column has more.
+        .filter(position__lte=size + 1)
+        .order_by("priority_rank", "position")
+    )
+    cards = {key: [] for key, _ in COLUMNS}
+    for task in open_tasks:
+        cards[task.priority].append(task)
+    # Read straight off task_completed_at_idx.
+    cards["completed"] = list(
+        column_tasks("completed")
+        .select_related("task_type")
+        .order_by(*column_ordering("completed"))[:size + 1]
+    )
+    prefetch_related_objects(
+        [task for column in cards.values() for task in column[:size]],
+        assignees_prefetch(),
+    )
+
+    columns = []
+    for key, label in COLUMNS:
+        shown = cards[key][:size]
+        next_cursor = None
+        if len(cards[key]) > size:
+            paginator = CursorPaginator(
+                column_tasks(key),
+                size,
+                ordering=column_ordering(key),
+            )
+            next_cursor = paginator.encode_cursor("next", shown[-1])
+        columns.append(Column(key, label, shown, next_cursor))
+    return columns
+
+
+def column_page(column, cursor, size=CARDS_PER_COLUMN):
+    """Return the page of column's cards after cursor."""
+    paginator = CursorPaginator(
+        with_assignees(column_tasks(column)),
+        size,
+        ordering=column_ordering(column),
+    )
+    return paginator.page(cursor)
+
+
+def move(task_id, column):
+    """Move a task to column; return False if the task is missing.
+
+    A single UPDATE of the task's row: completing it, or reopening it
+    with the column's priority.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        previous = Task.objects.select_for_update().filter(
+            pk=task_id
+        ).values(
+            "priority", "is_completed", "created_at", "completed_at"
+        ).first()
+        if previous is None:
+            return False
+        days = {
+            reports.local_day(previous.pop("created_at")),
+            reports.local_day(previous.pop("completed_at")),
+        }
+        if column == "completed":
+            current = {**previous, "is_completed": True}
+            changes = {"is_completed": True, "completed_at": now}
+            days.add(timezone.localdate(now))
+        else:
+            current = {"priority": column, "is_completed": False}
+            changes = {
+                "is_completed": False,
+                "completed_at": None,
+                "priority": column,
+                "priority_rank": Task.rank_for(column),
+            }
+        if current == previous:
+            return True
+        Task.objects.filter(pk=task_id).update(updated_at=now, **changes)
+        before = statistics.task_counts(**previous)
+        after = statistics.task_counts(**current)
+        statistics.adjust({
+            name: value - before[name] for name, value in after.items()
+        })
+        fragments.bump(Task, [task_id])
+        reports.touch(days)
+    return True
@@ -0,0 +1,93 @@
+"""State changes for many tasks at once.
+
+Each operation is a single ``UPDATE ... WHERE id IN (...)`` (or one
+write on the assignments table) instead of loading and saving every
+task, so it does not overwrite columns edited concurrently. Because
+``QuerySet.update()`` sends no signals and skips ``auto_now``, the
+dashboard counters, cached fragments, ``updated_at`` timestamps and
+stale report days are maintained here, once per operation.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import assignments, fragments, reports, statistics
+from tasks.models import Task
+
+
+def complete(task_ids):
+    now = timezone.now()
+    with transaction.atomic():
+        updated = Task.objects.filter(
+            pk__in=task_ids,
+            is_completed=False,
+        ).update(is_completed=True, completed_at=now, updated_at=now)
+        statistics.adjust({statistics.NUM_TASKS_NOT_COMPLETED: -updated})
+        if updated:
+            fragments.bump(Task, task_ids)
+            reports.touch([timezone.localdate(now)])
+    return updated
+
+
+def reopen(task_ids):
+    with transaction.atomic():
+        tasks = Task.objects.filter(pk__in=task_ids, is_completed=True)
+        # The days the tasks were completed on, before they are cleared.
+        days = reports.task_days(tasks, ["completed_at"])
+        updated = tasks.update(
+            is_completed=False,
+            completed_at=None,
+            updated_at=timezone.now(),
+        )
+        statistics.adjust({statistics.NUM_TASKS_NOT_COMPLETED: updated})
+        if updated:
+            fragments.bump(Task, task_ids)
+            reports.touch(days)
+    return updated
+
+
+def toggle_complete(task_id):
+    """Flip one task; return its new state or None if it is missing."""
+    with transaction.atomic():
+        if complete([task_id]):
+            return True
+        if reopen([task_id]):
+            return False
+    return None
+
+
+def reprioritise(task_ids, priority):
+    with transaction.atomic():
+        tasks = Task.objects.filter(pk__in=task_ids)
+        if priority != "critical":
+            demoted = tasks.filter(priority="critical").count()
+        updated = tasks.exclude(priority=priority).update(
+            priority=priority,
+            priority_rank=Task.rank_for(priority),
+            updated_at=timezone.now(),
+        )
+        critical = updated if priority == "critical" else -demoted
+        statistics.adjust({statistics.NUM_CRITICAL_TASKS: critical})
+        if updated:
+            fragments.bump(Task, task_ids)
+            reports.touch_tasks(tasks)
+    return updated
+
+
+def reassign(task_ids, worker_ids):
+    assignments.replace(task_ids, worker_ids)
+    return len(task_ids)
+
+
+def delete(task_ids):
+    with transaction.atomic(), statistics.batch(), reports.batch():
+        deleted, per_model = Task.objects.filter(pk__in=task_ids).delete()
+    return per_model.get(Task._meta.label, 0)
+
+
+ACTIONS = {
+    "complete": complete,
+    "reopen": reopen,
+    "reprioritise": reprioritise,
+    "reassign": reassign,
+    "delete": delete,
+}
@@ -0,0 +1,120 @@
+"""Conditional GET (ETag / Last-Modified) for task and worker pages.
+
+A view using ``ConditionalGetMixin`` answers a GET with one aggregate
+query first. Its result (the newest ``updated_at`` of everything the
+page shows, and how many rows there are) becomes the validators, and
+Django's ``condition`` decorator replies 304 Not Modified when the
+client already has that version. Assignment changes touch the
+``updated_at`` of their tasks, so they invalidate the pages too.
+
+The ETag includes the current user, since pages differ per user, and
+pages with pending messages are always rendered in full.
+"""
+import hashlib
+from calendar import timegm
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+
+def has_pending_messages(request):
+    return bool(len(messages.get_messages(request)))
+
+
+def make_etag(request, last_modified, parts):
+    return hashlib.md5(
+        repr((
+            request.user.pk,
+            last_modified and last_modified.isoformat(),
+            *parts,
+        )).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+class ConditionalGetMixin:
+    def get_validator_aggregate(self):
+        """Return the queryset and aggregates of the validator query.
+
+        None skips the validators: the page is always rendered.
+        """
+        raise NotImplementedError
+
+    def get_validators_from(self, row):
+        """Return ``(last_modified, parts)`` or None to skip.
+
+        row is the result of the validator query. ``last_modified`` is
+        the newest timestamp shown on the page (or None) and parts any
+        other values the page depends on.
+        """
+        raise NotImplementedError
+
+    def get_validators(self):
+        validator_aggregate = self.get_validator_aggregate()
+        if validator_aggregate is None:
+            return None
+        queryset, aggregates = validator_aggregate
+        return self.get_validators_from(queryset.aggregate(**aggregates))
+
+    def get(self, request, *args, **kwargs):
+        get = super().get
+        if has_pending_messages(request):
+            return get(request, *args, **kwargs)
+        validators = self.get_validators()
+        if validators is None:
+            return get(request, *args, **kwargs)
+        last_modified, parts = validators
+        etag = make_etag(request, last_modified, parts)
+        return condition(
+            etag_func=lambda request, *args, **kwargs: etag,
+            last_modified_func=lambda request, *args, **kwargs: last_modified,
+        )(get)(request, *args, **kwargs)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """``ConditionalGetMixin`` for async views.
+
+    Subclasses build the page in ``async def render_page()``, which
+    is only called when the client's copy is out of date.
+    """
+
+    async def aget_validators(self):
+        validator_aggregate = self.get_validator_aggregate()
+        if validator_aggregate is None:
+            return None
+        queryset, aggregates = validator_aggregate
+        return self.get_validators_from(
+            await queryset.aaggregate(**aggregates)
+        )
+
+    async def get(self, request, *args, **kwargs):
+        render_page = self.render_page
+        if await sync_to_async(has_pending_messages)(request):
+            return await render_page(request, *args, **kwargs)
+        validators = await self.aget_validators()
+        if validators is None:
+            return await render_page(request, *args, **kwargs)
+        last_modified, parts = validators
+        etag = quote_etag(make_etag(request, last_modified, parts))
+        timestamp = last_modified and timegm(last_modified.utctimetuple())
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=timestamp,
+        )
+        if response is None:
+            response = await render_page(request, *args, **kwargs)
+            # What the condition decorator does for sync views.
+            if response.status_code == 200:
+                if timestamp and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(timestamp)
+                response.headers.setdefault("ETag", etag)
+        return response
+
+
+def latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp]
+    return max(timestamps, default=None)
@@ -0,0 +1,144 @@
+"""Streaming exports of tasks and workers as NDJSON, JSON or CSV.
+
+Rows are read with ``QuerySet.iterator()``, one chunk at a time, with
+the assignees of each chunk prefetched in one extra query, and are
+written out as soon as they are read. Memory use does not depend on
+the number of exported rows, and the response starts before the query
+has been fully read.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from tasks.models import Worker
+
+CHUNK_SIZE = 2000
+# Rows rendered together into one piece of the response body.
+ROWS_PER_WRITE = 200
+
+TASK_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type",
+    "assignees",
+    "updated_at",
+)
+WORKER_FIELDS = (
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "position",
+    "updated_at",
+)
+
+
+def task_rows(queryset, chunk_size=CHUNK_SIZE):
+    queryset = queryset.select_related("task_type").prefetch_related(
+        Prefetch(
+            "assignees",
+            queryset=Worker.objects.only("username").order_by("username"),
+        )
+    ).order_by("pk")
+    for task in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": task.id,
+            "name": task.name,
+            "description": task.description,
+            "deadline": task.deadline,
+            "is_completed": task.is_completed,
+            "priority": task.priority,
+            "task_type": task.task_type and task.task_type.name,
+            "assignees": [worker.username for worker in task.assignees.all()],
+            "updated_at": task.updated_at,
+        }
+
+
+def worker_rows(queryset, chunk_size=CHUNK_SIZE):
+    queryset = queryset.select_related("position").order_by("pk")
+    for worker in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": worker.id,
+            "username": worker.username,
+            "first_name": worker.first_name,
+            "last_name": worker.last_name,
+            "position": worker.position and worker.position.name,
+            "updated_at": worker.updated_at,
+        }
+
+
+def _json(row):
+    return json.dumps(row, cls=DjangoJSONEncoder)
+
+
+def render_ndjson(rows, fields):
+    for row in rows:
+        yield _json(row) + "\n"
+
+
+def render_json(rows, fields):
+    yield "["
+    separator = "\n"
+    for row in rows:
+        yield separator + _json(row)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return " ".join(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def render_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[field]) for field in fields])
+
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", render_ndjson),
+    "json": ("application/json", render_json),
+    "csv": ("text/csv", render_csv),
+}
+
+
+def _grouped(pieces, size=ROWS_PER_WRITE):
+    group = []
+    for piece in pieces:
+        group.append(piece)
+        if len(group) >= size:
+            yield "".join(group)
+            group = []
+    if group:
+        yield "".join(group)
+
+
+def stream(export_format, rows, fields, filename):
+    content_type, render = FORMATS[export_format]
+    response = StreamingHttpResponse(
+        _grouped(render(rows, fields)),
+        content_type=f"{content_type}; charset=utf-8",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
@@ -1,10 +1,17 @@
+from datetime import timedelta
+
+from dal import autocomplete
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
 from django.forms import DateInput
+from django.utils import timezone
 
-from tasks.models import Task, Worker
+from tasks import bulk, reports
+from tasks.archive import with_archived
+from tasks.models import ArchivedTask, DailyTaskRollup, Task, Worker
+from tasks.search import search_tasks, search_workers
 
 
 class TaskSearchForm(forms.Form):
@@ -14,7 +21,7 @@ class TaskSearchForm(forms.Form):
         label="",
         widget=forms.TextInput(
             attrs={
-                "placeholder": "Search the name of the task",
+                "placeholder": "Search the name or description of the task",
                 "class": "form-control;",
                 "style": "width: 300px",
                 "type": "text",
@@ -56,6 +63,58 @@ class TaskSearchForm(forms.Form):
         ),
         label="Include completed tasks"
     )
+    archived = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(
+            attrs={
+                "class": "form-check-input",
+            }
+        ),
+        label="Include archived tasks"
+    )
+    due = forms.ChoiceField(
+        choices=(("", "Any deadline"),) + Task.DUE_PERIODS,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control"}),
+        label="",
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the cleaned filters; search results come ranked.
+
+        Archived tasks are all completed. When they are included, the
+        result is a UNION with the ones matching the same filters
+        (see ``tasks.archive.with_archived``).
+        """
+        due = self.cleaned_data["due"]
+        archived = self.cleaned_data["archived"] and not due
+        if due:
+            # Only open tasks are overdue or due soon.
+            queryset = queryset.due(due)
+        elif not (self.cleaned_data["is_completed"] or archived):
+            queryset = queryset.filter(is_completed=False)
+        queryset = self.filter_matches(queryset)
+        if archived:
+            return with_archived(
+                queryset,
+                self.filter_matches(ArchivedTask.objects.using(queryset.db)),
+            )
+        return queryset
+
+    def filter_matches(self, queryset):
+        priority = self.cleaned_data["priority"]
+        # Every task has one of the priorities, so selecting them all
+        # filters nothing. The rank is what the indexes cover.
+        if priority and len(set(priority)) < len(Task.PRIORITY_CHOICES):
+            queryset = queryset.filter(
+                priority_rank__in=[Task.rank_for(value) for value in priority]
+            )
+        assignee = self.cleaned_data["assignee"]
+        if assignee:
+            queryset = queryset.filter(
+                assignees__username__icontains=assignee
+            )
+        return search_tasks(queryset, self.cleaned_data["search_field"])
 
 
 class WorkerSearchForm(forms.Form):
@@ -73,6 +132,9 @@ class WorkerSearchForm(forms.Form):
         )
     )
 
+    def filter_queryset(self, queryset):
+        return search_workers(queryset, self.cleaned_data["search_field"])
+
 
 class WorkerCreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
@@ -100,7 +162,14 @@ class WorkerCreationForm(UserCreationForm):
 class TaskForm(forms.ModelForm):
     assignees = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=autocomplete.ModelSelect2Multiple(
+            url="tasks:worker-autocomplete",
+            attrs={
+                "data-placeholder": "Start typing a name",
+                "data-minimum-input-length": 1,
+                "style": "width: 100%",
+            },
+        ),
     )
     deadline = forms.DateField(
         widget=DateInput(
@@ -113,3 +182,117 @@ class TaskForm(forms.ModelForm):
     class Meta:
         model = Task
         exclude = ['is_completed']
+
+
+class TaskBulkActionForm(forms.Form):
+    ACTION_CHOICES = (
+        ("complete", "Complete"),
+        ("reopen", "Reopen"),
+        ("reprioritise", "Change priority"),
+        ("reassign", "Reassign"),
+        ("delete", "Delete"),
+    )
+
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.all(),
+        widget=forms.MultipleHiddenInput,
+        error_messages={"required": "Select at least one task."},
+    )
+    action = forms.ChoiceField(
+        choices=ACTION_CHOICES,
+        label="",
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+    priority = forms.ChoiceField(
+        choices=(("", "Priority"),) + Task.PRIORITY_CHOICES,
+        required=False,
+        label="",
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+    assignees = forms.ModelMultipleChoiceField(
+        queryset=get_user_model().objects.all(),
+        required=False,
+        label="",
+        widget=autocomplete.ModelSelect2Multiple(
+            url="tasks:worker-autocomplete",
+            attrs={
+                "data-placeholder": "Assignees",
+                "data-minimum-input-length": 1,
+                "style": "width: 300px",
+            },
+        ),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action == "reprioritise" and not cleaned_data.get("priority"):
+            self.add_error("priority", "Choose the new priority.")
+        if action == "reassign" and not cleaned_data.get("assignees"):
+            self.add_error("assignees", "Choose at least one assignee.")
+        return cleaned_data
+
+    def save(self):
+        """Run the chosen action and return how many tasks it changed."""
+        action = self.cleaned_data["action"]
+        task_ids = [task.pk for task in self.cleaned_data["tasks"]]
+        if action == "reprioritise":
+            return bulk.reprioritise(task_ids, self.cleaned_data["priority"])
+        if action == "reassign":
+            return bulk.reassign(task_ids, [
+                worker.pk for worker in self.cleaned_data["assignees"]
+            ])
+        return bulk.ACTIONS[action](task_ids)
+
+
+class ReportForm(forms.Form):
+    # Twelve weeks, unless the report asks for another range.
+    DEFAULT_DAYS = 84
+    MAX_DAYS = 731
+
+    dimension = forms.ChoiceField(
+        choices=DailyTaskRollup.DIMENSIONS,
+        required=False,
+        label="",
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+    period = forms.ChoiceField(
+        choices=reports.PERIODS,
+        required=False,
+        label="",
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+    start = forms.DateField(
+        required=False,
+        label="From",
+        widget=DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+    end = forms.DateField(
+        required=False,
+        label="To",
+        widget=DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        cleaned_data["dimension"] = cleaned_data.get("dimension") or "type"
+        cleaned_data["period"] = cleaned_data.get("period") or "week"
+        end = cleaned_data.get("end") or timezone.localdate()
+        start = cleaned_data.get("start") or end - timedelta(
+            days=self.DEFAULT_DAYS - 1
+        )
+        if start > end:
+            self.add_error("end", "The report must end after it starts.")
+        elif (end - start).days >= self.MAX_DAYS:
+            self.add_error("start", "Reports cover at most two years.")
+        cleaned_data["start"], cleaned_data["end"] = start, end
+        return cleaned_data
+
+    def report(self):
+        """Return ``reports.report()`` for the cleaned choices."""
+        return reports.report(
+            self.cleaned_data["dimension"],
+            self.cleaned_data["period"],
+            self.cleaned_data["start"],
+            self.cleaned_data["end"],
+        )
@@ -0,0 +1,119 @@
+"""Cached template fragments keyed on per-object version stamps.
+
+Every task and worker has a version stamp in the cache. A fragment
+rendered for an object is stored under a key holding that stamp, so
+changing the object only needs a new stamp: the old fragments are
+never read again and expire on their own. The signal handlers in
+``tasks.signals`` bump the stamps on saves, deletes and assignment
+changes, and ``tasks.bulk`` bumps them after its UPDATE statements.
+
+Stamps are random tokens written with ``set_many``, which every cache
+backend supports (local memory, file, Redis), so no atomic increment
+is needed. Inside a transaction the stamps are bumped right away and
+once more on commit, so a fragment rendered from the old rows while
+the transaction was open is not served afterwards.
+
+Hits and misses are counted per process, see ``stats()``.
+"""
+import threading
+import uuid
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import connection, transaction
+
+CACHE_ALIAS = "default"
+# Fragments of objects changed without a signal (raw SQL, shell
+# updates) are refreshed after this many seconds at the latest.
+FRAGMENT_TIMEOUT = 60 * 60
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def version_key(model, pk):
+    return f"version:{model._meta.label_lower}:{pk}"
+
+
+def fragment_key(name, obj, version):
+    return f"fragment:{name}:{obj._meta.label_lower}:{obj.pk}:{version}"
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def attach_versions(objects):
+    """Load the version stamps of objects with one cache round trip.
+
+    The stamp is stored as ``obj._cache_version``, where the
+    ``cachefragment`` template tag picks it up.
+    """
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return objects
+    cache = get_cache()
+    keys = {version_key(type(obj), obj.pk): obj for obj in objects}
+    versions = cache.get_many(keys)
+    for key, obj in keys.items():
+        version = versions.get(key)
+        if version is None:
+            version = _new_version()
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        obj._cache_version = version
+    return objects
+
+
+def get_version(obj):
+    if not hasattr(obj, "_cache_version"):
+        attach_versions([obj])
+    return obj._cache_version
+
+
+def bump(model, pks):
+    """Invalidate every cached fragment of the given objects."""
+    keys = [version_key(model, pk) for pk in set(pks) if pk is not None]
+    if not keys:
+        return
+
+    def write():
+        get_cache().set_many(
+            {key: _new_version() for key in keys},
+            None,
+        )
+
+    write()
+    if connection.in_atomic_block:
+        transaction.on_commit(write)
+
+
+def get_fragment(key):
+    content = get_cache().get(key)
+    with _stats_lock:
+        _stats["hits" if content is not None else "misses"] += 1
+    return content
+
+
+def set_fragment(key, content):
+    get_cache().set(key, content, FRAGMENT_TIMEOUT)
+
+
+def stats():
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,334 @@
+"""Bulk import of tasks and workers from CSV or JSON Lines.
+
+Rows are read lazily and written in batches, each batch in its own
+transaction: one ``bulk_create`` for the rows, one for their
+assignments and one counter adjustment. Task types, positions and
+assignee usernames are resolved through lookup maps filled with one
+query per batch. A row that cannot be imported is reported and
+skipped; it never aborts the batch.
+
+Values are checked against the model fields (lengths, the username
+rules) before they reach the database, so an invalid value skips its
+row rather than failing the batch.
+
+The accepted columns are the ones ``tasks.export`` writes, so an export
+can be imported again. Assignees are usernames, separated by spaces in
+CSV or given as a list in JSON Lines.
+"""
+import csv
+import datetime
+import json
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import reports, statistics
+from tasks.models import (
+    Position,
+    Task,
+    TaskAssignment,
+    TaskType,
+    Worker,
+    WorkerSearchKey,
+)
+from tasks.search import worker_search_keys
+
+BATCH_SIZE = 5000
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"", "0", "false", "no", "n"}
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(stream, input_format):
+    """Yield ``(line_number, row)`` pairs from a CSV or JSONL stream."""
+    if input_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = RowError(f"invalid JSON: {e}")
+        else:
+            if not isinstance(row, dict):
+                row = RowError("expected a JSON object")
+        yield line_number, row
+
+
+def _text(row, name, required=False):
+    value = row.get(name)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f"{name} is required")
+    return value
+
+
+def _boolean(row, name):
+    value = row.get(name)
+    if isinstance(value, bool):
+        return value
+    value = _text(row, name).lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise RowError(f"{name} must be true or false, not {value!r}")
+
+
+def _date(row, name):
+    value = _text(row, name, required=True)
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise RowError(f"{name} must be a YYYY-MM-DD date, not {value!r}")
+
+
+def _clean(model, name, value):
+    """Check value against the model field name; return it cleaned."""
+    try:
+        return model._meta.get_field(name).clean(value, None)
+    except ValidationError as e:
+        raise RowError(f"{name}: {' '.join(e.messages)}")
+
+
+def _usernames(row, name):
+    value = row.get(name) or []
+    if isinstance(value, str):
+        value = value.split()
+    if not isinstance(value, list):
+        raise RowError(f"{name} must be a list of usernames")
+    return list(dict.fromkeys(str(username) for username in value))
+
+
+class NameLookup:
+    """Map names to primary keys, creating the missing objects."""
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+
+    def clear(self):
+        self.ids = {}
+
+    def resolve(self, names):
+        missing = {name for name in names if name and name not in self.ids}
+        if not missing:
+            return
+        for pk, name in self.model.objects.filter(
+            name__in=missing
+        ).values_list("pk", "name"):
+            self.ids.setdefault(name, pk)
+        for name in sorted(missing - self.ids.keys()):
+            self.ids[name] = self.model.objects.create(name=name).pk
+
+    def __getitem__(self, name):
+        return self.ids[name] if name else None
+
+
+class Importer:
+    def __init__(self, batch_size=BATCH_SIZE, on_error=None,
+                 on_batch=None):
+        self.batch_size = batch_size
+        self.on_error = on_error or (lambda line, message: None)
+        self.on_batch = on_batch or (lambda imported, skipped: None)
+        self.imported = 0
+        self.skipped = 0
+
+    def run(self, rows):
+        batch = []
+        for line_number, row in rows:
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                batch.append((line_number, self.parse(row)))
+            except RowError as e:
+                self.skip(line_number, str(e))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        return self.imported, self.skipped
+
+    def skip(self, line_number, message):
+        self.skipped += 1
+        self.on_error(line_number, message)
+
+    def flush(self, batch):
+        try:
+            with transaction.atomic():
+                self.imported += self.write(batch)
+        except Exception:
+            # The objects the batch created were rolled back with it.
+            self.forget()
+            raise
+        self.on_batch(self.imported, self.skipped)
+
+    def forget(self):
+        """Drop what was cached about the database."""
+
+    def parse(self, row):
+        raise NotImplementedError
+
+    def write(self, batch):
+        """Save the parsed rows of a batch, return how many were saved."""
+        raise NotImplementedError
+
+
+class TaskImporter(Importer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task_types = NameLookup(TaskType)
+        self.worker_ids = {}
+
+    def forget(self):
+        self.task_types.clear()
+        self.worker_ids = {}
+
+    def parse(self, row):
+        priority = _text(row, "priority") or "normal"
+        if priority not in Task.PRIORITY_RANKS:
+            raise RowError(f"unknown priority {priority!r}")
+        is_completed = _boolean(row, "is_completed")
+        task_type = _text(row, "task_type")
+        if task_type:
+            _clean(TaskType, "name", task_type)
+        return {
+            "task": Task(
+                name=_clean(Task, "name", _text(row, "name", required=True)),
+                description=_clean(
+                    Task, "description", _text(row, "description")
+                ),
+                deadline=_date(row, "deadline"),
+                is_completed=is_completed,
+                priority=priority,
+                priority_rank=Task.rank_for(priority),
+                completed_at=timezone.now() if is_completed else None,
+            ),
+            "task_type": task_type,
+            "assignees": _usernames(row, "assignees"),
+        }
+
+    def resolve_workers(self, usernames):
+        missing = set(usernames) - self.worker_ids.keys()
+        if missing:
+            self.worker_ids.update(
+                Worker.objects.filter(
+                    username__in=missing
+                ).values_list("username", "pk")
+            )
+
+    def write(self, batch):
+        self.task_types.resolve(parsed["task_type"] for _, parsed in batch)
+        self.resolve_workers(
+            username
+            for _, parsed in batch
+            for username in parsed["assignees"]
+        )
+        tasks, assignees = [], []
+        for line_number, parsed in batch:
+            unknown = [
+                username for username in parsed["assignees"]
+                if username not in self.worker_ids
+            ]
+            if unknown:
+                self.skip(
+                    line_number, f"unknown assignees: {', '.join(unknown)}"
+                )
+                continue
+            task = parsed["task"]
+            task.task_type_id = self.task_types[parsed["task_type"]]
+            tasks.append(task)
+            assignees.append(parsed["assignees"])
+        Task.objects.bulk_create(tasks)
+        TaskAssignment.objects.bulk_create([
+            TaskAssignment(task_id=task.pk, worker_id=self.worker_ids[name])
+            for task, names in zip(tasks, assignees)
+            for name in names
+        ])
+        deltas = {}
+        for task in tasks:
+            counts = statistics.task_counts(task.priority, task.is_completed)
+            for name, value in counts.items():
+                deltas[name] = deltas.get(name, 0) + value
+        statistics.adjust(deltas)
+        reports.touch(
+            reports.local_day(moment)
+            for task in tasks
+            for moment in (task.created_at, task.completed_at)
+        )
+        return len(tasks)
+
+
+class WorkerImporter(Importer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.positions = NameLookup(Position)
+        # Imported workers log in after a password reset.
+        self.password = make_password(None)
+
+    def forget(self):
+        self.positions.clear()
+
+    def parse(self, row):
+        position = _text(row, "position")
+        if position:
+            _clean(Position, "name", position)
+        fields = {
+            name: _clean(Worker, name, _text(row, name))
+            for name in ("first_name", "last_name", "email")
+        }
+        return {
+            "worker": Worker(
+                username=_clean(
+                    Worker, "username", _text(row, "username", required=True)
+                ),
+                password=self.password,
+                **fields,
+            ),
+            "position": position,
+        }
+
+    def write(self, batch):
+        self.positions.resolve(parsed["position"] for _, parsed in batch)
+        taken = set(
+            Worker.objects.filter(
+                username__in=[parsed["worker"].username for _, parsed in batch]
+            ).values_list("username", flat=True)
+        )
+        workers = []
+        for line_number, parsed in batch:
+            worker = parsed["worker"]
+            if worker.username in taken:
+                self.skip(
+                    line_number, f"username {worker.username!r} is taken"
+                )
+                continue
+            taken.add(worker.username)
+            worker.position_id = self.positions[parsed["position"]]
+            workers.append(worker)
+        Worker.objects.bulk_create(workers)
+        WorkerSearchKey.objects.bulk_create([
+            WorkerSearchKey(worker_id=worker.pk, key=key)
+            for worker in workers
+            for key in worker_search_keys(
+                worker.username, worker.first_name, worker.last_name
+            )
+        ])
+        statistics.adjust({statistics.NUM_WORKERS: len(workers)})
+        return len(workers)
+
+
+IMPORTERS = {
+    "tasks": TaskImporter,
+    "workers": WorkerImporter,
+}
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.archive import BATCH_SIZE, DEFAULT_RETENTION_DAYS, archive_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tasks completed more than --days ago, with their "
+        "assignments, into the archive tables in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=DEFAULT_RETENTION_DAYS,
+            help="Keep tasks completed within this many days live.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--days and --batch-size must be positive.")
+        self.started = time.perf_counter()
+        archived = archive_tasks(
+            days=options["days"],
+            batch_size=options["batch_size"],
+            on_batch=self.report_progress,
+        )
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} tasks in {elapsed:.1f}s."
+        ))
+
+    def report_progress(self, archived):
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f"{archived} archived ({elapsed:.1f}s)")
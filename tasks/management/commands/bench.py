@@ -0,0 +1,216 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+
+from tasks import statistics, urls
+from tasks.benchmark import (
+    profile,
+    route_requests,
+    scratch_database,
+    seed_assignments,
+    seed_tasks,
+    seed_workers,
+)
+from tasks.models import Position, Task, TaskType, Worker
+
+
+def find_regressions(baseline, results, threshold, min_delta):
+    """Describe every route slower or more query hungry than baseline.
+
+    A route regresses when its median latency grew by more than
+    threshold (a fraction) and at least min_delta milliseconds, or when
+    it runs more queries.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        slower = result["p50"] - before["p50"]
+        if (
+            slower > min_delta
+            and result["p50"] > before["p50"] * (1 + threshold)
+        ):
+            regressions.append(
+                f"{name}: p50 {before['p50']:.2f} -> {result['p50']:.2f} ms"
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: {before['queries']} -> {result['queries']} queries"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every route of tasks.urls on a synthetic dataset and compare "
+        "the results with a JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=500)
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument(
+            "--density",
+            type=float,
+            default=2,
+            help="Average number of assignees per task.",
+        )
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument(
+            "--routes",
+            nargs="+",
+            help="Only time these routes (URL names).",
+        )
+        parser.add_argument(
+            "--baseline",
+            default="bench_baseline.json",
+            help="Results to compare with; written if it does not exist.",
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Overwrite the baseline with this run's results.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative growth of the median latency.",
+        )
+        parser.add_argument(
+            "--min-delta",
+            type=float,
+            default=1.0,
+            help="Ignore latency growth below this many milliseconds.",
+        )
+
+    def handle(self, *args, **options):
+        baseline_path = Path(options["baseline"])
+        dataset = {
+            "workers": options["workers"],
+            "tasks": options["tasks"],
+            "density": options["density"],
+        }
+        baseline = None
+        if baseline_path.exists() and not options["save"]:
+            baseline = json.loads(baseline_path.read_text())
+            if baseline["dataset"] != dataset:
+                raise CommandError(
+                    f"{baseline_path} was recorded on a different dataset "
+                    f"({baseline['dataset']}); pass the same sizes or "
+                    f"--save a new baseline."
+                )
+
+        with scratch_database():
+            results = self.run(options)
+        self.report(results, baseline and baseline["routes"])
+
+        if baseline is None:
+            baseline_path.write_text(json.dumps(
+                {"dataset": dataset, "routes": results}, indent=2
+            ) + "\n")
+            self.stdout.write(f"Baseline written to {baseline_path}.")
+            return
+        regressions = find_regressions(
+            baseline["routes"],
+            results,
+            options["threshold"],
+            options["min_delta"],
+        )
+        if regressions:
+            raise CommandError(
+                "Routes regressed:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def run(self, options):
+        seed_workers(options["workers"], seed=1)
+        seed_tasks(options["tasks"], seed=1)
+        seed_assignments(options["density"], seed=1)
+        statistics.rebuild()
+        worker = Worker.objects.create_user(username="bench_user")
+        task_id = Task.objects.order_by("pk").values_list(
+            "pk", flat=True
+        ).first()
+        worker.tasks.add(task_id)
+
+        requests = route_requests(
+            task_id,
+            worker.pk,
+            other_worker_id=Worker.objects.exclude(
+                pk=worker.pk
+            ).values_list("pk", flat=True).first(),
+            task_type_id=TaskType.objects.create(name="Bench").pk,
+            position_id=Position.objects.create(name="Bench").pk,
+        )
+        missing = {
+            pattern.name for pattern in urls.urlpatterns
+        } - requests.keys()
+        if missing:
+            raise CommandError(
+                f"No benchmark request for routes: {', '.join(missing)}"
+            )
+        names = options["routes"] or list(requests)
+        unknown = set(names) - requests.keys()
+        if unknown:
+            raise CommandError(f"Unknown routes: {', '.join(unknown)}")
+
+        # Outside INTERNAL_IPS, so the debug toolbar stays out of the way.
+        client = Client(HTTP_HOST="127.0.0.1", REMOTE_ADDR="10.0.0.1")
+        client.force_login(worker)
+        return {
+            name: profile(
+                self.requester(client, *requests[name]),
+                repeat=options["repeat"],
+            )
+            for name in names
+        }
+
+    def requester(self, client, method, url, kwargs):
+        writes = method != "get"
+        if method == "write":
+            method = "get"
+
+        def request():
+            response = getattr(client, method)(url, **kwargs)
+            if response.status_code >= 400:
+                raise CommandError(
+                    f"{method.upper()} {url} answered "
+                    f"{response.status_code}"
+                )
+            if response.streaming:
+                # Exports query the database while they are consumed.
+                for _ in response.streaming_content:
+                    pass
+
+        if not writes:
+            return request
+
+        def rolled_back():
+            with transaction.atomic():
+                request()
+                transaction.set_rollback(True)
+
+        return rolled_back
+
+    def report(self, results, baseline=None):
+        self.stdout.write(
+            f"{'route':<22}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'queries':>9}{'sql ms':>9}{'p50 was':>10}"
+        )
+        for name, result in results.items():
+            line = (
+                f"{name:<22}"
+                f"{result['p50']:>9.2f}"
+                f"{result['p95']:>9.2f}"
+                f"{result['p99']:>9.2f}"
+                f"{result['queries']:>9}"
+                f"{result['sql_ms']:>9.2f}"
+            )
+            if baseline and name in baseline:
+                line += f"{baseline[name]['p50']:>10.2f}"
+            self.stdout.write(line)
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from tasks import fragments
+from tasks.benchmark import (
+    measure,
+    median,
+    percentile,
+    scratch_database,
+    seed_tasks,
+)
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare page latency with an empty fragment cache (cold) and a "
+        "filled one (warm) on a synthetic dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument("--assigned", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.run(options)
+
+    def run(self, options):
+        seed_tasks(options["tasks"], seed=1)
+        worker = get_user_model().objects.create_user(
+            username="bench_user", password="bench_pass"
+        )
+        task_ids = Task.objects.values_list("pk", flat=True)
+        worker.tasks.add(*task_ids[:options["assigned"]])
+        # Outside INTERNAL_IPS, so the debug toolbar stays out of the way.
+        client = Client(HTTP_HOST="127.0.0.1", REMOTE_ADDR="10.0.0.1")
+        client.force_login(worker)
+        pages = {
+            "task list": reverse("tasks:task-list"),
+            "task detail": reverse("tasks:task-detail", args=[task_ids[0]]),
+            "worker list": reverse("tasks:worker-list"),
+            "worker detail": reverse(
+                "tasks:worker-detail", args=[worker.pk]
+            ),
+        }
+        cache = fragments.get_cache()
+
+        self.stdout.write(
+            "page            cold p50   cold p95   warm p50   warm p95"
+            "   hit ratio   (ms)"
+        )
+        for name, url in pages.items():
+            def cold():
+                cache.clear()
+                client.get(url)
+
+            def warm():
+                client.get(url)
+
+            cold_timings = measure(cold, repeat=options["repeat"])
+            fragments.reset_stats()
+            warm_timings = measure(warm, repeat=options["repeat"])
+            self.stdout.write(
+                f"{name:<14}"
+                f"{median(cold_timings):>10.2f} "
+                f"{percentile(cold_timings, 95):>10.2f} "
+                f"{median(warm_timings):>10.2f} "
+                f"{percentile(warm_timings, 95):>10.2f} "
+                f"{fragments.stats()['hit_ratio']:>11.0%}"
+            )
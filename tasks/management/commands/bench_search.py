@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+
+from tasks.benchmark import (
+    measure,
+    median,
+    percentile,
+    scratch_database,
+    seed_tasks,
+)
+from tasks.models import Task
+from tasks.search import search_tasks
+from tasks.views import TaskListView
+
+NEEDLE = "quarterly"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-text task search with the old icontains filter "
+        "on growing synthetic datasets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+        )
+        parser.add_argument("--needles", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.run(options)
+
+    def run(self, options):
+        ordering = TaskListView.cursor_ordering
+        seed_tasks(options["needles"], seed=1)
+        Task.objects.update(
+            name=f"{NEEDLE} audit",
+            is_completed=False,
+            priority="normal",
+            priority_rank=Task.rank_for("normal"),
+        )
+        live = Task.objects.filter(is_completed=False)
+
+        def fulltext():
+            return list(
+                search_tasks(live, NEEDLE)
+                .order_by("-search_rank", *ordering)[:10]
+            )
+
+        def icontains():
+            return list(
+                live.filter(name__icontains=NEEDLE).order_by(*ordering)[:10]
+            )
+
+        self.stdout.write(
+            "     tasks   search p50   search p95"
+            "  icontains p50  icontains p95   (ms)"
+        )
+        total = options["needles"]
+        for size in sorted(options["sizes"]):
+            total += seed_tasks(size - total, seed=size)
+            results = [
+                measure(func, repeat=options["repeat"])
+                for func in (fulltext, icontains)
+            ]
+            search, scan = results
+            self.stdout.write(
+                f"{total:>10} "
+                f"{median(search):>12.2f} {percentile(search, 95):>12.2f} "
+                f"{median(scan):>14.2f} {percentile(scan, 95):>14.2f}"
+            )
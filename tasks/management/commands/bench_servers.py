@@ -0,0 +1,200 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.benchmark import median, percentile
+
+# Run through "manage.py shell" against the benchmark database; prints
+# the session cookie of a logged in user.
+SEED_SCRIPT = """
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client
+from tasks import statistics
+from tasks.benchmark import seed_tasks
+
+seed_tasks({tasks}, seed=1)
+user = get_user_model().objects.create_user("bench_user")
+user.tasks.add(*range(1, {tasks} + 1, 50))
+statistics.rebuild()
+client = Client()
+client.force_login(user)
+print(client.cookies[settings.SESSION_COOKIE_NAME].value)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path, cookie):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: 127.0.0.1\r\n"
+        f"Cookie: {settings.SESSION_COOKIE_NAME}={cookie}\r\n"
+        f"Connection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(port, paths, cookie, concurrency, duration):
+    """Request paths round robin from concurrent clients."""
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client(offset):
+        nonlocal errors
+        number = offset
+        while time.perf_counter() < deadline:
+            path = paths[number % len(paths)]
+            number += 1
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path, cookie)
+            except (OSError, IndexError, ValueError):
+                status = None
+            if status != 200:
+                errors += 1
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    return timings, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second of the WSGI views under gunicorn "
+        "and the async views under uvicorn at high concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument("--processes", type=int, default=2)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Threads per gunicorn process.",
+        )
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10,
+            help="Seconds of load per server.",
+        )
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=["/", "/tasks/", "/workers/", "/tasks/1/"],
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{directory}/bench.sqlite3",
+                "DJANGO_DEBUG": "False",
+            }
+            env.pop("DJANGO_ASYNC_VIEWS", None)
+            # The servers must read the benchmark database, not replicas.
+            env.pop("DATABASE_REPLICA_URLS", None)
+            self.run_manage(env, "migrate", "--verbosity", "0")
+            cookie = self.run_manage(
+                env,
+                "shell",
+                "--command",
+                SEED_SCRIPT.format(tasks=options["tasks"]),
+            ).strip().splitlines()[-1]
+
+            self.stdout.write(
+                "server                requests      rps   p50 ms   p99 ms"
+                "   errors"
+            )
+            port = free_port()
+            processes = str(options["processes"])
+            servers = {
+                "gunicorn (WSGI)": [
+                    sys.executable, "-m", "gunicorn", "task_manager.wsgi",
+                    "--bind", f"127.0.0.1:{port}",
+                    "--workers", processes,
+                    "--threads", str(options["threads"]),
+                ],
+                "uvicorn (ASGI)": [
+                    sys.executable, "-m", "uvicorn",
+                    "task_manager.asgi:application",
+                    "--port", str(port),
+                    "--workers", processes,
+                    "--no-access-log",
+                ],
+            }
+            for name, command in servers.items():
+                timings, errors = self.bench(command, env, port, cookie,
+                                             options)
+                self.stdout.write(
+                    f"{name:<18}{len(timings):>12}"
+                    f"{len(timings) / options['duration']:>9.0f}"
+                    f"{median(timings) if timings else 0:>9.1f}"
+                    f"{percentile(timings, 99) if timings else 0:>9.1f}"
+                    f"{errors:>9}"
+                )
+
+    def run_manage(self, env, *args):
+        result = subprocess.run(
+            [sys.executable, "manage.py", *args],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        return result.stdout
+
+    def bench(self, command, env, port, cookie, options):
+        server = subprocess.Popen(
+            command,
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_for(port, server)
+            return asyncio.run(load(
+                port,
+                options["paths"],
+                cookie,
+                options["concurrency"],
+                options["duration"],
+            ))
+        finally:
+            server.terminate()
+            server.wait()
+
+    def wait_for(self, port, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"{server.args[2]} exited on start")
+            try:
+                socket.create_connection(("127.0.0.1", port), 1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"{server.args[2]} did not start")
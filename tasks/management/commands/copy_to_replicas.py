@@ -0,0 +1,38 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database to the SQLite replicas of "
+        "DATABASE_REPLICA_URLS, standing in for replication when "
+        "trying the read replicas locally."
+    )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite":
+            raise CommandError(
+                "copy_to_replicas only copies SQLite databases; "
+                "replicate other databases with the database server."
+            )
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas: set DATABASE_REPLICA_URLS.")
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias]
+            if replica.vendor != "sqlite":
+                raise CommandError(f"Replica {alias} is not SQLite.")
+            replica.close()
+            target = sqlite3.connect(replica.settings_dict["NAME"])
+            try:
+                # A consistent snapshot, even while others write.
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(
+                f"Copied to {alias} ({replica.settings_dict['NAME']})."
+            )
@@ -0,0 +1,68 @@
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import BATCH_SIZE, IMPORTERS, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks or workers from a CSV or JSON Lines file "
+        "(or standard input) in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="File to read, or - for standard input.",
+        )
+        parser.add_argument(
+            "--kind",
+            choices=sorted(IMPORTERS),
+            default="tasks",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Defaults to the file extension, or csv for stdin.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"]
+        if input_format is None:
+            input_format = "jsonl" if path.endswith(
+                (".jsonl", ".ndjson")
+            ) else "csv"
+        importer = IMPORTERS[options["kind"]](
+            batch_size=options["batch_size"],
+            on_error=self.report_error,
+            on_batch=self.report_progress,
+        )
+        self.started = time.perf_counter()
+        if path == "-":
+            stream = nullcontext(sys.stdin)
+        else:
+            try:
+                stream = open(path, newline="", encoding="utf-8")
+            except OSError as e:
+                raise CommandError(e)
+        with stream as stream:
+            imported, skipped = importer.run(read_rows(stream, input_format))
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} {options['kind']} in {elapsed:.1f}s, "
+            f"skipped {skipped} rows."
+        ))
+
+    def report_error(self, line_number, message):
+        self.stderr.write(f"line {line_number}: {message}")
+
+    def report_progress(self, imported, skipped):
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f"{imported} imported, {skipped} skipped ({elapsed:.1f}s)"
+        )
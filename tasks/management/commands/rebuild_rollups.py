@@ -0,0 +1,59 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks import reports
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily task rollups of the days marked stale, or of "
+        "every day from --start to --end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=parse_date)
+        parser.add_argument(
+            "--end",
+            type=parse_date,
+            help="Last day to rebuild (default: today).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        start, end = options["start"], options["end"]
+        if start is None:
+            if end is not None:
+                raise CommandError("--end needs --start.")
+            refreshed = reports.refresh()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt {refreshed} stale days in {elapsed:.1f}s."
+            ))
+            return
+        end = end or timezone.localdate()
+        if end < start:
+            raise CommandError("--end must not be before --start.")
+        day, rebuilt = start, 0
+        while day <= end:
+            last = min(day + datetime.timedelta(days=reports.CHUNK_DAYS - 1), end)
+            rebuilt += reports.rebuild(
+                day + datetime.timedelta(days=offset)
+                for offset in range((last - day).days + 1)
+            )
+            self.stdout.write(f"{day}..{last} rebuilt")
+            day = last + datetime.timedelta(days=1)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rebuilt} rollups from {start} to {end} "
+            f"in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tasks import statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters from the task and worker tables."
+
+    def handle(self, *args, **options):
+        totals = statistics.rebuild()
+        for name, value in totals.items():
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS("Statistics rebuilt."))
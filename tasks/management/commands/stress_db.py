@@ -0,0 +1,140 @@
+import multiprocessing
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import override_settings
+
+from tasks.benchmark import median, percentile
+from tasks.database import DEFAULT_SQLITE_PRAGMAS
+from tasks.models import Task
+
+PROFILES = {
+    # SQLite's own defaults: rollback journal, full fsync per commit,
+    # and the 5 second lock timeout of Python's sqlite3 module.
+    "default": {},
+    "tuned": DEFAULT_SQLITE_PRAGMAS,
+}
+
+
+def _write(count):
+    timings, locked = [], 0
+    for number in range(count):
+        start = time.perf_counter()
+        try:
+            # Inserting a task also updates the dashboard counters in the
+            # same transaction, a row every writer contends for.
+            Task.objects.create(
+                name=f"Stress {number}",
+                deadline=date.today(),
+            )
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+    return "write", timings, locked
+
+
+def _read(count):
+    timings, locked = [], 0
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            list(Task.objects.order_by("-pk")[:20])
+            Task.objects.filter(is_completed=False).count()
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+    return "read", timings, locked
+
+
+def _run(job):
+    # Each process opens its own connection, with the pragmas in force.
+    kind, count = job
+    try:
+        return {"write": _write, "read": _read}[kind](count)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a scratch SQLite database from concurrent processes with "
+        "SQLite's default settings and with the pragmas of "
+        "tasks.database, and compare throughput and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=200,
+            help="Writes (or reads) per process.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.vendor != "sqlite":
+            raise CommandError("stress_db only tunes SQLite databases.")
+        self.stdout.write(
+            "profile    writes/s  write p50  write p99   reads/s"
+            "   locked   (ms)"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for name, pragmas in PROFILES.items():
+                path = Path(directory) / f"{name}.sqlite3"
+                self.stress(connection, path, pragmas, name, options)
+
+    def stress(self, connection, path, pragmas, name, options):
+        settings_dict = connection.settings_dict
+        old_name = settings_dict["NAME"]
+        connections.close_all()
+        settings_dict["NAME"] = path
+        try:
+            with override_settings(
+                SQLITE_PRAGMAS=pragmas,
+                DATABASE_REPLICAS=[],
+            ):
+                call_command("migrate", verbosity=0)
+                connections.close_all()
+                jobs = (
+                    [("write", options["transactions"])] * options["writers"]
+                    + [("read", options["transactions"])] * options["readers"]
+                )
+                context = multiprocessing.get_context("fork")
+                start = time.perf_counter()
+                with context.Pool(len(jobs)) as pool:
+                    results = pool.map(_run, jobs)
+                elapsed = time.perf_counter() - start
+        finally:
+            connections.close_all()
+            settings_dict["NAME"] = old_name
+
+        writes = [
+            timing
+            for kind, timings, _ in results if kind == "write"
+            for timing in timings
+        ]
+        reads = sum(
+            len(timings) for kind, timings, _ in results if kind == "read"
+        )
+        locked = sum(count for _, _, count in results)
+        self.stdout.write(
+            f"{name:<8}"
+            f"{len(writes) / elapsed:>10.0f}"
+            f"{median(writes) if writes else 0:>11.2f}"
+            f"{percentile(writes, 99) if writes else 0:>11.2f}"
+            f"{reads / elapsed:>10.0f}"
+            f"{locked:>9}"
+        )
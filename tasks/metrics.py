@@ -0,0 +1,114 @@
+"""Per-view histograms exposed in the Prometheus text format.
+
+Histograms live in the memory of each process and are shared by its
+threads. With several server processes, every scrape of ``/metrics``
+reports the process that answered it; scrape each process separately
+(or run one process per container) to see them all.
+"""
+import threading
+from bisect import bisect_left
+
+# Seconds.
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return (
+        value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    )
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        # view: [count per bucket..., count above the last bucket, sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(view)
+            if series is None:
+                series = self._series[view] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {
+                view: list(values) for view, values in self._series.items()
+            }
+        bounds = [*map(_number, self.buckets), "+Inf"]
+        for view, values in sorted(series.items()):
+            label = f'view="{_escape(view)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{label},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f"{self.name}_sum{{{label}}} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return "\n".join(lines)
+
+
+REQUEST_DURATION = Histogram(
+    "task_flow_request_duration_seconds",
+    "Time from the first middleware until the response is returned.",
+    DURATION_BUCKETS,
+)
+VIEW_DURATION = Histogram(
+    "task_flow_view_duration_seconds",
+    "Time spent in the view, including queries and rendering.",
+    DURATION_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "task_flow_db_duration_seconds",
+    "Time spent executing database queries.",
+    DURATION_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "task_flow_db_queries",
+    "Database queries per request.",
+    QUERY_BUCKETS,
+)
+TEMPLATE_DURATION = Histogram(
+    "task_flow_template_duration_seconds",
+    "Time spent rendering templates.",
+    DURATION_BUCKETS,
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    VIEW_DURATION,
+    DB_DURATION,
+    DB_QUERIES,
+    TEMPLATE_DURATION,
+)
+
+
+def render():
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
+
+
+def reset():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
@@ -0,0 +1,120 @@
+from django.db import migrations
+
+
+class RunSQLForVendor(migrations.RunSQL):
+    """``RunSQL`` that only runs on the given database vendor.
+
+    Used for schema objects that only exist on one backend, such as
+    PostgreSQL GIN indexes or SQLite FTS5 tables.
+    """
+
+    def __init__(self, vendor, *args, **kwargs):
+        self.vendor = vendor
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, [self.vendor, *args], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def describe(self):
+        return f"Raw SQL operation for {self.vendor}"
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """``AddIndex`` that does not lock the table on PostgreSQL.
+
+    On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY,
+    so writes to the table continue meanwhile; other databases get a
+    plain CREATE INDEX. The migration must set ``atomic = False``.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+    def describe(self):
+        return f"{super().describe()} concurrently"
+
+
+# Keep the SQLite FTS5 index of tasks (migration 0009) in sync. SQLite
+# drops them whenever Django rebuilds tasks_task to alter it.
+SQLITE_TASK_SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert
+    AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete
+    AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(
+            tasks_task_fts, rowid, name, description
+        )
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update
+    AFTER UPDATE OF name, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(
+            tasks_task_fts, rowid, name, description
+        )
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+def keep_task_search_triggers(*operations):
+    """Wrap operations that make SQLite rebuild the tasks_task table.
+
+    The search triggers are created again once the operations ran,
+    forwards or backwards.
+    """
+    return [
+        RunSQLForVendor(
+            "sqlite",
+            sql=migrations.RunSQL.noop,
+            reverse_sql=SQLITE_TASK_SEARCH_TRIGGERS,
+        ),
+        *operations,
+        RunSQLForVendor(
+            "sqlite",
+            sql=SQLITE_TASK_SEARCH_TRIGGERS,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:29
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Counter = apps.get_model("tasks", "Counter")
+    Task = apps.get_model("tasks", "Task")
+    Worker = apps.get_model("tasks", "Worker")
+    tasks = Task.objects.all()
+    Counter.objects.bulk_create([
+        Counter(name="num_tasks", value=tasks.count()),
+        Counter(name="num_workers", value=Worker.objects.count()),
+        Counter(
+            name="num_of_critical_tasks",
+            value=tasks.filter(priority="critical").count(),
+        ),
+        Counter(
+            name="num_tasks_not_completed",
+            value=tasks.filter(is_completed=False).count(),
+        ),
+    ])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0006_alter_task_task_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Counter",
+                "verbose_name_plural": "Counters",
+            },
+        ),
+        migrations.RunPython(
+            populate_counters,
+            migrations.RunPython.noop,
+        ),
+    ]
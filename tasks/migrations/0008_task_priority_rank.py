@@ -0,0 +1,45 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+def populate_priority_rank(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.update(priority_rank=models.Case(
+        models.When(priority="critical", then=models.Value(1)),
+        models.When(priority="urgent", then=models.Value(2)),
+        default=models.Value(3),
+    ))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_counter"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={
+                "ordering": ["priority_rank", "deadline", "id"],
+                "verbose_name": "Task",
+                "verbose_name_plural": "Tasks",
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.PositiveSmallIntegerField(default=3, editable=False),
+        ),
+        migrations.RunPython(
+            populate_priority_rank,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "priority_rank", "deadline", "id"],
+                name="task_list_order_idx",
+            ),
+        ),
+    ]
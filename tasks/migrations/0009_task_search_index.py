@@ -0,0 +1,84 @@
+from django.db import migrations
+
+from tasks.migration_operations import RunSQLForVendor
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_task_priority_rank"),
+    ]
+
+    operations = [
+        RunSQLForVendor(
+            "postgresql",
+            sql=[
+                """
+                ALTER TABLE tasks_task ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(
+                        to_tsvector('english', coalesce(name, '')), 'A'
+                    )
+                    || setweight(
+                        to_tsvector('english', coalesce(description, '')),
+                        'B'
+                    )
+                ) STORED
+                """,
+                """
+                CREATE INDEX task_search_vector_idx
+                ON tasks_task USING gin (search_vector)
+                """,
+            ],
+            reverse_sql=[
+                "DROP INDEX task_search_vector_idx",
+                "ALTER TABLE tasks_task DROP COLUMN search_vector",
+            ],
+        ),
+        RunSQLForVendor(
+            "sqlite",
+            sql=[
+                """
+                CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+                    name,
+                    description,
+                    content='tasks_task',
+                    content_rowid='id'
+                )
+                """,
+                """
+                CREATE TRIGGER tasks_task_fts_insert
+                AFTER INSERT ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_task_fts_delete
+                AFTER DELETE ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(
+                        tasks_task_fts, rowid, name, description
+                    )
+                    VALUES ('delete', old.id, old.name, old.description);
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_task_fts_update
+                AFTER UPDATE OF name, description ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(
+                        tasks_task_fts, rowid, name, description
+                    )
+                    VALUES ('delete', old.id, old.name, old.description);
+                    INSERT INTO tasks_task_fts(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+                """,
+                "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER tasks_task_fts_update",
+                "DROP TRIGGER tasks_task_fts_delete",
+                "DROP TRIGGER tasks_task_fts_insert",
+                "DROP TABLE tasks_task_fts",
+            ],
+        ),
+    ]
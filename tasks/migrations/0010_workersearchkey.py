@@ -0,0 +1,95 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:34
+
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from tasks.migration_operations import RunSQLForVendor
+
+
+# Copied from tasks.search as of this migration, so that replaying it
+# builds the keys it always did.
+def normalize(value):
+    return unicodedata.normalize("NFKC", value or "").casefold().strip()
+
+
+def worker_search_keys(username, first_name, last_name):
+    keys = set()
+    for value in (username, first_name, last_name):
+        value = normalize(value)
+        if value:
+            keys.add(value)
+            keys.update(value.split())
+    return keys
+
+
+def populate_search_keys(apps, schema_editor):
+    Worker = apps.get_model("tasks", "Worker")
+    WorkerSearchKey = apps.get_model("tasks", "WorkerSearchKey")
+    workers = Worker.objects.values_list(
+        "id", "username", "first_name", "last_name"
+    )
+    WorkerSearchKey.objects.bulk_create(
+        [
+            WorkerSearchKey(worker_id=worker_id, key=key)
+            for worker_id, *names in workers.iterator()
+            for key in worker_search_keys(*names)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_task_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkerSearchKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=150)),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_keys",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Worker search key",
+                "verbose_name_plural": "Worker search keys",
+                "indexes": [
+                    models.Index(fields=["key", "worker"], name="worker_search_key_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_search_keys,
+            migrations.RunPython.noop,
+        ),
+        RunSQLForVendor(
+            "postgresql",
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                """
+                CREATE INDEX worker_search_key_trgm_idx
+                ON tasks_workersearchkey USING gin (key gin_trgm_ops)
+                """,
+            ],
+            reverse_sql=["DROP INDEX worker_search_key_trgm_idx"],
+        ),
+    ]
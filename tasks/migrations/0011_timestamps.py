@@ -0,0 +1,85 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from tasks.migration_operations import keep_task_search_triggers
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0010_workersearchkey"),
+    ]
+
+    operations = [
+        *keep_task_search_triggers(
+            migrations.AddField(
+                model_name="task",
+                name="updated_at",
+                field=models.DateTimeField(auto_now=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        # The assignees table already exists; only the state learns
+        # about the through model, the database just gains a column.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="TaskAssignment",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "task",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="assignments",
+                                to="tasks.task",
+                            ),
+                        ),
+                        (
+                            "worker",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="assignments",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "Task assignment",
+                        "verbose_name_plural": "Task assignments",
+                        "db_table": "tasks_task_assignees",
+                        "unique_together": {("task", "worker")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="task",
+                    name="assignees",
+                    field=models.ManyToManyField(
+                        related_name="tasks",
+                        through="tasks.TaskAssignment",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="taskassignment",
+            name="assigned_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
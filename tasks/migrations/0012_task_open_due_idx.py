@@ -0,0 +1,25 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+from tasks.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0011_timestamps"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(is_completed=False),
+                fields=["deadline", "priority_rank", "id"],
+                name="task_open_due_idx",
+            ),
+        ),
+    ]
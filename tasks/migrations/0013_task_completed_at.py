@@ -0,0 +1,38 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:18
+
+from django.db import migrations, models
+from django.db.models import F
+
+from tasks.migration_operations import keep_task_search_triggers
+
+
+def backfill_completed_at(apps, schema_editor):
+    # The best guess for tasks completed before the column existed.
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.using(schema_editor.connection.alias).filter(
+        is_completed=True,
+    ).update(completed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0012_task_open_due_idx"),
+    ]
+
+    operations = [
+        *keep_task_search_triggers(
+            migrations.AddField(
+                model_name="task",
+                name="completed_at",
+                field=models.DateTimeField(
+                    blank=True,
+                    editable=False,
+                    null=True,
+                ),
+            ),
+        ),
+        migrations.RunPython(
+            backfill_completed_at,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from tasks.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0013_task_completed_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True, null=True)),
+                ("deadline", models.DateField()),
+                ("is_completed", models.BooleanField(default=True)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("critical", "Critical"),
+                            ("urgent", "Urgent"),
+                            ("normal", "Normal"),
+                        ],
+                        default="normal",
+                        max_length=10,
+                    ),
+                ),
+                ("priority_rank", models.PositiveSmallIntegerField(default=3)),
+                (
+                    "task_type",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_tasks",
+                        to="tasks.tasktype",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField()),
+                ("completed_at", models.DateTimeField(null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived task",
+                "verbose_name_plural": "Archived tasks",
+                "ordering": ["priority_rank", "deadline", "id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTaskAssignment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("assigned_at", models.DateTimeField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assignments",
+                        to="tasks.archivedtask",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_assignments",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived task assignment",
+                "verbose_name_plural": "Archived task assignments",
+                "unique_together": {("task", "worker")},
+            },
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="assignees",
+            field=models.ManyToManyField(
+                related_name="archived_tasks",
+                through="tasks.ArchivedTaskAssignment",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(is_completed=True),
+                fields=["completed_at"],
+                name="task_completed_at_idx",
+            ),
+        ),
+    ]
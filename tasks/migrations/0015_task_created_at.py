@@ -0,0 +1,50 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:40
+
+from django.db import migrations, models
+from django.db.models import Case, F, When
+import django.utils.timezone
+
+from tasks.migration_operations import keep_task_search_triggers
+
+
+def backfill_created_at(apps, schema_editor):
+    # The best guess for tasks created before the column existed.
+    created_at = Case(
+        When(completed_at__lt=F("updated_at"), then=F("completed_at")),
+        default=F("updated_at"),
+    )
+    for name in ("Task", "ArchivedTask"):
+        model = apps.get_model("tasks", name)
+        model.objects.using(schema_editor.connection.alias).update(
+            created_at=created_at,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0014_archive"),
+    ]
+
+    operations = [
+        *keep_task_search_triggers(
+            migrations.AddField(
+                model_name="task",
+                name="created_at",
+                field=models.DateTimeField(
+                    auto_now_add=True,
+                    default=django.utils.timezone.now,
+                ),
+                preserve_default=False,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            backfill_created_at,
+            migrations.RunPython.noop,
+        ),
+    ]
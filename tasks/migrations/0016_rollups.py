@@ -0,0 +1,87 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+from tasks.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0015_task_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTaskRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("type", "Task type"),
+                            ("position", "Position"),
+                            ("priority", "Priority"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, max_length=255)),
+                ("created", models.PositiveIntegerField(default=0)),
+                ("completed", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Daily task rollup",
+                "verbose_name_plural": "Daily task rollups",
+                "unique_together": {("dimension", "day", "key")},
+            },
+        ),
+        migrations.CreateModel(
+            name="StaleRollupDay",
+            fields=[
+                ("day", models.DateField(primary_key=True, serialize=False)),
+                (
+                    "marked_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Stale rollup day",
+                "verbose_name_plural": "Stale rollup days",
+            },
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["created_at"],
+                name="task_created_at_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["created_at"],
+                name="archived_task_created_at_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["completed_at"],
+                name="archived_task_completed_idx",
+            ),
+        ),
+    ]
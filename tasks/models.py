@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser, Permission
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Position(models.Model):
@@ -21,6 +24,7 @@ class Worker(AbstractUser):
         null=True,
         related_name='workers'
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Worker"
@@ -31,6 +35,28 @@ class Worker(AbstractUser):
         return reverse("tasks:worker-detail", kwargs={"pk": self.pk})
 
 
+class WorkerSearchKey(models.Model):
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="search_keys",
+    )
+    key = models.CharField(max_length=150)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["key", "worker"],
+                name="worker_search_key_idx",
+            ),
+        ]
+        verbose_name = "Worker search key"
+        verbose_name_plural = "Worker search keys"
+
+    def __str__(self):
+        return f"{self.key}"
+
+
 class TaskType(models.Model):
     name = models.CharField(max_length=255)
 
@@ -42,12 +68,50 @@ class TaskType(models.Model):
         return f"{self.name}"
 
 
+class TaskQuerySet(models.QuerySet):
+    def due(self, period, today=None):
+        """Open tasks whose deadline is in period (``Task.DUE_PERIODS``).
+
+        "week" runs from today to Sunday. Each period is a range scan
+        of the ``task_open_due_idx`` partial index.
+        """
+        today = today or timezone.localdate()
+        queryset = self.filter(is_completed=False)
+        if period == "overdue":
+            return queryset.filter(deadline__lt=today)
+        if period == "today":
+            return queryset.filter(deadline=today)
+        if period == "week":
+            sunday = today + timedelta(days=6 - today.weekday())
+            return queryset.filter(deadline__range=(today, sunday))
+        raise ValueError(f"Unknown due period {period!r}")
+
+    def with_assigned_flag(self, user):
+        """Annotate ``assigned_to_me``: whether user is an assignee."""
+        return self.annotate(assigned_to_me=models.Exists(
+            self.model.assignees.through.objects.filter(
+                task_id=models.OuterRef("pk"),
+                worker_id=user.pk,
+            )
+        ))
+
+
 class Task(models.Model):
     PRIORITY_CHOICES = (
         ('critical', 'Critical'),
         ('urgent', 'Urgent'),
         ('normal', 'Normal'),
     )
+    PRIORITY_RANKS = {
+        "critical": 1,
+        "urgent": 2,
+        "normal": 3,
+    }
+    DUE_PERIODS = (
+        ("overdue", "Overdue"),
+        ("today", "Due today"),
+        ("week", "Due this week"),
+    )
 
     name = models.CharField(max_length=255, null=False)
     description = models.TextField(null=True, blank=True)
@@ -58,6 +122,10 @@ class Task(models.Model):
         choices=PRIORITY_CHOICES,
         default="normal",
     )
+    priority_rank = models.PositiveSmallIntegerField(
+        default=3,
+        editable=False,
+    )
     task_type = models.ForeignKey(
         TaskType,
         on_delete=models.SET_NULL,
@@ -66,22 +134,217 @@ class Task(models.Model):
     )
     assignees = models.ManyToManyField(
         Worker,
+        through="TaskAssignment",
         related_name="tasks",
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
-        ordering = [models.Case(
-            models.When(priority='critical', then=models.Value(1)),
-            models.When(priority='urgent', then=models.Value(2)),
-            models.When(priority='normal', then=models.Value(3)),
-            default=models.Value(3),
-            output_field=models.IntegerField(),
-        )]
+        ordering = ["priority_rank", "deadline", "id"]
+        indexes = [
+            models.Index(
+                fields=["is_completed", "priority_rank", "deadline", "id"],
+                name="task_list_order_idx",
+            ),
+            # Overdue and due soon tasks, in deadline order.
+            models.Index(
+                fields=["deadline", "priority_rank", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_open_due_idx",
+            ),
+            # What tasks.archive moves out next.
+            models.Index(
+                fields=["completed_at"],
+                condition=models.Q(is_completed=True),
+                name="task_completed_at_idx",
+            ),
+            # The tasks of a day, for tasks.reports.
+            models.Index(fields=["created_at"], name="task_created_at_idx"),
+        ]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
 
+    @classmethod
+    def rank_for(cls, priority):
+        return cls.PRIORITY_RANKS.get(priority, cls.PRIORITY_RANKS["normal"])
+
+    def save(self, *args, **kwargs):
+        self.priority_rank = self.rank_for(self.priority)
+        if not self.is_completed:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = {*update_fields, "updated_at"}
+            if "priority" in update_fields:
+                update_fields.add("priority_rank")
+            if "is_completed" in update_fields:
+                update_fields.add("completed_at")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse("tasks:task-detail", kwargs={"pk": self.pk})
 
     def __str__(self):
         return f"{self.name}"
+
+
+class TaskAssignment(models.Model):
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    assigned_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # The table Django created for the plain many-to-many field.
+        db_table = "tasks_task_assignees"
+        unique_together = [("task", "worker")]
+        verbose_name = "Task assignment"
+        verbose_name_plural = "Task assignments"
+
+    def __str__(self):
+        return f"{self.worker} on {self.task}"
+
+
+class ArchivedTask(models.Model):
+    """A completed task moved out of ``Task`` by ``tasks.archive``.
+
+    It keeps the id of the task, and its columns are declared in the
+    order of ``Task``'s, so the two tables can be read in one UNION.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=255)
+    description = models.TextField(null=True, blank=True)
+    deadline = models.DateField()
+    is_completed = models.BooleanField(default=True)
+    priority = models.CharField(
+        max_length=10,
+        choices=Task.PRIORITY_CHOICES,
+        default="normal",
+    )
+    priority_rank = models.PositiveSmallIntegerField(default=3)
+    task_type = models.ForeignKey(
+        TaskType,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="archived_tasks",
+    )
+    assignees = models.ManyToManyField(
+        Worker,
+        through="ArchivedTaskAssignment",
+        related_name="archived_tasks",
+    )
+    updated_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["priority_rank", "deadline", "id"]
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                name="archived_task_created_at_idx",
+            ),
+            models.Index(
+                fields=["completed_at"],
+                name="archived_task_completed_idx",
+            ),
+        ]
+        verbose_name = "Archived task"
+        verbose_name_plural = "Archived tasks"
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+class ArchivedTaskAssignment(models.Model):
+    task = models.ForeignKey(
+        ArchivedTask,
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="archived_assignments",
+    )
+    assigned_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = [("task", "worker")]
+        verbose_name = "Archived task assignment"
+        verbose_name_plural = "Archived task assignments"
+
+    def __str__(self):
+        return f"{self.worker} on {self.task}"
+
+
+class DailyTaskRollup(models.Model):
+    """Tasks created and completed on a day, per group of a dimension.
+
+    Maintained by ``tasks.reports``. key is the task type or position
+    id, or the priority, as text; "" stands for none.
+    """
+
+    DIMENSIONS = (
+        ("type", "Task type"),
+        ("position", "Position"),
+        ("priority", "Priority"),
+    )
+
+    day = models.DateField()
+    dimension = models.CharField(max_length=10, choices=DIMENSIONS)
+    key = models.CharField(max_length=255, blank=True)
+    created = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [("dimension", "day", "key")]
+        verbose_name = "Daily task rollup"
+        verbose_name_plural = "Daily task rollups"
+
+    def __str__(self):
+        return f"{self.day} {self.dimension} {self.key}"
+
+
+class StaleRollupDay(models.Model):
+    """A day whose rollups are out of date."""
+
+    day = models.DateField(primary_key=True)
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Stale rollup day"
+        verbose_name_plural = "Stale rollup days"
+
+    def __str__(self):
+        return f"{self.day}"
+
+
+class Counter(models.Model):
+    name = models.CharField(max_length=255, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Counter"
+        verbose_name_plural = "Counters"
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
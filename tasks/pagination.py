@@ -0,0 +1,241 @@
+"""Keyset (cursor) pagination.
+
+Instead of ``OFFSET`` the paginator remembers the ordering values of
+the first and last row of a page and seeks past them, so any page costs
+the same as the first one when an index matches the ordering. Cursors
+are opaque url-safe tokens; the ordering has to be made of non-null
+columns and end with a unique one (``id`` is appended otherwise).
+
+A UNION of querysets cannot be filtered, so its parts are seeked one
+by one; the ordering then has to name columns all parts have.
+"""
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def union_parts(queryset):
+    """Return the querysets queryset combines, or just queryset."""
+    query = queryset.query
+    if not query.combinator:
+        return [queryset]
+    return [
+        QuerySet(model=part.model, query=part.clone(), using=queryset.db)
+        for part in query.combined_queries
+    ]
+
+
+def filter_union(queryset, condition):
+    """``queryset.filter(condition)`` that also works on a UNION."""
+    query = queryset.query
+    if not query.combinator:
+        return queryset.filter(condition)
+    first, *others = [
+        part.filter(condition) for part in union_parts(queryset)
+    ]
+    return first.union(*others, all=query.combinator_all)
+
+
+class CursorPage:
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page, ordering=None):
+        ordering = list(
+            ordering
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering.append("id")
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = ordering
+
+    def encode_cursor(self, direction, obj):
+        keys = [
+            getattr(obj, field.lstrip("-"))
+            for field in self.ordering
+        ]
+        payload = json.dumps([direction, keys], cls=DjangoJSONEncoder)
+        token = base64.urlsafe_b64encode(payload.encode())
+        return token.decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = base64.urlsafe_b64decode(padded.encode())
+            direction, keys = json.loads(payload)
+        except (TypeError, ValueError):
+            raise InvalidCursor("That cursor is not valid")
+        if (
+            direction not in ("next", "previous")
+            or not isinstance(keys, list)
+            or len(keys) != len(self.ordering)
+        ):
+            raise InvalidCursor("That cursor is not valid")
+        try:
+            keys = [
+                self.to_python(field.lstrip("-"), value)
+                for field, value in zip(self.ordering, keys)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor("That cursor is not valid")
+        return direction, keys
+
+    def to_python(self, name, value):
+        """Return a key of a cursor as the type of its ordering column.
+
+        Cursors come from the client, so a key of the wrong type must
+        fail here rather than in the query.
+        """
+        if value is None:
+            raise ValueError("Ordering columns are not null")
+        opts = self.queryset.model._meta
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            # An annotation: the database compares it as it is.
+            if not isinstance(value, (str, int, float, bool)):
+                raise TypeError(f"Unexpected key {value!r}")
+            return value
+        return field.to_python(value)
+
+    def seek(self, keys, forward=True):
+        """Return a filter for the rows strictly after (or before) keys."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, keys):
+            name = field.lstrip("-")
+            lookup = "gt" if field.startswith("-") != forward else "lt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        # The redundant inclusive bound on the leading column lets the
+        # database start an index range scan instead of testing the OR
+        # chain against every row.
+        first = self.ordering[0]
+        lookup = "gte" if first.startswith("-") != forward else "lte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": keys[0]}) & condition
+
+    def reversed_ordering(self):
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    def page(self, cursor=None):
+        queryset, build = self._plan(cursor)
+        return build(list(queryset))
+
+    async def apage(self, cursor=None):
+        queryset, build = self._plan(cursor)
+        return build([row async for row in queryset])
+
+    def _plan(self, cursor):
+        """Return the query of a page and the function building the page.
+
+        The query fetches one row more than a page to tell whether
+        there is another page in its direction.
+        """
+        size = self.per_page
+        if not cursor:
+            return (
+                self.queryset.order_by(*self.ordering)[:size + 1],
+                lambda rows: self._build_page(
+                    rows[:size],
+                    has_next=len(rows) > size,
+                    has_previous=False,
+                ),
+            )
+
+        direction, keys = self.decode_cursor(cursor)
+        forward = direction == "next"
+        queryset = filter_union(self.queryset, self.seek(keys, forward))
+        if forward:
+            return (
+                queryset.order_by(*self.ordering)[:size + 1],
+                lambda rows: self._build_page(
+                    rows[:size],
+                    has_next=len(rows) > size,
+                    has_previous=True,
+                ),
+            )
+        return (
+            queryset.order_by(*self.reversed_ordering())[:size + 1],
+            lambda rows: self._build_page(
+                rows[:size][::-1],
+                has_next=True,
+                has_previous=len(rows) > size,
+            ),
+        )
+
+    def _build_page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor("next", rows[-1])
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor("previous", rows[0])
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """Replace OFFSET paging of a ``ListView`` with cursor paging."""
+
+    cursor_kwarg = "cursor"
+    cursor_ordering = None
+
+    def get_cursor_ordering(self, queryset):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_cursor_ordering(queryset),
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,161 @@
+"""Per-request timings reported as ``Server-Timing`` and metrics.
+
+``ProfilingMiddleware`` measures, for every request:
+
+* ``total``: from this middleware (first in ``MIDDLEWARE``) until the
+  response is returned,
+* ``view``: from the view being called until then, so ``total - view``
+  is the time spent in middleware,
+* ``db``: query count and time, through an execute wrapper,
+* ``tpl``: template rendering, through ``ProfiledDjangoTemplates``,
+  the template backend in settings.
+
+The numbers go into a ``Server-Timing`` header (shown by the browser's
+developer tools) and into the per-view histograms of ``tasks.metrics``.
+Measuring costs a few clock reads per query and template, so it stays
+on in production. Streamed responses are measured until their first
+byte; queries made while they stream are not counted.
+"""
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+from tasks import metrics
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = (
+        "start",
+        "view_start",
+        "queries",
+        "db",
+        "template",
+        "template_depth",
+    )
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += time.perf_counter() - start
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Templates rendered by templates (crispy forms) are counted
+        # once, in the outermost render.
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if not timings.template_depth:
+                timings.template += time.perf_counter() - start
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return ProfiledTemplate(template.template, self)
+
+
+def _start_view():
+    timings = _current.get()
+    if timings is not None:
+        timings.view_start = time.perf_counter()
+
+
+def _milliseconds(seconds):
+    return f"{seconds * 1000:.1f}"
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # A sync process_view would cost a thread switch per request.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with self.wrap_queries(timings):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with self.wrap_queries(timings):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _start_view()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _start_view()
+
+    def wrap_queries(self, timings):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+        return stack
+
+    def finish(self, request, response, timings):
+        end = time.perf_counter()
+        total = end - timings.start
+        view = end - timings.view_start if timings.view_start else 0.0
+        match = request.resolver_match
+        view_name = match.view_name if match else "unmatched"
+
+        metrics.REQUEST_DURATION.observe(view_name, total)
+        metrics.VIEW_DURATION.observe(view_name, view)
+        metrics.DB_DURATION.observe(view_name, timings.db)
+        metrics.DB_QUERIES.observe(view_name, timings.queries)
+        metrics.TEMPLATE_DURATION.observe(view_name, timings.template)
+
+        response.headers["Server-Timing"] = ", ".join((
+            f'db;dur={_milliseconds(timings.db)};'
+            f'desc="{timings.queries} queries"',
+            f"tpl;dur={_milliseconds(timings.template)}",
+            f"view;dur={_milliseconds(view)}",
+            f"mw;dur={_milliseconds(total - view)}",
+            f"total;dur={_milliseconds(total)}",
+        ))
+        return response
@@ -0,0 +1,266 @@
+"""Daily rollups of task activity, for the reports.
+
+``DailyTaskRollup`` counts, per day and per task type, assignee
+position or priority, the tasks created that day and the tasks that
+were completed that day (and still are). Archived tasks count too.
+The report pages only read these rows, however long the history.
+
+A day's rollups are always computed from scratch by ``rebuild``: a
+few grouped queries over the tasks created or completed on it, which
+the ``created_at`` and ``completed_at`` indexes find. Changes to tasks
+do not edit the counts; the signal handlers and bulk operations only
+``touch`` the days a change affects (one upsert per change, or per
+``batch()``), marking them stale, and have them refreshed once the
+change commits. A refresh that fails leaves its markers behind for the
+next one, or for ``manage.py rebuild_rollups``, which can also rebuild
+any range of days.
+
+A refresh locks the stale markers it works from. A concurrent change
+upserts its marker again once the refresh commits, so no change is
+lost between computing a day and clearing its marker.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta
+
+from django.db import router, transaction
+from django.db.models import CharField, Count, Q, Sum, Value
+from django.db.models.functions import Cast, Trunc, TruncDate
+from django.utils import timezone
+
+from tasks.models import (
+    ArchivedTask,
+    DailyTaskRollup,
+    Position,
+    StaleRollupDay,
+    Task,
+    TaskType,
+)
+
+# The group of a task in each dimension.
+DIMENSIONS = {
+    "type": "task_type_id",
+    "position": "assignees__position_id",
+    "priority": "priority",
+}
+# When a task counts towards each measure.
+MEASURES = {
+    "created": "created_at",
+    "completed": "completed_at",
+}
+PERIODS = (
+    ("day", "Day"),
+    ("week", "Week"),
+    ("month", "Month"),
+)
+
+# Days rebuilt by one rebuild(), which keeps its filter small.
+CHUNK_DAYS = 31
+
+_pending = ContextVar("pending_rollup_days", default=None)
+
+
+def local_day(value):
+    return value and timezone.localdate(value)
+
+
+def start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def day_spans(days):
+    """Merge days into (first, last) spans of consecutive days."""
+    spans = []
+    for day in sorted(days):
+        if spans and spans[-1][1] + timedelta(days=1) == day:
+            spans[-1][1] = day
+        else:
+            spans.append([day, day])
+    return spans
+
+
+def on_days(field, days):
+    condition = Q()
+    for first, last in day_spans(days):
+        condition |= Q(**{
+            f"{field}__gte": start_of(first),
+            f"{field}__lt": start_of(last + timedelta(days=1)),
+        })
+    return condition
+
+
+def touch(days):
+    """Mark days (dates or None) stale."""
+    days = {day for day in days if day}
+    pending = _pending.get()
+    if pending is not None:
+        pending.update(days)
+        return
+    if not days:
+        return
+    now = timezone.now()
+    StaleRollupDay.objects.bulk_create(
+        [StaleRollupDay(day=day, marked_at=now) for day in days],
+        update_conflicts=True,
+        unique_fields=["day"],
+        update_fields=["marked_at"],
+    )
+    # Once per change or batch. After the first refresh of a request,
+    # the others find nothing stale.
+    transaction.on_commit(
+        refresh,
+        using=router.db_for_write(StaleRollupDay),
+        robust=True,
+    )
+
+
+def task_days(queryset, fields=tuple(MEASURES.values())):
+    """Return the days the tasks of queryset were created or completed."""
+    rows = queryset.values_list(
+        *(TruncDate(field) for field in fields)
+    ).distinct().order_by()
+    return {day for row in rows for day in row if day}
+
+
+def touch_tasks(queryset):
+    touch(task_days(queryset))
+
+
+@contextmanager
+def batch():
+    """Collect the days touched inside the block and mark them at once.
+
+    Bulk operations fire one signal per row; batching turns those into
+    a single upsert.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    days = set()
+    token = _pending.set(days)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    touch(days)
+
+
+def compute(days, using=None):
+    """Return the rollups of days as unsaved ``DailyTaskRollup``.
+
+    One query: a UNION ALL of the grouped counts of each model, measure
+    and dimension.
+    """
+    parts = []
+    for model in (Task, ArchivedTask):
+        for measure, field in MEASURES.items():
+            tasks = model.objects.using(using).filter(on_days(field, days))
+            for dimension, group in DIMENSIONS.items():
+                parts.append(
+                    tasks.values(
+                        day=TruncDate(field),
+                        key=Cast(group, CharField()),
+                    )
+                    .annotate(
+                        dimension=Value(dimension, CharField()),
+                        measure=Value(measure, CharField()),
+                        # A task with two assignees of a position counts
+                        # once.
+                        tasks=Count("id", distinct=True),
+                    )
+                    .values_list("day", "key", "dimension", "measure", "tasks")
+                    .order_by()
+                )
+    first, *others = parts
+    counts = defaultdict(lambda: {"created": 0, "completed": 0})
+    for day, key, dimension, measure, number in first.union(
+        *others, all=True
+    ):
+        counts[day, dimension, key or ""][measure] += number
+    return [
+        DailyTaskRollup(day=day, dimension=dimension, key=key, **measures)
+        for (day, dimension, key), measures in counts.items()
+    ]
+
+
+def rebuild(days):
+    """Recompute the rollups of days; return how many rows were written."""
+    days = set(days)
+    if not days:
+        return 0
+    using = router.db_for_write(DailyTaskRollup)
+    with transaction.atomic(using=using):
+        rollups = compute(days, using)
+        DailyTaskRollup.objects.using(using).filter(day__in=days).delete()
+        DailyTaskRollup.objects.using(using).bulk_create(rollups)
+        StaleRollupDay.objects.using(using).filter(day__in=days).delete()
+    return len(rollups)
+
+
+def refresh():
+    """Rebuild the stale days; return how many there were."""
+    using = router.db_for_write(StaleRollupDay)
+    # Checked first, so that finding nothing stale does not lock.
+    if not StaleRollupDay.objects.using(using).exists():
+        return 0
+    with transaction.atomic(using=using):
+        days = sorted(
+            StaleRollupDay.objects.using(using)
+            .select_for_update()
+            .values_list("day", flat=True)
+        )
+        for start in range(0, len(days), CHUNK_DAYS):
+            rebuild(days[start:start + CHUNK_DAYS])
+    return len(days)
+
+
+def group_labels(dimension):
+    if dimension == "type":
+        labels = {
+            str(pk): name
+            for pk, name in TaskType.objects.values_list("pk", "name")
+        }
+        labels[""] = "No type"
+    elif dimension == "position":
+        labels = {
+            str(pk): name
+            for pk, name in Position.objects.values_list("pk", "name")
+        }
+        labels[""] = "Unassigned"
+    else:
+        labels = dict(Task.PRIORITY_CHOICES)
+    return labels
+
+
+def report(dimension, period, start, end):
+    """Return the periods of start..end and each group's counts in them.
+
+    The result is ``(periods, groups)``: the start dates of the periods
+    with any tasks, and ``(label, cells, total)`` for every group, with
+    a ``(created, completed)`` cell per period and the sums of those.
+    """
+    rows = (
+        DailyTaskRollup.objects.filter(
+            dimension=dimension,
+            day__range=(start, end),
+        )
+        .values("key", period_start=Trunc("day", period))
+        .annotate(created=Sum("created"), completed=Sum("completed"))
+        .values_list("period_start", "key", "created", "completed")
+        .order_by("period_start", "key")
+    )
+    periods = []
+    counts = defaultdict(dict)
+    for period_start, key, created, completed in rows:
+        if period_start not in periods:
+            periods.append(period_start)
+        counts[key][period_start] = (created, completed)
+    labels = group_labels(dimension)
+    groups = []
+    for key, by_period in counts.items():
+        cells = [by_period.get(period, (0, 0)) for period in periods]
+        total = tuple(map(sum, zip(*cells)))
+        groups.append((labels.get(key, key), cells, total))
+    groups.sort(key=lambda group: group[0])
+    return periods, groups
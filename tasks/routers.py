@@ -0,0 +1,110 @@
+"""Read replicas.
+
+``ReplicaRouter`` sends the reads of safe (GET and HEAD) requests to
+one of ``settings.DATABASE_REPLICAS``, picked at random, and
+everything else to the primary (``default``): writes, reads of other
+requests, and reads outside requests, such as management commands.
+``ReplicaMiddleware`` tells it which requests are safe.
+
+Replicas lag behind the primary, so users must not read from them
+right after writing. Once a request writes, the rest of it reads from
+the primary, and the response sets a cookie that keeps the browser on
+the primary for ``settings.REPLICA_PIN_SECONDS``.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "pin_primary"
+SAFE_METHODS = {"GET", "HEAD"}
+
+
+class RoutingState:
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.wrote = False
+
+
+# Set per request by ReplicaMiddleware. A mutable object, so a write
+# in a view run in a worker thread (sync_to_async copies the context)
+# is seen by the middleware.
+_state = ContextVar("replica_routing", default=None)
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        aliases = replicas()
+        if state is None or not state.use_replicas or not aliases:
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.use_replicas = False
+            state.wrote = True
+        # Explicitly, or Django would save an object read from a
+        # replica back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every database holds the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in replicas()
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.start(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(response, state)
+
+    def start(self, request):
+        return RoutingState(
+            request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        )
+
+    def finish(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
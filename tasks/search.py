@@ -0,0 +1,123 @@
+"""Indexed search for tasks and workers.
+
+Tasks use full-text search over their names and descriptions.
+PostgreSQL keeps a generated ``search_vector`` tsvector column with a
+GIN index, SQLite an FTS5 table maintained by triggers (see migration
+0009). Both are updated by the database itself on every write, so bulk
+inserts and ``QuerySet.update()`` stay searchable too. Every word of
+the query has to match, as a prefix, in the name or the description.
+
+Workers are found through ``WorkerSearchKey`` rows holding the
+normalized username, first name and last name (and their words).
+PostgreSQL matches substrings through a pg_trgm index, other databases
+match prefixes with a range scan over the plain b-tree index.
+"""
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from tasks.models import Task, WorkerSearchKey
+
+TASK_SEARCH_TABLE = "tasks_task_fts"
+SEARCH_CONFIG = "english"
+# Sorts after every valid character, closing the prefix range.
+PREFIX_RANGE_END = "\U0010ffff"
+
+
+def search_terms(query):
+    return re.findall(r"[^\W_]+", (query or "").lower())
+
+
+def search_tasks(queryset, query):
+    """Filter tasks matching query, annotated with ``search_rank``.
+
+    A higher ``search_rank`` means a better match; an empty query
+    leaves the queryset untouched. Archived tasks are not indexed and
+    always rank 0.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    if queryset.model is not Task:
+        return _search_fallback(queryset, terms)
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, terms)
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, terms)
+    return _search_fallback(queryset, terms)
+
+
+def _search_postgresql(queryset, terms):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    table = queryset.model._meta.db_table
+    return queryset.filter(RawSQL(
+        f"{table}.search_vector @@ to_tsquery(%s, %s)",
+        [SEARCH_CONFIG, tsquery],
+        output_field=BooleanField(),
+    )).annotate(search_rank=RawSQL(
+        f"ts_rank({table}.search_vector, to_tsquery(%s, %s))",
+        [SEARCH_CONFIG, tsquery],
+        output_field=FloatField(),
+    ))
+
+
+def _search_sqlite(queryset, terms):
+    match = " ".join(f'"{term}"*' for term in terms)
+    table = queryset.model._meta.db_table
+    # bm25() is lower for better matches; name hits weigh double.
+    return queryset.filter(id__in=RawSQL(
+        f"SELECT rowid FROM {TASK_SEARCH_TABLE} "
+        f"WHERE {TASK_SEARCH_TABLE} MATCH %s",
+        [match],
+    )).annotate(search_rank=RawSQL(
+        f"SELECT -bm25({TASK_SEARCH_TABLE}, 2.0, 1.0) "
+        f"FROM {TASK_SEARCH_TABLE} "
+        f"WHERE {TASK_SEARCH_TABLE} MATCH %s "
+        f"AND {TASK_SEARCH_TABLE}.rowid = {table}.id",
+        [match],
+        output_field=FloatField(),
+    ))
+
+
+def _search_fallback(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset.annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def normalize(value):
+    return unicodedata.normalize("NFKC", value or "").casefold().strip()
+
+
+def worker_search_keys(username, first_name, last_name):
+    keys = set()
+    for value in (username, first_name, last_name):
+        value = normalize(value)
+        if value:
+            keys.add(value)
+            keys.update(value.split())
+    return keys
+
+
+def search_workers(queryset, query):
+    """Filter workers by username, first name or last name."""
+    query = normalize(query)
+    if not query:
+        return queryset
+    keys = WorkerSearchKey.objects.using(queryset.db)
+    if connections[queryset.db].vendor == "postgresql":
+        keys = keys.filter(key__contains=query)
+    else:
+        keys = keys.filter(
+            key__gte=query,
+            key__lt=query + PREFIX_RANGE_END,
+        )
+    return queryset.filter(id__in=keys.values("worker_id"))
@@ -0,0 +1,247 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from tasks import fragments, reports, statistics
+from tasks.models import (
+    ArchivedTask,
+    Position,
+    Task,
+    TaskType,
+    Worker,
+    WorkerSearchKey,
+)
+from tasks.search import worker_search_keys
+
+WORKER_SEARCH_FIELDS = {"username", "first_name", "last_name"}
+
+# Sent with ``added`` and ``removed`` lists of (task_id, worker_id) pairs
+# whenever task assignments change, whether through tasks.assignments
+# or through the related managers of ``Task.assignees``.
+assignments_changed = Signal()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    previous = None
+    if not instance._state.adding:
+        previous = Task.objects.filter(pk=instance.pk).values(
+            "priority", "is_completed", "created_at", "completed_at"
+        ).first()
+    instance._previous_counts = {}
+    instance._previous_days = set()
+    if previous:
+        instance._previous_days = {
+            reports.local_day(previous.pop("created_at")),
+            reports.local_day(previous.pop("completed_at")),
+        }
+        instance._previous_counts = statistics.task_counts(**previous)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_counts", {})
+    current = statistics.task_counts(
+        instance.priority,
+        instance.is_completed,
+    )
+    statistics.adjust({
+        name: value - previous.get(name, 0)
+        for name, value in current.items()
+    })
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    current = statistics.task_counts(
+        instance.priority,
+        instance.is_completed,
+    )
+    statistics.adjust({
+        name: -value for name, value in current.items()
+    })
+
+
+@receiver(post_save, sender=Worker)
+def count_saved_worker(sender, instance, created, **kwargs):
+    if created:
+        statistics.adjust({statistics.NUM_WORKERS: 1})
+
+
+@receiver(post_delete, sender=Worker)
+def count_deleted_worker(sender, instance, **kwargs):
+    statistics.adjust({statistics.NUM_WORKERS: -1})
+
+
+@receiver(post_save, sender=Worker)
+def index_saved_worker(sender, instance, created, update_fields, **kwargs):
+    if update_fields is not None and not (
+        WORKER_SEARCH_FIELDS & set(update_fields)
+    ):
+        return
+    keys = worker_search_keys(
+        instance.username,
+        instance.first_name,
+        instance.last_name,
+    )
+    if not created:
+        stored = set(
+            WorkerSearchKey.objects.filter(
+                worker=instance
+            ).values_list("key", flat=True)
+        )
+        if stored == keys:
+            return
+        WorkerSearchKey.objects.filter(worker=instance).delete()
+    WorkerSearchKey.objects.bulk_create([
+        WorkerSearchKey(worker=instance, key=key) for key in keys
+    ])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def announce_assignment_change(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    if action == "pre_clear":
+        related = instance.tasks if reverse else instance.assignees
+        instance._cleared_pks = set(related.values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_pks", set())
+    elif action not in ("post_add", "post_remove"):
+        return
+    pairs = [
+        (pk, instance.pk) if reverse else (instance.pk, pk)
+        for pk in pk_set
+    ]
+    if not pairs:
+        return
+    added = pairs if action == "post_add" else []
+    assignments_changed.send(
+        sender=sender,
+        added=added,
+        removed=[] if added else pairs,
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_fragments(sender, instance, **kwargs):
+    fragments.bump(Task, [instance.pk])
+
+
+@receiver(post_save, sender=Worker)
+def invalidate_saved_worker_fragments(sender, instance, created,
+                                      update_fields, **kwargs):
+    # Fragments show the same fields the search keys are built from.
+    if update_fields is not None and not (
+        WORKER_SEARCH_FIELDS & set(update_fields)
+    ):
+        return
+    fragments.bump(Worker, [instance.pk])
+    if not created:
+        # Task fragments list their assignees by name.
+        fragments.bump(Task, instance.tasks.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Worker)
+def invalidate_deleted_worker_fragments(sender, instance, **kwargs):
+    fragments.bump(Worker, [instance.pk])
+    fragments.bump(Task, instance.tasks.values_list("pk", flat=True))
+
+
+@receiver(assignments_changed)
+def invalidate_assignment_fragments(sender, added, removed, **kwargs):
+    fragments.bump(Task, [task_id for task_id, _ in added + removed])
+
+
+@receiver(assignments_changed)
+def touch_assigned_tasks(sender, added, removed, **kwargs):
+    Task.objects.filter(
+        pk__in={task_id for task_id, _ in added + removed}
+    ).update(updated_at=timezone.now())
+
+
+def saved_task_days(task):
+    return {
+        reports.local_day(task.created_at),
+        reports.local_day(task.completed_at),
+    }
+
+
+def related_task_days(tasks, archived_tasks):
+    return reports.task_days(tasks) | reports.task_days(archived_tasks)
+
+
+@receiver(post_save, sender=Task)
+def touch_saved_task_days(sender, instance, **kwargs):
+    days = getattr(instance, "_previous_days", set())
+    reports.touch(days | saved_task_days(instance))
+
+
+@receiver(post_delete, sender=Task)
+def touch_deleted_task_days(sender, instance, **kwargs):
+    reports.touch(saved_task_days(instance))
+
+
+@receiver(assignments_changed)
+def touch_assignment_days(sender, added, removed, **kwargs):
+    # Assignees decide the position a task is counted under.
+    reports.touch_tasks(Task.objects.filter(
+        pk__in={task_id for task_id, _ in added + removed}
+    ))
+
+
+@receiver(pre_save, sender=Worker)
+def remember_worker_position(sender, instance, update_fields, **kwargs):
+    instance._previous_position_id = None
+    if not instance._state.adding and (
+        update_fields is None or "position" in update_fields
+    ):
+        instance._previous_position_id = Worker.objects.filter(
+            pk=instance.pk
+        ).values_list("position_id", flat=True).first()
+
+
+@receiver(post_save, sender=Worker)
+def touch_worker_position_days(sender, instance, created, update_fields,
+                               **kwargs):
+    if created or (
+        update_fields is not None and "position" not in update_fields
+    ):
+        return
+    if instance._previous_position_id == instance.position_id:
+        return
+    reports.touch(related_task_days(
+        instance.tasks.all(),
+        instance.archived_tasks.all(),
+    ))
+
+
+@receiver(pre_delete, sender=Worker)
+def touch_deleted_worker_days(sender, instance, **kwargs):
+    reports.touch(related_task_days(
+        instance.tasks.all(),
+        instance.archived_tasks.all(),
+    ))
+
+
+@receiver(pre_delete, sender=TaskType)
+def touch_deleted_task_type_days(sender, instance, **kwargs):
+    reports.touch(related_task_days(
+        instance.tasks.all(),
+        instance.archived_tasks.all(),
+    ))
+
+
+@receiver(pre_delete, sender=Position)
+def touch_deleted_position_days(sender, instance, **kwargs):
+    reports.touch(related_task_days(
+        Task.objects.filter(assignees__position=instance),
+        ArchivedTask.objects.filter(assignees__position=instance),
+    ))
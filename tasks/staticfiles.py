@@ -0,0 +1,124 @@
+"""Static asset bundles built by ``collectstatic``.
+
+``settings.STATIC_BUNDLES`` maps a bundle name to the static files it
+concatenates, in order. ``BundledStaticFilesStorage`` writes each
+bundle (minifying CSS that is not minified yet) before WhiteNoise's
+``CompressedManifestStaticFilesStorage`` gives every file a
+content-hash name and precompressed gzip and Brotli variants. WhiteNoise
+serves hashed names with a far-future, immutable ``Cache-Control``.
+
+Templates include bundles with ``{% bundle %}`` from the ``bundles``
+tag library. With any other storage (the default while DEBUG is on) it
+includes the source files one by one instead.
+
+``StaticFilesMiddleware`` serves them under WSGI and ASGI alike.
+"""
+import re
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+SOURCE_MAP_RE = re.compile(
+    r"/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*"
+)
+CSS_COMMENT_RE = re.compile(r"/\*(?!!).*?\*/", re.DOTALL)
+CSS_SPACE_RE = re.compile(r"\s+")
+CSS_PUNCTUATION_RE = re.compile(r"\s*([{};:,>])\s*")
+
+
+def minify_css(css):
+    """Drop comments (but not /*! licenses */) and needless whitespace.
+
+    Meant for our own stylesheets: whitespace inside strings is
+    collapsed too.
+    """
+    css = CSS_COMMENT_RE.sub("", css)
+    css = CSS_SPACE_RE.sub(" ", css)
+    css = CSS_PUNCTUATION_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def build_bundle(name, sources):
+    """Return the content of bundle name from {path: text} sources."""
+    parts = []
+    for path, text in sources.items():
+        text = SOURCE_MAP_RE.sub("", text)
+        if name.endswith(".css") and ".min." not in path:
+            text = minify_css(text)
+        parts.append(text.strip())
+    # Statements of one script must not run into the next.
+    separator = "\n" if name.endswith(".css") else ";\n"
+    return separator.join(parts) + "\n"
+
+
+class BundledStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    @property
+    def bundles(self):
+        return settings.STATIC_BUNDLES
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name, sources in self.bundles.items():
+                self.save_bundle(name, sources)
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def save_bundle(self, name, sources):
+        texts = {}
+        for path in sources:
+            with self.open(path) as source:
+                texts[path] = source.read().decode()
+        if self.exists(name):
+            self.delete(name)
+        self.save(name, ContentFile(build_bundle(name, texts).encode()))
+
+
+async def read_in_thread(chunks):
+    """Yield a file response's chunks, read off the event loop."""
+    for chunk in await sync_to_async(list, thread_sensitive=False)(chunks):
+        yield chunk
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` that also runs in an async chain.
+
+    WhiteNoise's own middleware is sync only, which under ASGI would
+    send every request through a thread. Here only the requests for a
+    static file leave the event loop, to open and read it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(
+                request.path_info
+            )
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        response = await sync_to_async(self.serve, thread_sensitive=False)(
+            static_file, request
+        )
+        response.streaming_content = read_in_thread(
+            response.streaming_content
+        )
+        return response
@@ -0,0 +1,115 @@
+"""Denormalized record counts shown on the dashboard.
+
+The counts live in the ``Counter`` table and are kept current by the
+signal handlers in ``tasks.signals``, so reading them is a single
+primary key lookup no matter how many tasks and workers exist.
+``rebuild()`` recomputes them from scratch.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from tasks.models import Counter, Task, Worker
+
+NUM_TASKS = "num_tasks"
+NUM_WORKERS = "num_workers"
+NUM_CRITICAL_TASKS = "num_of_critical_tasks"
+NUM_TASKS_NOT_COMPLETED = "num_tasks_not_completed"
+
+DASHBOARD_COUNTERS = (
+    NUM_TASKS,
+    NUM_WORKERS,
+    NUM_CRITICAL_TASKS,
+    NUM_TASKS_NOT_COMPLETED,
+)
+
+_pending = ContextVar("pending_counter_deltas", default=None)
+
+
+def get_counters(names=DASHBOARD_COUNTERS):
+    counters = dict.fromkeys(names, 0)
+    counters.update(
+        Counter.objects.filter(name__in=names).values_list("name", "value")
+    )
+    return counters
+
+
+async def aget_counters(names=DASHBOARD_COUNTERS):
+    counters = dict.fromkeys(names, 0)
+    async for name, value in Counter.objects.filter(
+        name__in=names
+    ).values_list("name", "value"):
+        counters[name] = value
+    return counters
+
+
+def task_counts(priority, is_completed):
+    """Return what a single task in the given state contributes."""
+    return {
+        NUM_TASKS: 1,
+        NUM_CRITICAL_TASKS: int(priority == "critical"),
+        NUM_TASKS_NOT_COMPLETED: int(not is_completed),
+    }
+
+
+@contextmanager
+def batch():
+    """Collect every adjustment made inside the block and apply the sum.
+
+    Bulk operations fire one signal per row; batching turns those into
+    a single UPDATE per counter.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    deltas = defaultdict(int)
+    token = _pending.set(deltas)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    adjust(deltas)
+
+
+def adjust(deltas):
+    pending = _pending.get()
+    if pending is not None:
+        for name, delta in deltas.items():
+            pending[name] += delta
+        return
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic(savepoint=False):
+        for name, delta in deltas.items():
+            updated = Counter.objects.filter(name=name).update(
+                value=F("value") + delta
+            )
+            if not updated:
+                rebuild()
+                return
+
+
+def rebuild():
+    totals = Task.objects.aggregate(
+        **{
+            NUM_TASKS: Count("id"),
+            NUM_CRITICAL_TASKS: Count(
+                "id", filter=Q(priority="critical")
+            ),
+            NUM_TASKS_NOT_COMPLETED: Count(
+                "id", filter=Q(is_completed=False)
+            ),
+        }
+    )
+    totals[NUM_WORKERS] = Worker.objects.count()
+    with transaction.atomic():
+        for name, value in totals.items():
+            Counter.objects.update_or_create(
+                name=name,
+                defaults={"value": value},
+            )
+    return totals
@@ -0,0 +1,28 @@
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _tag(url):
+    if url.endswith(".css"):
+        return format_html('<link rel="stylesheet" href="{}">', url)
+    return format_html('<script src="{}" defer></script>', url)
+
+
+@register.simple_tag
+def bundle(name):
+    """Include a bundle of settings.STATIC_BUNDLES.
+
+    Storages that do not build bundles get the source files one by one.
+    """
+    if getattr(staticfiles_storage, "bundles", None):
+        paths = [name]
+    else:
+        paths = settings.STATIC_BUNDLES[name]
+    return format_html_join(
+        "\n", "{}", ((_tag(static(path)),) for path in paths)
+    )
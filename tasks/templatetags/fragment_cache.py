@@ -0,0 +1,52 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from tasks import fragments
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, obj):
+        self.nodelist = nodelist
+        self.name = name
+        self.obj = obj
+
+    def render(self, context):
+        obj = self.obj.resolve(context)
+        key = fragments.fragment_key(
+            self.name.resolve(context),
+            obj,
+            fragments.get_version(obj),
+        )
+        content = fragments.get_fragment(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            fragments.set_fragment(key, content)
+        return mark_safe(content)
+
+
+@register.tag
+def cachefragment(parser, token):
+    """Cache the enclosed template for one task or worker.
+
+    Usage::
+
+        {% cachefragment "task-row" task %} ... {% endcachefragment %}
+
+    The fragment is rendered again once the object's version stamp is
+    bumped. Keep anything that depends on the current user (buttons,
+    CSRF tokens) outside of the block.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name and an object"
+        )
+    nodelist = parser.parse(("endcachefragment",))
+    parser.delete_first_token()
+    return CacheFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+    )
@@ -7,8 +7,22 @@ register = template.Library()
 def query_transform(request, **kwargs):
     updated = request.GET.copy()
     for key, value in kwargs.items():
-        if key is not None:
+        if value is not None:
             updated[key] = value
         else:
             updated.pop(key, 0)
     return updated.urlencode()
+
+
+@register.simple_tag
+def page_query(request, page_obj, direction):
+    """Build the query string of the next or previous page.
+
+    Works for both numbered pages and cursor pages, keeping the rest
+    of the current query (search filters) intact.
+    """
+    cursor = getattr(page_obj, f"{direction}_cursor", None)
+    if cursor is not None:
+        return query_transform(request, cursor=cursor, page=None)
+    page_number = getattr(page_obj, f"{direction}_page_number")()
+    return query_transform(request, page=page_number, cursor=None)
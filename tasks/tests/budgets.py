@@ -0,0 +1,50 @@
+"""Query budgets for tests.
+
+``query_budget(n)`` works as a context manager and as a decorator and
+fails when the wrapped code runs more than n queries, listing them::
+
+    with query_budget(4):
+        client.get(url)
+
+Unlike ``assertNumQueries`` it is an upper bound, so a view can get
+cheaper without touching its test.
+"""
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget(ContextDecorator):
+    def __init__(self, budget, using=DEFAULT_DB_ALIAS, label=""):
+        self.budget = budget
+        self.using = using
+        self.label = label
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return False
+        executed = len(self.context)
+        if executed > self.budget:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(
+                    self.context.captured_queries, start=1
+                )
+            )
+            label = f"{self.label}: " if self.label else ""
+            raise QueryBudgetExceeded(
+                f"{label}{executed} queries executed, the budget is "
+                f"{self.budget}\n{queries}"
+            )
+        return False
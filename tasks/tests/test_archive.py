@@ -0,0 +1,129 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import archive, bulk, statistics
+from tasks.models import ArchivedTask, ArchivedTaskAssignment, Task
+from tasks.search import search_tasks
+
+TASK_LIST_URL = reverse("tasks:task-list")
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        self.old = [
+            Task.objects.create(
+                name=f"Old report {number}",
+                deadline="2023-06-20",
+                is_completed=True,
+            )
+            for number in range(5)
+        ]
+        self.old[0].assignees.add(self.user)
+        Task.objects.filter(pk__in=[task.pk for task in self.old]).update(
+            completed_at=timezone.now() - timedelta(days=100)
+        )
+        self.recent = Task.objects.create(
+            name="Recent report",
+            deadline="2023-06-20",
+            is_completed=True,
+        )
+        self.open = Task.objects.create(
+            name="Open report",
+            deadline="2023-06-20",
+        )
+
+    def test_completed_at_follows_state(self):
+        self.assertIsNotNone(self.recent.completed_at)
+        self.assertIsNone(self.open.completed_at)
+        bulk.complete([self.open.pk])
+        self.open.refresh_from_db()
+        self.assertIsNotNone(self.open.completed_at)
+        bulk.reopen([self.open.pk])
+        self.open.refresh_from_db()
+        self.assertIsNone(self.open.completed_at)
+
+    def test_archive_moves_old_completed_tasks(self):
+        batches = []
+        archived = archive.archive_tasks(
+            days=90,
+            batch_size=2,
+            on_batch=batches.append,
+        )
+
+        self.assertEqual(archived, 5)
+        self.assertEqual(batches, [2, 4, 5])
+        self.assertCountEqual(
+            Task.objects.values_list("pk", flat=True),
+            [self.recent.pk, self.open.pk],
+        )
+        self.assertCountEqual(
+            ArchivedTask.objects.values_list("pk", flat=True),
+            [task.pk for task in self.old],
+        )
+        moved = ArchivedTask.objects.get(pk=self.old[0].pk)
+        self.assertEqual(moved.name, "Old report 0")
+        self.assertEqual(list(moved.assignees.all()), [self.user])
+        self.assertEqual(ArchivedTaskAssignment.objects.count(), 1)
+        self.assertEqual(statistics.get_counters(), statistics.rebuild())
+        # Gone from the live search index too.
+        self.assertEqual(
+            list(search_tasks(Task.objects.all(), "old")),
+            [],
+        )
+        self.assertEqual(archive.archive_tasks(days=90), 0)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_tasks", "--days", "90", stdout=out)
+        self.assertIn("Archived 5 tasks", out.getvalue())
+
+    def test_task_list_includes_archived_on_request(self):
+        archive.archive_tasks(days=90)
+
+        response = self.client.get(TASK_LIST_URL, {"is_completed": "on"})
+        self.assertNotContains(response, "Old report")
+
+        names = []
+        params = {"archived": "on", "search_field": "report"}
+        while True:
+            response = self.client.get(TASK_LIST_URL, params)
+            self.assertEqual(response.status_code, 200)
+            names += [task.name for task in response.context["task_list"]]
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            params["cursor"] = page.next_cursor
+        # Live tasks rank first: only they are in the search index.
+        self.assertEqual(names[:2], ["Open report", "Recent report"])
+        self.assertCountEqual(
+            names[2:],
+            [task.name for task in self.old],
+        )
+        self.assertContains(response, "Archived")
+
+    def test_export_includes_archived_on_request(self):
+        archive.archive_tasks(days=90)
+
+        response = self.client.get(
+            reverse("tasks:task-export"),
+            {"archived": "on", "assignee": "test_user"},
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [(row["name"], row["assignees"]) for row in rows],
+            [("Old report 0", ["test_user"])],
+        )
@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import include, path, reverse
+
+from tasks import async_views, statistics, urls
+from tasks.models import Task
+
+ASYNC_VIEWS = {
+    "index": async_views.AsyncIndexView,
+    "task-list": async_views.AsyncTaskListView,
+    "task-detail": async_views.AsyncTaskDetailView,
+    "worker-list": async_views.AsyncWorkerListView,
+    "worker-detail": async_views.AsyncWorkerDetailView,
+}
+
+# tasks.urls as served with settings.ASYNC_VIEWS on.
+urlpatterns = [
+    path("", include((
+        [
+            path(
+                str(pattern.pattern),
+                ASYNC_VIEWS[pattern.name].as_view(),
+                name=pattern.name,
+            )
+            if pattern.name in ASYNC_VIEWS else pattern
+            for pattern in urls.urlpatterns
+        ],
+        "tasks",
+    ))),
+    path("accounts/", include("django.contrib.auth.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.async_client.force_login(self.user)
+        self.tasks = Task.objects.bulk_create([
+            Task(
+                name=f"Task {number}",
+                deadline="2023-06-20",
+                priority="critical" if number % 2 else "normal",
+            )
+            for number in range(25)
+        ])
+        self.user.tasks.add(*self.tasks[::2])
+        statistics.rebuild()
+        cache.clear()
+
+    def test_views_are_async(self):
+        for view in ASYNC_VIEWS.values():
+            self.assertTrue(view.view_is_async, view)
+
+    async def test_login_required(self):
+        response = await AsyncClient().get(reverse("tasks:task-list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("login"), response.url)
+
+    async def test_index(self):
+        response = await self.async_client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["num_tasks"], 25)
+        self.assertEqual(response.context["num_visits"], 1)
+
+    async def test_task_list_matches_sync_view(self):
+        url = reverse("tasks:task-list")
+        response = await self.async_client.get(url)
+        page = response.context["page_obj"]
+        self.assertEqual(len(page), 10)
+        second = await self.async_client.get(
+            url, {"cursor": page.next_cursor}
+        )
+        ordering = async_views.AsyncTaskListView.cursor_ordering
+        expected = Task.objects.order_by(*ordering)[10:20]
+        self.assertEqual(
+            list(second.context["task_list"]),
+            [task async for task in expected],
+        )
+        response = await self.async_client.get(url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_task_list_revalidates(self):
+        url = reverse("tasks:task-list")
+        response = await self.async_client.get(url)
+        response = await self.async_client.get(
+            url, headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_task_detail(self):
+        response = await self.async_client.get(
+            reverse("tasks:task-detail", args=[self.tasks[0].pk])
+        )
+        self.assertContains(response, "Delete me from this task")
+        self.assertTrue(response.has_header("Last-Modified"))
+        response = await self.async_client.get(
+            reverse("tasks:task-detail", args=[0])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_worker_list(self):
+        for number in range(11):
+            await get_user_model().objects.acreate(username=f"worker{number}")
+        url = reverse("tasks:worker-list")
+        response = await self.async_client.get(url, {"page": "last"})
+        self.assertEqual(response.context["page_obj"].number, 2)
+        self.assertEqual(len(response.context["worker_list"]), 2)
+        response = await self.async_client.get(
+            url, {"search_field": "worker1"}
+        )
+        self.assertEqual(
+            {worker.username for worker in response.context["worker_list"]},
+            {"worker1", "worker10"},
+        )
+
+    async def test_worker_detail(self):
+        response = await self.async_client.get(
+            reverse("tasks:worker-detail", args=[self.user.pk])
+        )
+        tasks = response.context["task_list"]
+        self.assertEqual(len(tasks), 13)
+        self.assertTrue(all(task.assigned_to_me for task in tasks))
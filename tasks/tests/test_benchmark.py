@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from tasks import urls
+from tasks.management.commands.bench import Command, find_regressions
+from tasks.models import Task, TaskAssignment, Worker
+
+
+class BenchCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_every_route_is_timed(self):
+        results = Command().run({
+            "workers": 5,
+            "tasks": 20,
+            "density": 1.5,
+            "repeat": 1,
+            "routes": None,
+        })
+        self.assertEqual(
+            {name.split(":")[0] for name in results},
+            {pattern.name for pattern in urls.urlpatterns},
+        )
+        self.assertIn("task-delete:post", results)
+        self.assertEqual(Worker.objects.count(), 6)
+        self.assertEqual(Task.objects.count(), 20)
+        # assign-task toggles this assignment, but every write is rolled
+        # back after the request.
+        worker = Worker.objects.get(username="bench_user")
+        self.assertEqual(
+            list(worker.tasks.all()),
+            [Task.objects.order_by("pk").first()],
+        )
+        self.assertAlmostEqual(
+            TaskAssignment.objects.exclude(worker=worker).count(),
+            30,
+            delta=10,
+        )
+        for result in results.values():
+            self.assertLessEqual(result["p50"], result["p99"])
+            self.assertGreater(result["queries"], 0)
+
+    def test_find_regressions(self):
+        baseline = {
+            "index": {"p50": 4.0, "queries": 3},
+            "task-list": {"p50": 10.0, "queries": 4},
+        }
+        results = {
+            "index": {"p50": 4.9, "queries": 3},
+            "task-list": {"p50": 14.0, "queries": 5},
+            "task-create": {"p50": 99.0, "queries": 9},
+        }
+        self.assertEqual(
+            find_regressions(baseline, results, 0.25, 1.0),
+            [
+                "task-list: p50 10.00 -> 14.00 ms",
+                "task-list: 4 -> 5 queries",
+            ],
+        )
@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks import board, statistics
+from tasks.models import Task
+
+
+class BoardTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        today = date.today()
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                deadline=today + timedelta(days=number % 7),
+                priority=("critical", "urgent", "normal")[number % 3],
+                is_completed=number % 4 == 0,
+            )
+            for number in range(60)
+        ]
+        self.tasks[0].assignees.add(self.user)
+
+    def column_pages(self, column, size):
+        cards = []
+        columns = {column.key: column for column in board.load_board(size)}
+        cards += columns[column].cards
+        cursor = columns[column].next_cursor
+        while cursor:
+            page = board.column_page(column, cursor, size)
+            cards += page.object_list
+            cursor = page.next_cursor
+        return cards
+
+    def test_columns_page_in_their_ordering(self):
+        for key, _ in board.COLUMNS:
+            expected = list(board.column_tasks(key).order_by(
+                *board.column_ordering(key)
+            ))
+            self.assertTrue(expected)
+            self.assertEqual(self.column_pages(key, 3), expected, key)
+
+    def test_board_loads_in_three_queries(self):
+        with self.assertNumQueries(3):
+            columns = board.load_board(3)
+            for column in columns:
+                for task in column.cards:
+                    list(task.assignees.all())
+        self.assertEqual(
+            [len(column.cards) for column in columns],
+            [3, 3, 3, 3],
+        )
+
+    def test_completed_column_skips_missing_dates(self):
+        task = Task.objects.filter(is_completed=True).first()
+        Task.objects.filter(pk=task.pk).update(completed_at=None)
+        self.assertNotIn(task, board.column_tasks("completed"))
+        self.assertEqual(
+            self.column_pages("completed", 3),
+            list(board.column_tasks("completed").order_by(
+                *board.column_ordering("completed")
+            )),
+        )
+
+    def test_move(self):
+        task = Task.objects.filter(
+            is_completed=False,
+            priority="normal",
+        ).first()
+        self.assertTrue(board.move(task.pk, "critical"))
+        task.refresh_from_db()
+        self.assertEqual((task.priority, task.priority_rank), ("critical", 1))
+
+        self.assertTrue(board.move(task.pk, "completed"))
+        task.refresh_from_db()
+        self.assertTrue(task.is_completed)
+        self.assertIsNotNone(task.completed_at)
+        self.assertEqual(task.priority, "critical")
+
+        self.assertTrue(board.move(task.pk, "urgent"))
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+        self.assertIsNone(task.completed_at)
+        self.assertEqual(statistics.get_counters(), statistics.rebuild())
+        self.assertFalse(board.move(0, "urgent"))
+
+    def test_views(self):
+        response = self.client.get(reverse("tasks:board"))
+        self.assertContains(response, "Task 1")
+        self.assertContains(response, "test_user")
+        next_cursor = response.context["columns"][0].next_cursor
+
+        response = self.client.get(
+            reverse("tasks:board-column", args=["critical"]),
+            {"cursor": next_cursor},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["column"].cards)
+        self.assertEqual(
+            self.client.get(
+                reverse("tasks:board-column", args=["someday"])
+            ).status_code,
+            404,
+        )
+
+        task = self.tasks[1]
+        move_url = reverse("tasks:task-move", args=[task.pk])
+        response = self.client.post(
+            move_url,
+            {"column": "completed"},
+            headers={"accept": "application/json"},
+        )
+        self.assertEqual(
+            response.json(),
+            {"task": task.pk, "column": "completed"},
+        )
+        response = self.client.post(move_url, {"column": "normal"})
+        self.assertRedirects(response, reverse("tasks:board"))
+        self.assertEqual(
+            self.client.post(move_url, {"column": "someday"}).status_code,
+            400,
+        )
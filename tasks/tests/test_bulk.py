@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks import bulk, statistics
+from tasks.models import Task, Worker
+
+BULK_URL = reverse("tasks:task-bulk")
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                deadline="2023-06-20",
+                priority="critical" if number % 2 else "normal",
+            )
+            for number in range(6)
+        ]
+        self.ids = [task.pk for task in self.tasks]
+
+    def assertCountersMatch(self):
+        counters = statistics.get_counters()
+        self.assertEqual(counters, statistics.rebuild())
+
+    def test_complete_and_reopen(self):
+        response = self.client.post(BULK_URL, {
+            "action": "complete",
+            "tasks": self.ids[:4],
+        })
+        self.assertRedirects(response, reverse("tasks:task-list"))
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 4)
+        self.assertCountersMatch()
+
+        # Reading the completion days, the UPDATE, the counter
+        # adjustment and marking the days stale, inside a savepoint.
+        with self.assertNumQueries(6):
+            self.assertEqual(bulk.reopen(self.ids), 4)
+        self.assertCountersMatch()
+
+    def test_reprioritise_keeps_rank_in_sync(self):
+        self.client.post(BULK_URL, {
+            "action": "reprioritise",
+            "tasks": self.ids,
+            "priority": "urgent",
+        })
+        self.assertEqual(
+            set(Task.objects.values_list("priority", "priority_rank")),
+            {("urgent", 2)},
+        )
+        self.assertCountersMatch()
+
+        bulk.reprioritise(self.ids[:2], "critical")
+        self.assertCountersMatch()
+
+    def test_reprioritise_requires_priority(self):
+        self.client.post(BULK_URL, {
+            "action": "reprioritise",
+            "tasks": self.ids,
+        })
+        self.assertEqual(
+            Task.objects.filter(priority="critical").count(), 3
+        )
+
+    def test_reassign(self):
+        worker = Worker.objects.create(username="worker1")
+        self.tasks[0].assignees.add(self.user)
+        self.client.post(BULK_URL, {
+            "action": "reassign",
+            "tasks": self.ids[:2],
+            "assignees": [worker.pk],
+        })
+        self.assertEqual(set(worker.tasks.all()), set(self.tasks[:2]))
+        self.assertFalse(self.user.tasks.exists())
+
+    def test_delete_batches_counter_updates(self):
+        self.tasks[0].assignees.add(self.user)
+        self.client.post(BULK_URL, {
+            "action": "delete",
+            "tasks": self.ids[:5],
+        })
+        self.assertEqual(list(Task.objects.all()), self.tasks[5:])
+        self.assertCountersMatch()
+
+    def test_toggle_complete_view(self):
+        url = reverse("tasks:task-complete", args=[self.ids[0]])
+        self.client.get(url)
+        self.tasks[0].refresh_from_db()
+        self.assertTrue(self.tasks[0].is_completed)
+        self.client.get(url)
+        self.tasks[0].refresh_from_db()
+        self.assertFalse(self.tasks[0].is_completed)
+        self.assertCountersMatch()
+        self.assertEqual(
+            self.client.get(
+                reverse("tasks:task-complete", args=[0])
+            ).status_code,
+            404,
+        )
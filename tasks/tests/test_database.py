@@ -0,0 +1,29 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from tasks.database import configure_sqlite
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite pragmas")
+class SQLitePragmaTests(SimpleTestCase):
+    databases = {"default"}
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied(self):
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), 20_000)
+        self.assertEqual(self.pragma("cache_size"), -64_000)
+
+    def test_settings_override_defaults(self):
+        connection.ensure_connection()
+        with override_settings(SQLITE_PRAGMAS={"cache_size": -1000}):
+            configure_sqlite(sender=None, connection=connection)
+        self.assertEqual(self.pragma("cache_size"), -1000)
+        configure_sqlite(sender=None, connection=connection)
+        self.assertEqual(self.pragma("cache_size"), -64_000)
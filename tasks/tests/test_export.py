@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import Position, Task, TaskType, Worker
+from tasks.views import TaskExportView
+
+TASK_EXPORT_URL = reverse("tasks:task-export")
+WORKER_EXPORT_URL = reverse("tasks:worker-export")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        bug = TaskType.objects.create(name="Bug")
+        self.tasks = Task.objects.bulk_create([
+            Task(
+                name=f"Task {number}",
+                deadline="2023-06-20",
+                priority=priority,
+                priority_rank=Task.rank_for(priority),
+                task_type=bug,
+            )
+            for number, priority in enumerate(
+                ["normal", "critical"] * 3 + ["normal"]
+            )
+        ])
+        self.user.tasks.add(*self.tasks[:3])
+
+    def read(self, url, data=None):
+        response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_is_the_default(self):
+        lines = self.read(TASK_EXPORT_URL).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [task.pk for task in self.tasks],
+        )
+        self.assertEqual(rows[0]["assignees"], ["test_user"])
+        self.assertEqual(rows[0]["task_type"], "Bug")
+        self.assertEqual(rows[0]["deadline"], "2023-06-20")
+        self.assertEqual(rows[-1]["assignees"], [])
+
+    def test_filters_match_the_task_list(self):
+        body = self.read(
+            TASK_EXPORT_URL,
+            {"format": "json", "priority": "critical", "assignee": "test"},
+        )
+        self.assertEqual(
+            [row["id"] for row in json.loads(body)],
+            [self.tasks[1].pk],
+        )
+
+    def test_csv(self):
+        body = self.read(TASK_EXPORT_URL, {"format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[0]["assignees"], "test_user")
+        self.assertEqual(rows[0]["is_completed"], "False")
+
+    def test_assignees_are_prefetched_per_chunk(self):
+        view = TaskExportView.as_view(chunk_size=3)
+        request = self.client.get(TASK_EXPORT_URL).wsgi_request
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request)
+            rows = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(rows), 7)
+        # One query read in three chunks, plus a prefetch per chunk.
+        self.assertEqual(len(queries), 4)
+
+    def test_workers(self):
+        developer = Position.objects.create(name="Developer")
+        Worker.objects.create(
+            username="john", first_name="John", position=developer
+        )
+        body = self.read(
+            WORKER_EXPORT_URL, {"format": "csv", "search_field": "jo"}
+        )
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(
+            [(row["username"], row["position"]) for row in rows],
+            [("john", "Developer")],
+        )
+
+    def test_unknown_format(self):
+        response = self.client.get(TASK_EXPORT_URL, {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(TASK_EXPORT_URL)
+        self.assertNotEqual(response.status_code, 200)
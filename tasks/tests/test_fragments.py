@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks import assignments, bulk, fragments
+from tasks.models import Task
+
+TASKS_URL = reverse("tasks:task-list")
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragments.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        self.task = Task.objects.create(
+            name="Write report",
+            description="Quarterly numbers",
+            deadline="2023-06-20",
+        )
+        self.detail_url = reverse("tasks:task-detail", args=[self.task.pk])
+
+    def test_rows_are_served_from_cache(self):
+        self.client.get(TASKS_URL)
+        self.assertEqual(fragments.stats()["misses"], 1)
+        self.client.get(TASKS_URL)
+        self.assertEqual(fragments.stats(), {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        })
+
+    def test_save_invalidates_fragments(self):
+        self.client.get(TASKS_URL)
+        self.task.name = "Write summary"
+        self.task.save()
+        response = self.client.get(TASKS_URL)
+        self.assertContains(response, "Write summary")
+        self.assertEqual(fragments.stats()["hits"], 0)
+
+    def test_bulk_update_invalidates_fragments(self):
+        self.client.get(TASKS_URL)
+        bulk.reprioritise([self.task.pk], "critical")
+        response = self.client.get(TASKS_URL, {"priority": "critical"})
+        self.assertContains(response, "<td>critical</td>", html=True)
+
+    def test_assignment_invalidates_assignee_list(self):
+        self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as warm:
+            self.client.get(self.detail_url)
+        assignments.assign([(self.task.pk, self.user.pk)])
+        with CaptureQueriesContext(connection) as cold:
+            response = self.client.get(self.detail_url)
+        self.assertContains(response, f'data-worker="{self.user.pk}"')
+        # The cold render also loads the assignees.
+        self.assertEqual(len(cold), len(warm) + 1)
+
+    def test_worker_rename_invalidates_task_fragments(self):
+        self.user.tasks.add(self.task)
+        self.client.get(self.detail_url)
+        self.user.username = "renamed_user"
+        self.user.save()
+        response = self.client.get(self.detail_url)
+        self.assertContains(response, "renamed_user")
+
+    def test_versions_load_in_one_round_trip(self):
+        tasks = Task.objects.bulk_create([
+            Task(name=f"Task {number}", deadline="2023-06-20")
+            for number in range(5)
+        ])
+        fragments.attach_versions(tasks)
+        versions = [task._cache_version for task in tasks]
+        self.assertEqual(len(set(versions)), 5)
+        fragments.attach_versions(tasks)
+        self.assertEqual(
+            [task._cache_version for task in tasks], versions
+        )
+        fragments.bump(Task, [tasks[0].pk])
+        fragments.attach_versions(tasks)
+        self.assertNotEqual(tasks[0]._cache_version, versions[0])
+        self.assertEqual(tasks[1]._cache_version, versions[1])
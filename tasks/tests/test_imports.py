@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+
+from tasks import statistics
+from tasks.imports import TaskImporter
+from tasks.models import Position, Task, TaskType, Worker
+from tasks.search import search_workers
+
+
+class ImportCommandTests(TestCase):
+    def import_file(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False
+        ) as source:
+            source.write(content)
+        self.addCleanup(os.remove, source.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_tasks", source.name, *args, stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_tasks_from_csv(self):
+        Worker.objects.create(username="john")
+        Worker.objects.create(username="jane")
+        stdout, stderr = self.import_file(
+            "name,deadline,priority,task_type,is_completed,assignees\n"
+            "Deploy,2023-06-20,critical,Release,false,john jane\n"
+            "Review,2023-06-21,,Release,true,\n"
+            "Broken,20/06/2023,normal,,false,\n"
+            "Orphan,2023-06-22,urgent,,false,nobody\n",
+            ".csv",
+            "--batch-size", "2",
+        )
+        self.assertIn("Imported 2 tasks", stdout)
+        self.assertIn("skipped 2 rows", stdout)
+        self.assertIn("line 4: deadline must be a YYYY-MM-DD date", stderr)
+        self.assertIn("line 5: unknown assignees: nobody", stderr)
+
+        deploy = Task.objects.get(name="Deploy")
+        self.assertEqual(deploy.priority_rank, 1)
+        self.assertEqual(deploy.task_type.name, "Release")
+        self.assertEqual(
+            sorted(deploy.assignees.values_list("username", flat=True)),
+            ["jane", "john"],
+        )
+        review = Task.objects.get(name="Review")
+        self.assertEqual(review.priority, "normal")
+        self.assertTrue(review.is_completed)
+        self.assertEqual(TaskType.objects.count(), 1)
+        self.assertEqual(statistics.get_counters(), statistics.rebuild())
+
+    def test_import_workers_from_jsonl(self):
+        Worker.objects.create(username="taken")
+        rows = [
+            {"username": "john", "first_name": "John", "position": "Dev"},
+            {"username": "taken"},
+            {"username": "jane", "last_name": "Doe", "position": "Dev"},
+        ]
+        stdout, stderr = self.import_file(
+            "\n".join(json.dumps(row) for row in rows) + "\nnot json\n",
+            ".jsonl",
+            "--kind", "workers",
+        )
+        self.assertIn("Imported 2 workers", stdout)
+        self.assertIn("line 2: username 'taken' is taken", stderr)
+        self.assertIn("line 4: invalid JSON", stderr)
+        self.assertEqual(Position.objects.get().workers.count(), 2)
+        self.assertFalse(
+            Worker.objects.get(username="john").has_usable_password()
+        )
+        self.assertEqual(
+            list(search_workers(Worker.objects.all(), "doe")),
+            [Worker.objects.get(username="jane")],
+        )
+        self.assertEqual(statistics.get_counters(), statistics.rebuild())
+
+    def test_invalid_values_skip_their_row(self):
+        long_name = "x" * 256
+        stdout, stderr = self.import_file(
+            "name,deadline,task_type\n"
+            f"{long_name},2023-06-20,\n"
+            f"Deploy,2023-06-20,{long_name}\n"
+            "Review,2023-06-21,Release\n",
+            ".csv",
+        )
+        self.assertIn("Imported 1 tasks", stdout)
+        self.assertIn("line 2: name: Ensure this value has at most", stderr)
+        self.assertIn("line 3: name: Ensure this value", stderr)
+
+        rows = [
+            {"username": "bad name!"},
+            {"username": "john", "email": "not an email"},
+            {"username": "jane", "first_name": long_name},
+            {"username": "jim"},
+        ]
+        stdout, stderr = self.import_file(
+            "\n".join(json.dumps(row) for row in rows),
+            ".jsonl",
+            "--kind", "workers",
+        )
+        self.assertIn("Imported 1 workers", stdout)
+        self.assertIn("line 1: username: Enter a valid username", stderr)
+        self.assertIn("line 2: email: Enter a valid email", stderr)
+        self.assertIn("line 3: first_name: Ensure this value", stderr)
+
+    def test_failed_batch_forgets_created_names(self):
+        importer = TaskImporter()
+        rows = [(1, {"name": "Deploy", "deadline": "2023-06-20",
+                     "task_type": "Release"})]
+        with mock.patch.object(
+            Task.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            importer.run(rows)
+        self.assertFalse(TaskType.objects.exists())
+
+        self.assertEqual(importer.run(rows), (1, 0))
+        self.assertEqual(
+            Task.objects.get().task_type,
+            TaskType.objects.get(name="Release"),
+        )
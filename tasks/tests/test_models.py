@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
 from tasks.models import Position, Worker, TaskType, Task
 
@@ -73,3 +75,33 @@ class ModelTests(TestCase):
         assignees = self.task.assignees.all()
         self.assertEqual(list(assignees), [self.worker])
         self.assertEqual(assignees[0].username, "worker1")
+
+    def test_task_priority_rank_follows_priority(self):
+        self.assertEqual(self.task.priority_rank, 1)
+        self.task.priority = "urgent"
+        self.task.save(update_fields=["priority"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.priority_rank, 2)
+
+    def test_due_periods(self):
+        wednesday = date(2023, 6, 21)
+        tasks = {
+            offset: Task.objects.create(
+                name=f"Due {offset}",
+                deadline=wednesday + timedelta(days=offset),
+            )
+            for offset in (-1, 0, 4, 5)
+        }
+        Task.objects.create(
+            name="Done", deadline=wednesday, is_completed=True
+        )
+
+        def due(period):
+            return set(Task.objects.due(period, today=wednesday))
+
+        self.assertEqual(due("overdue"), {self.task, tasks[-1]})
+        self.assertEqual(due("today"), {tasks[0]})
+        # Until Sunday.
+        self.assertEqual(due("week"), {tasks[0], tasks[4]})
+        with self.assertRaises(ValueError):
+            due("someday")
@@ -0,0 +1,98 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks import metrics
+from tasks.models import Task
+
+
+def server_timing(response):
+    return {
+        match["name"]: match
+        for match in re.finditer(
+            r'(?P<name>\w+);dur=(?P<dur>[\d.]+)(;desc="(?P<desc>[^"]*)")?',
+            response["Server-Timing"],
+        )
+    }
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        Task.objects.create(name="Task", deadline="2023-06-20")
+
+    def test_server_timing(self):
+        response = self.client.get(reverse("tasks:task-list"))
+        timings = server_timing(response)
+        self.assertEqual(
+            timings.keys(), {"db", "tpl", "view", "mw", "total"}
+        )
+        self.assertGreater(float(timings["tpl"]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(timings["total"]["dur"]), float(timings["view"]["dur"])
+        )
+
+    def test_query_count_matches(self):
+        url = reverse("tasks:task-detail", args=[Task.objects.get().pk])
+        self.client.get(url)
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(server_timing(response)["db"]["desc"], "4 queries")
+
+    def test_metrics(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(reverse("tasks:task-list"))
+        self.client.get(reverse("tasks:task-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(
+            response["Content-Type"],
+            "text/plain; version=0.0.4; charset=utf-8",
+        )
+        content = response.content.decode()
+        self.assertIn(
+            'task_flow_request_duration_seconds_count{view="tasks:task-list"}'
+            ' 2',
+            content,
+        )
+        self.assertIn(
+            'task_flow_db_queries_bucket{view="tasks:task-list",le="+Inf"} 2',
+            content,
+        )
+
+    def test_metrics_hidden_by_default(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(
+            reverse("metrics"), headers={"authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_histogram(self):
+        histogram = metrics.Histogram("latency", "Latency.", (1, 5))
+        for value in (0.5, 1, 3, 9):
+            histogram.observe("view", value)
+        self.assertEqual(histogram.render().splitlines()[2:], [
+            'latency_bucket{view="view",le="1"} 2',
+            'latency_bucket{view="view",le="5"} 3',
+            'latency_bucket{view="view",le="+Inf"} 4',
+            'latency_sum{view="view"} 13.5',
+            'latency_count{view="view"} 4',
+        ])
+
+    async def test_async_requests(self):
+        response = await self.async_client.get(reverse("tasks:task-list"))
+        self.assertIn("db", server_timing(response))
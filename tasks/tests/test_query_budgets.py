@@ -0,0 +1,158 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase
+from django.urls import resolve
+
+from tasks import statistics, urls, views
+from tasks.benchmark import (
+    route_requests,
+    seed_assignments,
+    seed_tasks,
+    seed_workers,
+)
+from tasks.models import Position, Task, TaskType, Worker
+from tasks.tests.budgets import QueryBudgetExceeded, query_budget
+
+# Most queries a request to each view may run, whatever the data size.
+# Every request loads the session and the user first. Requests that
+# change tasks also refresh the report rollups of the days they touched
+# once they commit, about ten more.
+BUDGETS = {
+    # The first visit of a flush interval writes the visit counter.
+    views.IndexView: 10,
+    views.AssignTaskView: 18,
+    views.AssignmentsView: 21,
+    views.ToggleCompleteTaskView: 19,
+    views.TaskBulkActionView: 6,
+    views.BoardView: 5,
+    views.BoardColumnView: 4,
+    views.MoveTaskView: 5,
+    views.ReportView: 5,
+    views.TaskListView: 3,
+    views.TaskExportView: 4,
+    views.TaskCreateView: 3,
+    views.TaskDetailView: 5,
+    views.TaskUpdateView: 6,
+    views.TaskDeleteView: 3,
+    views.WorkerListView: 4,
+    views.WorkerAutocompleteView: 4,
+    views.WorkerExportView: 3,
+    views.WorkerCreateView: 3,
+    views.WorkerDetailView: 5,
+    views.WorkerUpdateView: 4,
+    views.WorkerDeleteView: 3,
+}
+
+# Budgets of form submissions, where signals and counters run, for the
+# views whose BUDGETS entry covers showing the form.
+POST_BUDGETS = {
+    views.TaskCreateView: 26,
+    views.TaskUpdateView: 28,
+    views.TaskDeleteView: 17,
+    views.WorkerCreateView: 9,
+    views.WorkerUpdateView: 14,
+    views.WorkerDeleteView: 25,
+}
+
+# Workers, tasks and assignees per task of each dataset.
+SIZES = (
+    (2, 3, 1),
+    (10, 30, 2),
+    (40, 120, 3),
+)
+
+
+def budget_for(view_class, method="get"):
+    budgets = [BUDGETS]
+    if method == "post":
+        budgets.insert(0, POST_BUDGETS)
+    # With settings.ASYNC_VIEWS, async subclasses are routed instead.
+    for cls in view_class.__mro__:
+        for budget in budgets:
+            if cls in budget:
+                return budget[cls]
+    return None
+
+
+class QueryBudgetTests(TestCase):
+    def test_budget(self):
+        with query_budget(1):
+            Task.objects.count()
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "2 queries executed, the budget is 1"
+        ):
+            with query_budget(1):
+                Task.objects.count()
+                Task.objects.count()
+
+        @query_budget(0)
+        def count():
+            return Task.objects.count()
+
+        self.assertRaises(QueryBudgetExceeded, count)
+
+    def test_every_view_has_a_budget(self):
+        for pattern in urls.urlpatterns:
+            self.assertIsNotNone(
+                budget_for(pattern.callback.view_class), pattern.name
+            )
+
+    def seed(self, workers, tasks, density):
+        seed_workers(workers, seed=1)
+        self.task_type = TaskType.objects.create(name="Bug")
+        seed_tasks(tasks, seed=1, task_type=self.task_type)
+        seed_assignments(density, seed=1)
+        self.position = Position.objects.create(name="Developer")
+        Worker.objects.update(position=self.position)
+        statistics.rebuild()
+        user = Worker.objects.create_user(username="test_user")
+        first_task = Task.objects.order_by("pk").first()
+        user.tasks.add(first_task)
+        return user, first_task
+
+    def count_queries(self, workers, tasks, density):
+        """Return the queries each route ran on a dataset of this size."""
+        user, task = self.seed(workers, tasks, density)
+        client = Client()
+        client.force_login(user)
+        counts = {}
+        other_worker = Worker.objects.exclude(pk=user.pk).first()
+        # Deleting a worker costs more once they have tasks; not the
+        # first task, which the task-delete:post request deletes.
+        other_worker.tasks.add(Task.objects.exclude(pk=task.pk).first())
+        for name, (method, url, kwargs) in route_requests(
+            task.pk,
+            user.pk,
+            other_worker.pk,
+            self.task_type.pk,
+            self.position.pk,
+        ).items():
+            view = resolve(url).func.view_class
+            if method == "write":
+                method = "get"
+            # A cold cache is the most expensive case.
+            cache.clear()
+            budget = budget_for(view, method)
+            # Including what runs once the request commits.
+            with query_budget(budget, label=name) as queries, \
+                    self.captureOnCommitCallbacks(execute=True):
+                response = getattr(client, method)(url, **kwargs)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            self.assertLess(response.status_code, 400, name)
+            if name.endswith(":post"):
+                # Redirected, so the form was valid and saved.
+                self.assertEqual(response.status_code, 302, name)
+            counts[name] = len(queries)
+        return counts
+
+    def test_views_stay_within_budget_at_every_size(self):
+        counts = {}
+        for size in SIZES:
+            with self.subTest(size=size), transaction.atomic():
+                counts[size] = self.count_queries(*size)
+                transaction.set_rollback(True)
+        smallest, *larger = SIZES
+        for size in larger:
+            # Query counts that grow with the data are N+1 queries.
+            self.assertEqual(counts[size], counts[smallest], size)
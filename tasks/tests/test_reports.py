@@ -0,0 +1,207 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import archive, assignments, board, bulk, reports
+from tasks.models import (
+    DailyTaskRollup,
+    Position,
+    StaleRollupDay,
+    Task,
+    TaskType,
+)
+
+REPORTS_URL = reverse("tasks:reports")
+
+
+def stored_rollups():
+    return {
+        (rollup.day, rollup.dimension, rollup.key): (
+            rollup.created,
+            rollup.completed,
+        )
+        for rollup in DailyTaskRollup.objects.all()
+    }
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_pass",
+            position=self.position,
+        )
+        self.client.force_login(self.user)
+        self.bug = TaskType.objects.create(name="Bug")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                deadline="2023-06-20",
+                priority=("critical", "urgent", "normal")[number % 3],
+                task_type=self.bug if number % 2 else None,
+                is_completed=number % 4 == 0,
+            )
+            for number in range(8)
+        ]
+        self.tasks[0].assignees.add(self.user)
+        self.today = timezone.localdate()
+
+    def assertRollupsMatch(self):
+        """Refreshing leaves the same rows as computing every day anew."""
+        reports.refresh()
+        self.assertFalse(StaleRollupDay.objects.exists())
+        days = {day for day, _, _ in stored_rollups()}
+        days |= reports.task_days(Task.objects.all())
+        expected = {
+            (rollup.day, rollup.dimension, rollup.key): (
+                rollup.created,
+                rollup.completed,
+            )
+            for rollup in reports.compute(days)
+        }
+        self.assertEqual(stored_rollups(), expected)
+
+    def test_rollups_follow_changes(self):
+        self.assertRollupsMatch()
+        self.assertEqual(
+            stored_rollups()[self.today, "type", str(self.bug.pk)],
+            (4, 0),
+        )
+        self.assertEqual(
+            stored_rollups()[self.today, "position", str(self.position.pk)],
+            (1, 1),
+        )
+
+        ids = [task.pk for task in self.tasks]
+        bulk.complete(ids[1:3])
+        self.assertRollupsMatch()
+        bulk.reopen(ids[:2])
+        self.assertRollupsMatch()
+        bulk.reprioritise(ids, "urgent")
+        self.assertRollupsMatch()
+        bulk.reassign(ids[:3], [self.user.pk])
+        self.assertRollupsMatch()
+        assignments.toggle([(ids[1], self.user.pk)])
+        self.assertRollupsMatch()
+        board.move(ids[4], "completed")
+        self.assertRollupsMatch()
+        task = Task.objects.get(pk=ids[5])
+        task.is_completed = True
+        task.save()
+        self.assertRollupsMatch()
+        bulk.delete(ids[6:])
+        self.assertRollupsMatch()
+        self.assertEqual(
+            stored_rollups()[self.today, "priority", "urgent"],
+            (6, 3),
+        )
+
+    def test_changes_are_rebuilt_on_commit(self):
+        reports.refresh()
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.complete([self.tasks[1].pk])
+        self.assertFalse(StaleRollupDay.objects.exists())
+        self.assertEqual(
+            stored_rollups()[self.today, "type", str(self.bug.pk)],
+            (4, 1),
+        )
+
+        task = Task.objects.get(pk=self.tasks[2].pk)
+        task.task_type = self.bug
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        self.assertFalse(StaleRollupDay.objects.exists())
+        self.assertEqual(
+            stored_rollups()[self.today, "type", str(self.bug.pk)],
+            (5, 1),
+        )
+        self.assertRollupsMatch()
+
+    def test_old_days_are_marked_and_archived_tasks_count(self):
+        long_ago = timezone.now() - timedelta(days=100)
+        Task.objects.filter(pk=self.tasks[0].pk).update(
+            created_at=long_ago,
+            completed_at=long_ago,
+        )
+        call_command("rebuild_rollups", "--start", "2000-01-01",
+                     stdout=StringIO())
+        archive.archive_tasks(days=90)
+        self.assertRollupsMatch()
+        self.assertEqual(
+            stored_rollups()[long_ago.date(), "priority", "critical"],
+            (1, 1),
+        )
+
+        # Changing a worker's position moves their archived tasks too.
+        self.user.position = Position.objects.create(name="Manager")
+        self.user.save()
+        self.assertEqual(
+            list(StaleRollupDay.objects.values_list("day", flat=True)),
+            [long_ago.date()],
+        )
+        self.assertRollupsMatch()
+        self.assertEqual(
+            stored_rollups()[
+                long_ago.date(), "position", str(self.user.position_id)
+            ],
+            (1, 1),
+        )
+
+        bug_key = str(self.bug.pk)
+        self.bug.delete()
+        self.assertRollupsMatch()
+        self.assertNotIn((self.today, "type", bug_key), stored_rollups())
+
+    def test_command(self):
+        out = StringIO()
+        call_command("rebuild_rollups", stdout=out)
+        self.assertIn("Rebuilt 1 stale days", out.getvalue())
+        DailyTaskRollup.objects.all().delete()
+
+        out = StringIO()
+        call_command(
+            "rebuild_rollups",
+            "--start", str(self.today - timedelta(days=40)),
+            stdout=out,
+        )
+        self.assertIn("from", out.getvalue())
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        self.assertRollupsMatch()
+
+    def test_view(self):
+        bulk.complete([self.tasks[1].pk])
+        response = self.client.get(REPORTS_URL)
+        # The page only reads. The day is rebuilt once the change
+        # commits, which never happens inside a TestCase.
+        self.assertEqual(response.context["stale_days"], 1)
+        self.assertTrue(StaleRollupDay.objects.exists())
+
+        reports.refresh()
+        response = self.client.get(REPORTS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["stale_days"], 0)
+        self.assertContains(response, "Bug")
+        self.assertContains(response, "No type")
+        totals = {
+            label: total for label, _, total in response.context["groups"]
+        }
+        self.assertEqual(totals, {"Bug": (4, 1), "No type": (4, 2)})
+
+        response = self.client.get(
+            REPORTS_URL,
+            {"dimension": "position", "period": "day"},
+        )
+        self.assertContains(response, "Developer")
+        self.assertEqual(response.context["periods"], [self.today])
+
+        response = self.client.get(REPORTS_URL, {
+            "start": str(self.today),
+            "end": str(self.today - timedelta(days=1)),
+        })
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,135 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from tasks.benchmark import scratch_database
+from tasks.models import Task
+from tasks.routers import (
+    PIN_COOKIE,
+    ReplicaMiddleware,
+    ReplicaRouter,
+    RoutingState,
+    _state,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.reads = []
+
+    def request(self, request, write=False):
+        def view(request):
+            if write:
+                self.router.db_for_write(Task)
+            self.reads.append(self.router.db_for_read(Task))
+            return HttpResponse()
+
+        return ReplicaMiddleware(view)(request)
+
+    def test_safe_requests_read_from_replicas(self):
+        response = self.request(self.factory.get("/tasks/"))
+        self.assertEqual(self.reads, ["replica1"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_unsafe_requests_and_commands_use_the_primary(self):
+        self.request(self.factory.post("/tasks/create/"))
+        self.assertEqual(self.reads, [DEFAULT_DB_ALIAS])
+        self.assertEqual(self.router.db_for_read(Task), DEFAULT_DB_ALIAS)
+
+    def test_writes_pin_to_the_primary(self):
+        response = self.request(self.factory.get("/tasks/1/"), write=True)
+        # The rest of the request reads its own write.
+        self.assertEqual(self.reads, [DEFAULT_DB_ALIAS])
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 10)
+
+        request = self.factory.get("/tasks/")
+        request.COOKIES[PIN_COOKIE] = cookie.value
+        self.request(request)
+        self.assertEqual(self.reads, [DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS])
+
+    def test_replicas_are_not_migrated(self):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "tasks"))
+        self.assertFalse(self.router.allow_migrate("replica1", "tasks"))
+
+    def test_scratch_database_reads_no_replica(self):
+        creation = connections[DEFAULT_DB_ALIAS].creation
+        token = _state.set(RoutingState(use_replicas=True))
+        try:
+            with mock.patch.object(creation, "create_test_db"), \
+                    mock.patch.object(creation, "destroy_test_db"):
+                with scratch_database():
+                    self.assertEqual(
+                        self.router.db_for_read(Task), DEFAULT_DB_ALIAS
+                    )
+            self.assertEqual(self.router.db_for_read(Task), "replica1")
+        finally:
+            _state.reset(token)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaEndToEndTests(TransactionTestCase):
+    """Requests against a second SQLite database as the replica."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added after the test case set up its databases: the runner
+        # neither creates nor flushes it, like a real replica.
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings["replica1"] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "NAME": str(Path(cls.directory.name) / "replica.sqlite3"),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections["replica1"].close()
+        del connections["replica1"]
+        del connections.settings["replica1"]
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def test_reads_follow_the_replica_until_a_write_pins(self):
+        user = get_user_model().objects.create_user(username="test_user")
+        Task.objects.create(name="Copied task", deadline="2023-06-20")
+        self.client.force_login(user)
+        call_command("copy_to_replicas", stdout=StringIO())
+        task = Task.objects.create(name="Fresh task", deadline="2023-06-20")
+
+        task_list = reverse("tasks:task-list")
+        response = self.client.get(task_list)
+        self.assertContains(response, "Copied task")
+        self.assertNotContains(response, "Fresh task")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        # A GET that writes: the write reaches the primary and the
+        # response pins the browser to it.
+        response = self.client.get(
+            reverse("tasks:task-complete", args=[task.pk])
+        )
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
+        self.assertTrue(Task.objects.get(pk=task.pk).is_completed)
+
+        response = self.client.get(task_list, {"is_completed": "on"})
+        self.assertContains(response, "Fresh task")
+
+        self.client.cookies.pop(PIN_COOKIE)
+        response = self.client.get(task_list, {"is_completed": "on"})
+        self.assertNotContains(response, "Fresh task")
@@ -0,0 +1,132 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks.models import Task, Worker
+from tasks.search import search_tasks, search_workers
+
+TASKS_URL = reverse("tasks:task-list")
+
+
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        self.deploy = Task.objects.create(
+            name="Deploy release",
+            description="Roll the new build out to production",
+            deadline="2023-06-20",
+        )
+        self.review = Task.objects.create(
+            name="Review pull request",
+            description="Check the deploy script before release",
+            deadline="2023-06-20",
+        )
+        self.invoice = Task.objects.create(
+            name="Send invoices",
+            deadline="2023-06-20",
+        )
+
+    def search(self, query):
+        return list(
+            search_tasks(Task.objects.all(), query).order_by("-search_rank")
+        )
+
+    def test_matches_name_and_description(self):
+        self.assertEqual(self.search("deploy"), [self.deploy, self.review])
+        self.assertEqual(self.search("production"), [self.deploy])
+
+    def test_every_term_matches_as_prefix(self):
+        self.assertEqual(self.search("rel prod"), [self.deploy])
+        self.assertEqual(self.search("invoice deploy"), [])
+
+    def test_empty_query_is_ignored(self):
+        queryset = Task.objects.all()
+        self.assertIs(search_tasks(queryset, " ?! "), queryset)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.invoice.name = "Send reminders"
+        self.invoice.save()
+        self.assertEqual(self.search("invoices"), [])
+        self.assertEqual(self.search("reminders"), [self.invoice])
+
+        Task.objects.filter(pk=self.invoice.pk).update(description="urgent")
+        self.assertEqual(self.search("urgent"), [self.invoice])
+
+        self.invoice.delete()
+        self.assertEqual(self.search("reminders"), [])
+
+    def test_task_list_uses_search(self):
+        user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(user)
+        response = self.client.get(TASKS_URL, {"search_field": "deploy"})
+        self.assertEqual(
+            list(response.context_data["task_list"]),
+            [self.deploy, self.review],
+        )
+
+    def test_ranked_results_paginate(self):
+        user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(user)
+        Task.objects.bulk_create([
+            Task(name=f"Deploy hotfix {number}", deadline="2023-06-20")
+            for number in range(12)
+        ])
+        first = self.client.get(TASKS_URL, {"search_field": "deploy"})
+        page = first.context_data["page_obj"]
+        second = self.client.get(
+            TASKS_URL,
+            {"search_field": "deploy", "cursor": page.next_cursor},
+        )
+        seen = [*page, *second.context_data["page_obj"]]
+        self.assertEqual(len(seen), 14)
+        self.assertEqual(len(set(seen)), 14)
+        ranks = [task.search_rank for task in seen]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+
+class WorkerSearchTests(TestCase):
+    def setUp(self):
+        self.john = Worker.objects.create(
+            username="worker1", first_name="John", last_name="Doe"
+        )
+        self.jane = Worker.objects.create(
+            username="worker2", first_name="Jane", last_name="Smith"
+        )
+        self.bob = Worker.objects.create(
+            username="worker3", first_name="Bob", last_name="Johnson"
+        )
+
+    def search(self, query):
+        return list(search_workers(Worker.objects.all(), query))
+
+    def test_matches_any_name_in_username_order(self):
+        self.assertEqual(self.search("JOHN"), [self.john, self.bob])
+        self.assertEqual(self.search("worker"), [
+            self.john, self.jane, self.bob
+        ])
+        self.assertEqual(self.search("smith"), [self.jane])
+
+    def test_keys_follow_renames(self):
+        self.jane.last_name = "Brown"
+        self.jane.save()
+        self.assertEqual(self.search("smith"), [])
+        self.assertEqual(self.search("brown"), [self.jane])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_prefix_search_uses_index(self):
+        plan = search_workers(Worker.objects.all(), "john").explain()
+        self.assertIn("worker_search_key_idx", plan)
+        self.assertNotIn("SCAN tasks_workersearchkey", plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_trigram_search_uses_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        plan = search_workers(Worker.objects.all(), "ohn").explain()
+        self.assertIn("worker_search_key_trgm_idx", plan)
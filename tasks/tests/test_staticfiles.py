@@ -0,0 +1,100 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from tasks.staticfiles import build_bundle, minify_css
+
+BUNDLED_STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "tasks.staticfiles.BundledStaticFilesStorage",
+    },
+}
+
+
+def render_bundles():
+    return Template(
+        '{% load bundles %}{% bundle "bundles/app.css" %}'
+    ).render(Context())
+
+
+class BundleTests(SimpleTestCase):
+    def test_minify_css(self):
+        css = "/*! License */\n/* note */\nbody {\n  margin: 0;\n}\n"
+        self.assertEqual(minify_css(css), "/*! License */ body{margin:0}")
+
+    def test_build_bundle(self):
+        self.assertEqual(
+            build_bundle("app.css", {
+                "lib.min.css": "a{color:red}\n/*# sourceMappingURL=x.map */",
+                "site.css": "b {\n  color: blue;\n}",
+            }),
+            "a{color:red}\nb{color:blue}\n",
+        )
+        self.assertEqual(
+            build_bundle("app.js", {"a.js": "f()", "b.js": "g()\n"}),
+            "f();\ng()\n",
+        )
+
+    def test_sources_are_included_without_bundling_storage(self):
+        self.assertHTMLEqual(render_bundles(), """
+            <link rel="stylesheet"
+                  href="/static/vendor/bootstrap-4.5.3/bootstrap.min.css">
+            <link rel="stylesheet" href="/static/css/styles.css">
+        """)
+
+    def test_collectstatic_builds_hashed_compressed_bundles(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root, STORAGES=BUNDLED_STORAGES
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            manifest = json.loads(
+                (Path(root) / "staticfiles.json").read_text()
+            )
+            hashed = manifest["paths"]["bundles/app.css"]
+            self.assertRegex(hashed, r"^bundles/app\.[0-9a-f]{12}\.css$")
+            for suffix in ("", ".gz", ".br"):
+                self.assertTrue((Path(root) / f"{hashed}{suffix}").exists())
+            content = (Path(root) / hashed).read_text()
+            self.assertIn("Bootstrap v4.5.3", content)
+            self.assertIn(".full-width-input{width:500px}", content)
+            self.assertHTMLEqual(
+                render_bundles(),
+                f'<link rel="stylesheet" href="/static/{hashed}">',
+            )
+
+
+@override_settings(WHITENOISE_USE_FINDERS=True)
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    path = "/static/css/styles.css"
+
+    def setUp(self):
+        self.source = (
+            Path(__file__).resolve().parents[2] / "static/css/styles.css"
+        ).read_bytes()
+
+    def test_serves_static_files(self):
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.source)
+
+    # The middleware of settings.ASYNC_VIEWS, all async capable.
+    @override_settings(MIDDLEWARE=[
+        middleware for middleware in settings.MIDDLEWARE
+        if middleware not in settings.SYNC_ONLY_MIDDLEWARE
+    ])
+    async def test_serves_static_files_under_asgi(self):
+        response = await self.async_client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(
+            b"".join([chunk async for chunk in response.streaming_content]),
+            self.source,
+        )
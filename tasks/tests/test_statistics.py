@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks import statistics, visits
+from tasks.models import Counter, Task, Worker
+
+
+class StatisticsTests(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(
+            name="Task 1",
+            deadline="2023-06-20",
+            priority="critical",
+        )
+
+    def test_counters_follow_task_changes(self):
+        self.assertEqual(statistics.get_counters(), {
+            "num_tasks": 1,
+            "num_workers": 0,
+            "num_of_critical_tasks": 1,
+            "num_tasks_not_completed": 1,
+        })
+
+        self.task.priority = "normal"
+        self.task.is_completed = True
+        self.task.save()
+        counters = statistics.get_counters()
+        self.assertEqual(counters["num_of_critical_tasks"], 0)
+        self.assertEqual(counters["num_tasks_not_completed"], 0)
+
+        self.task.delete()
+        self.assertEqual(statistics.get_counters()["num_tasks"], 0)
+
+    def test_counters_follow_worker_changes(self):
+        worker = Worker.objects.create(username="worker1")
+        self.assertEqual(statistics.get_counters()["num_workers"], 1)
+        worker.save()
+        self.assertEqual(statistics.get_counters()["num_workers"], 1)
+        worker.delete()
+        self.assertEqual(statistics.get_counters()["num_workers"], 0)
+
+    def test_rebuild_command_fixes_drift(self):
+        Counter.objects.filter(name="num_tasks").update(value=42)
+        call_command("rebuild_statistics", stdout=StringIO())
+        self.assertEqual(statistics.get_counters()["num_tasks"], 1)
+
+    def test_missing_counters_are_rebuilt(self):
+        Counter.objects.all().delete()
+        Task.objects.create(name="Task 2", deadline="2023-06-20")
+        self.assertEqual(statistics.get_counters()["num_tasks"], 2)
+
+    def test_index_reads_counters_in_one_query(self):
+        user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(user)
+        with self.assertNumQueries(1):
+            counters = statistics.get_counters()
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["num_tasks"], 1)
+        self.assertEqual(response.context["num_workers"], 1)
+        self.assertEqual(counters["num_of_critical_tasks"], 1)
+
+
+class VisitCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        self.counter = Counter.objects.filter(
+            name=visits.counter_name(self.user.pk)
+        )
+
+    def visit(self):
+        response = self.client.get(reverse("tasks:index"))
+        self.assertFalse(response.wsgi_request.session.modified)
+        return response.context["num_visits"]
+
+    def test_visits_are_counted_without_writes(self):
+        self.assertEqual(self.visit(), 1)
+        # The first visit of an interval flushes.
+        self.assertEqual(self.counter.get().value, 1)
+        with self.assertNumQueries(3):
+            # Session, user and counters; nothing is written.
+            self.assertEqual(self.visit(), 2)
+        for _ in range(visits.FLUSH_THRESHOLD - 2):
+            self.visit()
+        self.assertEqual(self.counter.get().value, 1)
+        self.assertEqual(self.visit(), visits.FLUSH_THRESHOLD + 1)
+        self.assertEqual(
+            self.counter.get().value, visits.FLUSH_THRESHOLD + 1
+        )
+
+    def test_flush_after_interval(self):
+        self.visit()
+        self.visit()
+        cache.delete(visits._flushed_key(self.user.pk))
+        self.assertEqual(self.visit(), 3)
+        self.assertEqual(self.counter.get().value, 3)
@@ -1,7 +1,15 @@
+import base64
+import json
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
+from tasks import assignments
 from tasks.forms import WorkerSearchForm
 from tasks.models import Worker, Position, Task, TaskType
 from tasks.views import WorkerListView
@@ -11,6 +19,11 @@ WORKERS_URL = reverse("tasks:worker-list")
 TASKS_URL = reverse("tasks:task-list")
 
 
+def forged_cursor(*keys):
+    payload = json.dumps(["next", list(keys)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
 class PublicWorkerTests(TestCase):
     def test_login_required(self):
         response = self.client.get(WORKERS_URL)
@@ -242,3 +255,459 @@ class PrivateTaskTest(TestCase):
             list(response.context_data["task_list"]),
             list(tasks)
         )
+
+
+class TaskListPaginationTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+        priorities = ["critical", "urgent", "normal"]
+        for number in range(25):
+            Task.objects.create(
+                name=f"Task {number}",
+                deadline=f"2023-06-{number % 5 + 10}",
+                priority=priorities[number % 3],
+            )
+
+    def test_cursor_pages_cover_ordering(self):
+        expected = list(Task.objects.filter(is_completed=False))
+        seen = []
+        pages = []
+        response = self.client.get(TASKS_URL)
+        while True:
+            page = response.context_data["page_obj"]
+            pages.append(page)
+            seen.extend(page.object_list)
+            if not page.has_next():
+                break
+            response = self.client.get(
+                TASKS_URL, {"cursor": page.next_cursor}
+            )
+
+        self.assertEqual(seen, expected)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertFalse(pages[0].has_previous())
+
+        response = self.client.get(
+            TASKS_URL, {"cursor": pages[-1].previous_cursor}
+        )
+        self.assertEqual(
+            list(response.context_data["task_list"]),
+            list(pages[1].object_list),
+        )
+
+    def test_cursor_keeps_search_filters(self):
+        response = self.client.get(
+            TASKS_URL, {"priority": ["critical", "normal"]}
+        )
+        self.assertContains(response, "cursor=")
+        self.assertContains(response, "priority=critical&amp;priority=normal")
+        self.assertNotContains(response, "of 1")
+
+    def test_invalid_cursor(self):
+        response = self.client.get(TASKS_URL, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_of_the_wrong_types(self):
+        for keys in (("x", "y", "z", "w"), (None, 1, "2023-06-20", 1)):
+            response = self.client.get(
+                TASKS_URL, {"cursor": forged_cursor(*keys)}
+            )
+            self.assertEqual(response.status_code, 404, keys)
+
+
+class DueTaskListTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test_pass"
+        )
+        self.client.force_login(self.user)
+        today = timezone.localdate()
+        self.overdue = [
+            Task.objects.create(
+                name=f"Overdue {days}",
+                deadline=today - timedelta(days=days),
+                priority=priority,
+            )
+            for days, priority in ((1, "normal"), (3, "critical"))
+        ]
+        self.today = Task.objects.create(name="Today", deadline=today)
+        Task.objects.create(
+            name="Done", deadline=today, is_completed=True
+        )
+
+    def test_overdue_in_deadline_order(self):
+        response = self.client.get(TASKS_URL, {"due": "overdue"})
+        self.assertEqual(
+            list(response.context_data["task_list"]),
+            self.overdue[::-1],
+        )
+
+    def test_due_filters_open_tasks_only(self):
+        response = self.client.get(
+            TASKS_URL, {"due": "today", "is_completed": "on"}
+        )
+        self.assertEqual(
+            list(response.context_data["task_list"]), [self.today]
+        )
+
+    def test_priority_filter(self):
+        response = self.client.get(
+            TASKS_URL, {"due": "overdue", "priority": "critical"}
+        )
+        self.assertEqual(
+            list(response.context_data["task_list"]), [self.overdue[1]]
+        )
+
+
+class WorkerAutocompleteTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+        Worker.objects.bulk_create([
+            Worker(username=f"worker{number:02}") for number in range(30)
+        ])
+        for worker in Worker.objects.filter(username__startswith="worker"):
+            worker.save()
+
+    def test_results_are_searched_and_paginated(self):
+        url = reverse("tasks:worker-autocomplete")
+        first = self.client.get(url, {"q": "work"}).json()
+        second = self.client.get(url, {"q": "work", "page": 2}).json()
+
+        self.assertEqual(len(first["results"]), 20)
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual(len(second["results"]), 10)
+        self.assertFalse(second["pagination"]["more"])
+        self.assertEqual(first["results"][0]["text"], "worker00")
+
+    def test_task_form_does_not_render_every_worker(self):
+        response = self.client.get(reverse("tasks:task-create"))
+        self.assertContains(response, reverse("tasks:worker-autocomplete"))
+        self.assertNotContains(response, "worker00")
+
+
+class AssignmentApiTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+        self.worker = Worker.objects.create(username="worker1")
+        self.task1 = Task.objects.create(name="Task 1", deadline="2023-06-20")
+        self.task2 = Task.objects.create(name="Task 2", deadline="2023-06-20")
+        self.url = reverse("tasks:assign-task", args=[self.task1.pk])
+
+    def test_toggle_reports_new_state(self):
+        response = self.client.post(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.json()["assigned"], True)
+        self.assertIn(self.user, self.task1.assignees.all())
+
+        response = self.client.post(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.json()["assigned"], False)
+        self.assertNotIn(self.user, self.task1.assignees.all())
+
+    def test_toggle_without_javascript_redirects_back(self):
+        next_url = reverse("tasks:worker-detail", args=[self.user.pk])
+        response = self.client.post(self.url, {"next": next_url})
+        self.assertRedirects(response, next_url)
+        response = self.client.post(self.url, {"next": "https://evil.com/"})
+        self.assertRedirects(
+            response,
+            reverse("tasks:task-detail", args=[self.task1.pk]),
+        )
+
+    def test_toggle_requires_post(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_unknown_task(self):
+        response = self.client.post(
+            reverse("tasks:assign-task", args=[0]),
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_batch_actions(self):
+        self.task1.assignees.add(self.worker)
+        url = reverse("tasks:assignments")
+        payload = {
+            "action": "toggle",
+            "pairs": [
+                {"task": self.task1.pk, "worker": self.worker.pk},
+                {"task": self.task2.pk, "worker": self.worker.pk},
+            ],
+        }
+        response = self.client.post(
+            url, payload, content_type="application/json"
+        )
+        self.assertEqual(
+            [pair["assigned"] for pair in response.json()["assignments"]],
+            [False, True],
+        )
+        self.assertEqual(list(self.worker.tasks.all()), [self.task2])
+
+        payload["action"] = "unassign"
+        self.client.post(url, payload, content_type="application/json")
+        self.assertFalse(self.worker.tasks.exists())
+
+        payload["pairs"].append({"task": 0, "worker": self.worker.pk})
+        payload["action"] = "assign"
+        response = self.client.post(
+            url, payload, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.worker.tasks.exists())
+
+    def test_large_batches(self):
+        workers = Worker.objects.bulk_create([
+            Worker(username=f"worker{number}") for number in range(2, 32)
+        ])
+        tasks = Task.objects.bulk_create([
+            Task(name=f"Task {number}", deadline="2023-06-20")
+            for number in range(50)
+        ])
+        pairs = [
+            {"task": task.pk, "worker": worker.pk}
+            for task in tasks
+            for worker in workers
+        ]
+        url = reverse("tasks:assignments")
+        response = self.client.post(
+            url,
+            {"action": "assign", "pairs": pairs},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("At most", response.json()["error"])
+
+        pairs = [(pair["task"], pair["worker"]) for pair in pairs]
+        self.assertEqual(len(pairs), 1500)
+        assignments.assign(pairs)
+        self.assertEqual(
+            Task.assignees.through.objects.filter(task__in=tasks).count(),
+            1500,
+        )
+        result = assignments.toggle(pairs[:1200])
+        self.assertFalse(any(result.values()))
+
+        response = self.client.post(
+            url,
+            {
+                "action": "unassign",
+                "pairs": [
+                    {"task": task_id, "worker": worker_id}
+                    for task_id, worker_id in pairs[1000:]
+                ],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            Task.assignees.through.objects.filter(task__in=tasks).exists()
+        )
+
+    def test_unassign_is_a_single_statement(self):
+        self.task1.assignees.add(self.user)
+        # Savepoint, DELETE, touching the task's updated_at, reading its
+        # report days and marking them stale, release.
+        with self.assertNumQueries(6):
+            result = assignments.toggle([(self.task1.pk, self.user.pk)])
+        self.assertEqual(result, {(self.task1.pk, self.user.pk): False})
+
+
+class AssignmentMembershipTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+
+    def add_tasks(self, count):
+        tasks = Task.objects.bulk_create([
+            Task(name=f"Task {number}", deadline="2023-06-20")
+            for number in range(count)
+        ])
+        self.user.tasks.add(*tasks[::2])
+        return tasks
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        return len(queries)
+
+    def test_worker_detail_membership_is_constant(self):
+        url = reverse("tasks:worker-detail", args=[self.user.pk])
+        self.add_tasks(3)
+        small = self.count_queries(url)
+        self.add_tasks(30)
+        self.assertEqual(self.count_queries(url), small)
+
+    def test_task_detail_marks_assignment(self):
+        assigned, unassigned = self.add_tasks(2)
+        response = self.client.get(
+            reverse("tasks:task-detail", args=[assigned.pk])
+        )
+        self.assertContains(response, "Delete me from this task")
+        self.assertContains(response, "Complete task")
+        response = self.client.get(
+            reverse("tasks:task-detail", args=[unassigned.pk])
+        )
+        self.assertContains(response, "Assign me to this task")
+        self.assertNotContains(response, "Complete task")
+
+
+class WorkerDetailTasksTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.worker = get_user_model().objects.create_user(
+            username='other_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("tasks:worker-detail", args=[self.worker.pk])
+
+    def add_tasks(self, count):
+        tasks = Task.objects.bulk_create([
+            Task(name=f"Task {number}", deadline="2023-06-20")
+            for number in range(count)
+        ])
+        self.worker.tasks.add(*tasks)
+        self.user.tasks.add(*tasks[::2])
+        return tasks
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self.add_tasks(3)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        self.add_tasks(3000)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(len(response.context_data["task_list"]), 20)
+        self.assertTrue(response.context_data["is_paginated"])
+
+    def test_tasks_are_flagged_and_paged(self):
+        tasks = self.add_tasks(25)
+        response = self.client.get(self.url)
+        page = response.context_data["page_obj"]
+        self.assertEqual(
+            [task.assigned_to_me for task in page.object_list],
+            [number % 2 == 0 for number in range(20)],
+        )
+        response = self.client.get(self.url, {"cursor": page.next_cursor})
+        self.assertEqual(
+            [task.pk for task in response.context_data["task_list"]],
+            [task.pk for task in tasks[20:]],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_of_the_wrong_types(self):
+        response = self.client.get(
+            self.url, {"cursor": forged_cursor("x", [], {})}
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='test_pass'
+        )
+        self.client.force_login(self.user)
+        self.task = Task.objects.create(
+            name="Test task",
+            deadline="2023-06-20",
+            priority="critical",
+        )
+        self.detail_url = reverse("tasks:task-detail", args=[self.task.pk])
+
+    def revalidate(self, url, data=None):
+        response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("Last-Modified"))
+        return lambda: self.client.get(
+            url, data, HTTP_IF_NONE_MATCH=response["ETag"]
+        ).status_code
+
+    def test_task_detail(self):
+        revalidate = self.revalidate(self.detail_url)
+        self.assertEqual(revalidate(), 304)
+        self.task.description = "Changed"
+        self.task.save()
+        self.assertEqual(revalidate(), 200)
+
+        revalidate = self.revalidate(self.detail_url)
+        assignments.assign([(self.task.pk, self.user.pk)])
+        self.assertEqual(revalidate(), 200)
+
+        revalidate = self.revalidate(self.detail_url)
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertEqual(revalidate(), 200)
+
+    def test_task_detail_follows_deleted_assignees(self):
+        worker = get_user_model().objects.create_user(
+            username="assignee", password="test_pass"
+        )
+        assignments.assign([(self.task.pk, worker.pk)])
+        revalidate = self.revalidate(self.detail_url)
+        self.assertEqual(revalidate(), 304)
+        worker.delete()
+        self.assertEqual(revalidate(), 200)
+
+    def test_task_list_validator_follows_filtered_set(self):
+        revalidate = self.revalidate(TASKS_URL, {"priority": "critical"})
+        Task.objects.create(
+            name="Other task",
+            deadline="2023-06-20",
+            priority="normal",
+        )
+        self.assertEqual(revalidate(), 304)
+        Task.objects.create(
+            name="Critical task",
+            deadline="2023-06-20",
+            priority="critical",
+        )
+        self.assertEqual(revalidate(), 200)
+
+        revalidate = self.revalidate(TASKS_URL, {"priority": "critical"})
+        self.task.delete()
+        self.assertEqual(revalidate(), 200)
+
+    def test_worker_detail(self):
+        url = reverse("tasks:worker-detail", args=[self.user.pk])
+        revalidate = self.revalidate(url)
+        self.assertEqual(revalidate(), 304)
+        self.task.assignees.add(self.user)
+        self.assertEqual(revalidate(), 200)
+
+    def test_validator_depends_on_user(self):
+        revalidate = self.revalidate(self.detail_url)
+        other = get_user_model().objects.create_user(
+            username='other_user', password='test_pass'
+        )
+        self.client.force_login(other)
+        self.assertEqual(revalidate(), 200)
+
+    def test_pending_messages_skip_validation(self):
+        revalidate = self.revalidate(TASKS_URL)
+        # Reopening an open task changes nothing but queues a message.
+        self.client.post(reverse("tasks:task-bulk"), {
+            "action": "reopen",
+            "tasks": [self.task.pk],
+        })
+        self.assertEqual(revalidate(), 200)
+        self.assertEqual(revalidate(), 304)
+
+    def test_assignment_records_time(self):
+        assignments.assign([(self.task.pk, self.user.pk)])
+        assignment = assignments.Assignment.objects.get()
+        self.assertIsNotNone(assignment.assigned_at)
@@ -1,21 +1,40 @@
+from django.conf import settings
 from django.urls import path
 
 from tasks.views import (
     IndexView,
     ToggleCompleteTaskView,
-    ToggleAssignToTaskView,
+    TaskBulkActionView,
+    AssignTaskView,
+    AssignmentsView,
+    BoardView,
+    BoardColumnView,
+    MoveTaskView,
+    ReportView,
     TaskListView,
+    TaskExportView,
     TaskCreateView,
     TaskDetailView,
     TaskUpdateView,
     TaskDeleteView,
     WorkerListView,
+    WorkerAutocompleteView,
+    WorkerExportView,
     WorkerDetailView,
     WorkerCreateView,
     WorkerUpdateView,
     WorkerDeleteView,
 )
 
+if settings.ASYNC_VIEWS:
+    from tasks.async_views import (
+        AsyncIndexView as IndexView,
+        AsyncTaskListView as TaskListView,
+        AsyncTaskDetailView as TaskDetailView,
+        AsyncWorkerListView as WorkerListView,
+        AsyncWorkerDetailView as WorkerDetailView,
+    )
+
 urlpatterns = [
     path(
         "",
@@ -24,19 +43,54 @@ urlpatterns = [
     ),
     path(
         "tasks/<int:pk>/assign/",
-        ToggleAssignToTaskView.as_view(),
+        AssignTaskView.as_view(),
         name="assign-task"
     ),
+    path(
+        "tasks/assignments/",
+        AssignmentsView.as_view(),
+        name="assignments",
+    ),
     path(
         "tasks/<int:pk>/complete/",
         ToggleCompleteTaskView.as_view(),
         name="task-complete"
     ),
+    path(
+        "tasks/bulk/",
+        TaskBulkActionView.as_view(),
+        name="task-bulk",
+    ),
+    path(
+        "tasks/board/",
+        BoardView.as_view(),
+        name="board",
+    ),
+    path(
+        "tasks/board/<str:column>/",
+        BoardColumnView.as_view(),
+        name="board-column",
+    ),
+    path(
+        "tasks/<int:pk>/move/",
+        MoveTaskView.as_view(),
+        name="task-move",
+    ),
+    path(
+        "tasks/reports/",
+        ReportView.as_view(),
+        name="reports",
+    ),
     path(
         "tasks/",
         TaskListView.as_view(),
         name="task-list",
     ),
+    path(
+        "tasks/export/",
+        TaskExportView.as_view(),
+        name="task-export",
+    ),
     path(
         "tasks/create/",
         TaskCreateView.as_view(),
@@ -62,6 +116,16 @@ urlpatterns = [
         WorkerListView.as_view(),
         name="worker-list",
     ),
+    path(
+        "workers/autocomplete/",
+        WorkerAutocompleteView.as_view(),
+        name="worker-autocomplete",
+    ),
+    path(
+        "workers/export/",
+        WorkerExportView.as_view(),
+        name="worker-export",
+    ),
     path(
         "workers/create/",
         WorkerCreateView.as_view(),
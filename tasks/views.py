@@ -1,46 +1,70 @@
+import json
+
+from dal import autocomplete
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db.models import Q
-from django.http import HttpResponseRedirect
-from django.shortcuts import render, get_object_or_404, redirect
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db.models import Count, Max
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+)
+from django.shortcuts import render, redirect
+from django.template.defaultfilters import pluralize
 from django.urls import reverse_lazy, reverse
+from django.utils.crypto import constant_time_compare
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import generic, View
 
+from tasks import (
+    assignments,
+    board,
+    bulk,
+    export,
+    fragments,
+    metrics,
+    statistics,
+    visits,
+)
+from tasks.conditional import ConditionalGetMixin, latest
 from tasks.forms import (
+    ReportForm,
+    TaskBulkActionForm,
     TaskForm,
     WorkerCreationForm,
     WorkerSearchForm,
     TaskSearchForm,
 )
 from tasks.models import (
+    DailyTaskRollup,
+    StaleRollupDay,
     Task,
     Worker,
 )
+from tasks.pagination import (
+    CursorPaginationMixin,
+    CursorPaginator,
+    union_parts,
+)
+from tasks.search import search_workers
 
 
 class IndexView(LoginRequiredMixin, View):
     def get(self, request):
         """View function for the home page of the site."""
-        num_tasks = Task.objects.count()
-        num_workers = Worker.objects.count()
-        num_of_critical_tasks = Task.objects.filter(
-            priority="critical"
-        ).count()
-        num_tasks_not_completed = Task.objects.filter(
-            is_completed=False
-        ).count()
-
-        num_visits = request.session.get(
-            "num_visits", 0
+        visits_counter = visits.counter_name(request.user.pk)
+        num_pending = visits.record(request.user.pk)
+        counters = statistics.get_counters(
+            (*statistics.DASHBOARD_COUNTERS, visits_counter)
         )
-        request.session["num_visits"] = num_visits + 1
 
         context = {
-            "num_tasks": num_tasks,
-            "num_workers": num_workers,
-            "num_of_critical_tasks": num_of_critical_tasks,
-            "num_tasks_not_completed": num_tasks_not_completed,
-            "num_visits": num_visits + 1,
+            **counters,
+            "num_visits": counters.pop(visits_counter) + num_pending,
         }
 
         return render(
@@ -50,52 +74,233 @@ class IndexView(LoginRequiredMixin, View):
         )
 
 
+def wants_json(request):
+    return not request.accepts("text/html")
+
+
+def redirect_to_next(request, default_url):
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(
+        next_url,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure(),
+    ):
+        next_url = default_url
+    return HttpResponseRedirect(next_url)
+
+
 class ToggleCompleteTaskView(LoginRequiredMixin, View):
     def get(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
-        task.is_completed = not task.is_completed
-        task.save()
+        if bulk.toggle_complete(pk) is None:
+            raise Http404("No task found matching the query")
         return redirect(reverse(
             "tasks:task-detail",
             kwargs={"pk": pk})
         )
 
 
-class ToggleAssignToTaskView(LoginRequiredMixin, View):
-    def get(self, request, pk):
-        worker = get_object_or_404(
-            Worker,
-            id=request.user.id
+class TaskBulkActionView(LoginRequiredMixin, View):
+    def post(self, request):
+        form = TaskBulkActionForm(data=request.POST)
+        if form.is_valid():
+            changed = form.save()
+            action = dict(form.ACTION_CHOICES)[form.cleaned_data["action"]]
+            messages.success(
+                request,
+                f"{action}: {changed} task{pluralize(changed)} changed."
+            )
+        else:
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.warning(request, error)
+
+        return redirect_to_next(request, reverse("tasks:task-list"))
+
+
+class AssignTaskView(LoginRequiredMixin, View):
+    """Toggle the current user's assignment to a task."""
+
+    def post(self, request, pk):
+        pair = (pk, request.user.pk)
+        try:
+            assigned = assignments.toggle([pair])[pair]
+        except ObjectDoesNotExist:
+            raise Http404("No task found matching the query")
+
+        if wants_json(request):
+            return JsonResponse({
+                "task": pk,
+                "worker": {
+                    "id": request.user.pk,
+                    "username": request.user.username,
+                    "url": request.user.get_absolute_url(),
+                },
+                "assigned": assigned,
+            })
+
+        return redirect_to_next(
+            request,
+            reverse("tasks:task-detail", kwargs={"pk": pk}),
         )
-        task = get_object_or_404(Task, id=pk)
 
-        if task in worker.tasks.all():
-            worker.tasks.remove(task)
-        else:
-            worker.tasks.add(task)
 
-        source = request.GET.get("source")
-        worker_id = request.GET.get("worker_id")
+class AssignmentsView(LoginRequiredMixin, View):
+    """Apply an assignment action to a batch of (task, worker) pairs.
+
+    Expects a JSON body like
+    ``{"action": "toggle", "pairs": [{"task": 1, "worker": 2}]}``
+    where the action is "toggle", "assign" or "unassign", with at most
+    ``assignments.MAX_PAIRS`` pairs.
+    """
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+            action = assignments.ACTIONS[payload.get("action", "toggle")]
+            pairs = [
+                (int(pair["task"]), int(pair["worker"]))
+                for pair in payload["pairs"]
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return JsonResponse(
+                {"error": "Expected an action and a list of pairs."},
+                status=400,
+            )
+        if len(pairs) > assignments.MAX_PAIRS:
+            return JsonResponse(
+                {"error": f"At most {assignments.MAX_PAIRS} pairs at once."},
+                status=400,
+            )
+        try:
+            result = action(pairs)
+        except ObjectDoesNotExist as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse({
+            "assignments": [
+                {"task": task_id, "worker": worker_id, "assigned": assigned}
+                for (task_id, worker_id), assigned in result.items()
+            ]
+        })
+
+
+class BoardView(LoginRequiredMixin, View):
+    def get(self, request):
+        return render(request, "tasks/board.html", {
+            "columns": board.load_board(),
+            "column_choices": board.COLUMNS,
+        })
+
+
+class BoardColumnView(LoginRequiredMixin, View):
+    """The next cards of a board column, as an HTML fragment."""
+
+    def get(self, request, column):
+        if column not in dict(board.COLUMNS):
+            raise Http404("No such column")
+        try:
+            page = board.column_page(column, request.GET.get("cursor"))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return render(request, "tasks/board_cards.html", {
+            "column": board.Column(
+                column,
+                dict(board.COLUMNS)[column],
+                page.object_list,
+                page.next_cursor,
+            ),
+            "column_choices": board.COLUMNS,
+        })
+
+
+class MoveTaskView(LoginRequiredMixin, View):
+    """Move a task to another board column."""
+
+    def post(self, request, pk):
+        column = request.POST.get("column")
+        if column not in dict(board.COLUMNS):
+            return JsonResponse({"error": "Unknown column."}, status=400)
+        if not board.move(pk, column):
+            raise Http404("No task found matching the query")
+
+        if wants_json(request):
+            return JsonResponse({"task": pk, "column": column})
+
+        return redirect_to_next(request, reverse("tasks:board"))
 
-        pk = (
-            worker_id
-            if source == "worker-detail"
-            else pk
-        )
-        source = (
-            source
-            if source in ["worker-detail", "task-detail"]
-            else "task-detail"
-        )
 
-        return HttpResponseRedirect(
-            reverse(
-                f"tasks:{source}",
-                args=[pk]
+class ReportView(LoginRequiredMixin, View):
+    """Tasks created and completed per period, read from the rollups."""
+
+    def get(self, request):
+        form = ReportForm(request.GET)
+        context = {"form": form, "periods": [], "groups": []}
+        if not form.is_valid():
+            return render(request, "tasks/report.html", context, status=400)
+        context["periods"], context["groups"] = form.report()
+        # Rebuilt once the changes commit, never on a page view.
+        context["stale_days"] = StaleRollupDay.objects.count()
+        context["dimension"] = dict(DailyTaskRollup.DIMENSIONS)[
+            form.cleaned_data["dimension"]
+        ]
+        return render(request, "tasks/report.html", context)
+
+
+class ExportView(LoginRequiredMixin, View):
+    """Stream the rows matching the search form's filters.
+
+    ``?format=`` picks "ndjson" (the default), "json" or "csv"; the
+    other query parameters are the ones the list page accepts.
+    """
+    model = None
+    form_class = None
+    fields = ()
+    filename = None
+    chunk_size = export.CHUNK_SIZE
+
+    def rows(self, queryset):
+        raise NotImplementedError
+
+    def get(self, request):
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in export.FORMATS:
+            return JsonResponse(
+                {"error": f"Unknown format {export_format!r}."},
+                status=400,
             )
+        form = self.form_class(data=request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        queryset = form.filter_queryset(self.model.objects.all())
+        return export.stream(
+            export_format,
+            self.rows(queryset),
+            self.fields,
+            self.filename,
         )
 
 
+class TaskExportView(ExportView):
+    model = Task
+    form_class = TaskSearchForm
+    fields = export.TASK_FIELDS
+    filename = "tasks"
+
+    def rows(self, queryset):
+        # Archived tasks come after the live ones.
+        for part in union_parts(queryset):
+            yield from export.task_rows(part, self.chunk_size)
+
+
+class WorkerExportView(ExportView):
+    model = Worker
+    form_class = WorkerSearchForm
+    fields = export.WORKER_FIELDS
+    filename = "workers"
+
+    def rows(self, queryset):
+        return export.worker_rows(queryset, self.chunk_size)
+
+
 class WorkerListView(
     LoginRequiredMixin,
     generic.ListView
@@ -109,32 +314,75 @@ class WorkerListView(
         context["search_form"] = WorkerSearchForm(
             initial={"search_field": search_field}
         )
+        fragments.attach_versions(context["worker_list"])
         return context
 
     def get_queryset(self):
         queryset = Worker.objects.all()
         form = WorkerSearchForm(data=self.request.GET)
         if form.is_valid():
-            search_query = form.cleaned_data["search_field"]
-            return queryset.filter(
-                Q(username__icontains=search_query)
-                | Q(first_name__icontains=search_query)
-                | Q(last_name__icontains=search_query)
-            )
+            return form.filter_queryset(queryset)
         return queryset
 
 
+class WorkerAutocompleteView(
+    LoginRequiredMixin,
+    autocomplete.Select2QuerySetView
+):
+    paginate_by = 20
+
+    def get_queryset(self):
+        return search_workers(Worker.objects.all(), self.q)
+
+    def get_result_label(self, result):
+        full_name = result.get_full_name()
+        if full_name:
+            return f"{result.username} ({full_name})"
+        return result.username
+
+
 class WorkerDetailView(
     LoginRequiredMixin,
+    ConditionalGetMixin,
     generic.DetailView
 ):
     model = Worker
+    paginate_tasks_by = 20
+
+    def get_validator_aggregate(self):
+        return Worker.objects.filter(pk=self.kwargs["pk"]), {
+            "worker": Max("updated_at"),
+            "task": Max("tasks__updated_at"),
+            "num_tasks": Count("tasks"),
+        }
+
+    def get_validators_from(self, row):
+        if row["worker"] is None:
+            return None
+        return latest(row["worker"], row["task"]), [row["num_tasks"]]
+
+    def get_task_paginator(self):
+        tasks = self.object.tasks.with_assigned_flag(self.request.user)
+        return CursorPaginator(tasks, self.paginate_tasks_by)
+
+    def paginate_tasks(self):
+        try:
+            return self.get_task_paginator().page(
+                self.request.GET.get("cursor")
+            )
+        except InvalidPage as e:
+            raise Http404(str(e))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        my_tasks = Task.objects.filter(assignees=user)
-        context["my_tasks"] = my_tasks
+        page = self.paginate_tasks()
+        context.update({
+            "paginator": page.paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "task_list": page.object_list,
+        })
+        fragments.attach_versions(page.object_list)
         return context
 
 
@@ -187,10 +435,15 @@ class WorkerDeleteView(
 
 class TaskListView(
     LoginRequiredMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
     generic.ListView
 ):
     model = Task
     paginate_by = 10
+    cursor_ordering = ("is_completed", "priority_rank", "deadline", "id")
+    # The order of task_open_due_idx.
+    due_cursor_ordering = ("deadline", "priority_rank", "id")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -198,6 +451,8 @@ class TaskListView(
         priority = self.request.GET.getlist("priority")
         assignee = self.request.GET.get("assignee", "")
         is_completed = self.request.GET.get("is_completed")
+        archived = self.request.GET.get("archived")
+        due = self.request.GET.get("due", "")
         if not priority:
             priority = TaskSearchForm().fields["priority"].initial
         context["search_form"] = TaskSearchForm(
@@ -206,29 +461,42 @@ class TaskListView(
                 "priority": priority,
                 "assignee": assignee,
                 "is_completed": is_completed,
+                "archived": archived,
+                "due": due,
             }
         )
+        context["bulk_form"] = TaskBulkActionForm()
+        fragments.attach_versions(context["task_list"])
         return context
 
+    def get_validator_aggregate(self):
+        queryset = self.get_queryset()
+        if queryset.query.combinator:
+            # Django 4.2 cannot aggregate over the UNION with archived
+            # tasks, so those pages are always rendered.
+            return None
+        return queryset, {
+            "last_modified": Max("updated_at"),
+            "num_tasks": Count("pk"),
+        }
+
+    def get_validators_from(self, row):
+        return row["last_modified"], [row["num_tasks"]]
+
+    def get_cursor_ordering(self, queryset):
+        ordering = self.cursor_ordering
+        form = self.search_form
+        if form.is_valid() and form.cleaned_data["due"]:
+            ordering = self.due_cursor_ordering
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", *ordering)
+        return ordering
+
     def get_queryset(self):
         queryset = Task.objects.all()
-        form = TaskSearchForm(data=self.request.GET)
-        if form.is_valid():
-            search_query = form.cleaned_data["search_field"]
-            priority = form.cleaned_data["priority"]
-            is_completed = form.cleaned_data["is_completed"]
-            if not is_completed:
-                queryset = queryset.filter(is_completed=False)
-            if priority:
-                queryset = queryset.filter(priority__in=priority)
-            assignee = form.cleaned_data["assignee"]
-            if assignee:
-                queryset = queryset.filter(
-                    assignees__username__icontains=assignee
-                )
-            return queryset.filter(
-                Q(name__icontains=search_query)
-            )
+        self.search_form = TaskSearchForm(data=self.request.GET)
+        if self.search_form.is_valid():
+            return self.search_form.filter_queryset(queryset)
         return queryset
 
 
@@ -251,10 +519,31 @@ class TaskCreateView(
 
 class TaskDetailView(
     LoginRequiredMixin,
+    ConditionalGetMixin,
     generic.DetailView
 ):
     model = Task
 
+    def get_validator_aggregate(self):
+        return Task.objects.filter(pk=self.kwargs["pk"]), {
+            "task": Max("updated_at"),
+            "assignee": Max("assignees__updated_at"),
+            # Deleting a worker drops their assignments by cascade,
+            # touching no updated_at: only the count shows it.
+            "num_assignees": Count("assignees"),
+        }
+
+    def get_validators_from(self, row):
+        if row["task"] is None:
+            return None
+        return (
+            latest(row["task"], row["assignee"]),
+            [row["num_assignees"]],
+        )
+
+    def get_queryset(self):
+        return Task.objects.with_assigned_flag(self.request.user)
+
 
 class TaskUpdateView(
     LoginRequiredMixin,
@@ -284,3 +573,26 @@ class TaskDeleteView(
         response = super().post(request, *args, **kwargs)
         messages.warning(request, "Task has been deleted.")
         return response
+
+
+class MetricsView(View):
+    """Request histograms in the Prometheus text format.
+
+    Served to staff users, and to scrapers sending
+    ``settings.METRICS_TOKEN`` as a bearer token. Without a token
+    configured, the endpoint does not exist for anyone else.
+    """
+
+    def get(self, request):
+        if not request.user.is_staff:
+            token = settings.METRICS_TOKEN
+            if not token:
+                raise Http404
+            if not constant_time_compare(
+                request.headers.get("Authorization", ""), f"Bearer {token}"
+            ):
+                return HttpResponse(status=401)
+        return HttpResponse(
+            metrics.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
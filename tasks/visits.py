@@ -0,0 +1,74 @@
+"""Dashboard visit counts that cost no database write per visit.
+
+Visits are counted in the cache and added to the user's row in the
+``Counter`` table in one UPDATE once ``FLUSH_THRESHOLD`` of them have
+piled up, or on the first visit after ``FLUSH_INTERVAL`` seconds. The
+count shown is the stored value plus what is still pending. Visits
+pending in a cache that is cleared or evicted are lost, which is fine
+for a courtesy counter.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from tasks.models import Counter
+
+FLUSH_THRESHOLD = 20
+FLUSH_INTERVAL = 5 * 60
+
+
+def counter_name(user_id):
+    return f"visits:user:{user_id}"
+
+
+def _pending_key(user_id):
+    return f"visits:pending:{user_id}"
+
+
+def _flushed_key(user_id):
+    return f"visits:flushed:{user_id}"
+
+
+def record(user_id):
+    """Count one visit; return the number of visits still pending."""
+    key = _pending_key(user_id)
+    cache.add(key, 0, None)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Evicted since add().
+        cache.set(key, 1, None)
+        count = 1
+    # add() only succeeds once the marker of the last flush expired.
+    if count >= FLUSH_THRESHOLD or cache.add(
+        _flushed_key(user_id), True, FLUSH_INTERVAL
+    ):
+        count -= flush(user_id)
+    return count
+
+
+def flush(user_id):
+    """Move the pending visits of a user to the database."""
+    key = _pending_key(user_id)
+    count = cache.get(key, 0)
+    if not count:
+        return 0
+    # Claim the visits before writing, so concurrent flushes do not
+    # store them twice.
+    cache.decr(key, count)
+    name = counter_name(user_id)
+    with transaction.atomic():
+        updated = Counter.objects.filter(name=name).update(
+            value=F("value") + count
+        )
+        if not updated:
+            counter, created = Counter.objects.get_or_create(
+                name=name,
+                defaults={"value": count},
+            )
+            if not created:
+                Counter.objects.filter(name=name).update(
+                    value=F("value") + count
+                )
+    cache.set(_flushed_key(user_id), True, FLUSH_INTERVAL)
+    return count